@@ -1,4 +1,7 @@
+import argparse
+
 from pathlib import Path
+from wsgi_server import serve
 from config import AIProjectConfig, convert_paths
 from flask import Flask, jsonify, request, send_from_directory
 
@@ -59,4 +62,21 @@ def serve_index():
 
 # Lancer le serveur Flask
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    parser = argparse.ArgumentParser(description="Serveur de configuration.")
+    parser.add_argument('--production', action='store_true', help="Sans debug ni rechargement")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--keepalive', type=float, default=5.0)
+    args = parser.parse_args()
+    if args.workers <= 0:
+        parser.error("--workers doit être strictement positif")
+    if args.keepalive < 0:
+        parser.error("--keepalive doit être positif ou nul (0 : une requête par connexion)")
+    if args.production:
+        # wsgi_server.py : copie de logboard/interface/wsgi_server.py (vérifiée par ses tests)
+        serve(app, host=args.host, port=args.port, workers=args.workers, keepalive=args.keepalive,
+              ready=lambda port: print(f"Configuration en écoute sur http://{args.host}:{port} "
+                                       f"({args.workers} workers)", flush=True))
+    else:
+        app.run(host=args.host, port=args.port, debug=True)
@@ -0,0 +1,210 @@
+import signal
+import threading
+
+from typing import Any, Callable, Optional
+from werkzeug.serving import ThreadedWSGIServer, WSGIRequestHandler
+
+WORKER_MODES = ("threads", "gevent")
+# Connexions servies simultanément, attente d'une requête sur une connexion
+# inactive (secondes, 0 : une requête par connexion) et délai accordé aux
+# requêtes en cours à l'arrêt
+DEFAULT_WORKERS = 32
+DEFAULT_KEEPALIVE = 5.0
+SHUTDOWN_GRACE = 10.0
+LISTEN_BACKLOG = 1024
+
+
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    """Gestionnaire de requêtes HTTP/1.1 de werkzeug, avec délai d'inactivité.
+
+    Une connexion reste ouverte entre deux requêtes au plus ``keepalive``
+    secondes. Le délai ne s'applique qu'à l'attente de la requête suivante : le
+    traitement d'une requête et les connexions WebSocket (Socket.IO) n'en ont pas.
+
+    Attributes:
+        keepalive (float): Attente maximale d'une requête sur une connexion inactive.
+        access_log (bool): Journalise chaque requête (désactivé par défaut).
+    """
+
+    protocol_version = "HTTP/1.1"
+    keepalive = DEFAULT_KEEPALIVE
+    access_log = False
+
+    def handle_one_request(self) -> None:
+        """Attend au plus ``keepalive`` secondes la requête suivante, puis la traite."""
+        self.connection.settimeout(self.keepalive)
+        super().handle_one_request()
+
+    def parse_request(self) -> bool:
+        """Lève le délai d'inactivité une fois la ligne de requête reçue."""
+        self.connection.settimeout(None)
+        return super().parse_request()
+
+    def log_request(self, code: Any = "-", size: Any = "-") -> None:
+        """Journalise la requête si ``access_log`` est activé."""
+        if self.access_log:
+            super().log_request(code, size)
+
+    def log_error(self, format: str, *args: Any) -> None:
+        """Journalise une erreur, sauf la fermeture d'une connexion restée inactive."""
+        if not format.startswith("Request timed out"):
+            super().log_error(format, *args)
+
+
+class PooledWSGIServer(ThreadedWSGIServer):
+    """Serveur WSGI multi-thread de werkzeug, borné à ``workers`` connexions.
+
+    Chaque connexion est servie par un thread ; au-delà de ``workers``
+    connexions simultanées, les suivantes attendent dans la file d'écoute du
+    système. Une connexion inactive conservée (keep-alive) ou un client
+    Socket.IO connecté occupe une place jusqu'à sa fermeture.
+
+    Attributes:
+        workers (int): Nombre maximal de connexions servies simultanément.
+    """
+
+    def __init__(self, host: str, port: int, app: Callable, workers: int = DEFAULT_WORKERS,
+                 keepalive: float = DEFAULT_KEEPALIVE, access_log: bool = False) -> None:
+        """Crée le serveur et ouvre le port d'écoute.
+
+        Args:
+            host (str): Adresse d'écoute.
+            port (int): Port d'écoute (0 : port libre choisi par le système).
+            app (Callable): Application WSGI.
+            workers (int): Nombre maximal de connexions servies simultanément.
+            keepalive (float): Attente maximale d'une requête sur une connexion
+                inactive, en secondes (0 : connexion fermée après chaque réponse).
+            access_log (bool): Journalise chaque requête.
+
+        Raises:
+            ValueError: Si ``workers`` n'est pas strictement positif ou
+                ``keepalive`` est négatif.
+        """
+        if workers <= 0 or keepalive < 0:
+            raise ValueError("workers doit être strictement positif et keepalive positif ou nul")
+        handler = type("RequestHandler", (KeepAliveRequestHandler,), {
+            "keepalive": keepalive or None,
+            "access_log": access_log,
+            "protocol_version": "HTTP/1.1" if keepalive else "HTTP/1.0"
+        })
+        self.request_queue_size = LISTEN_BACKLOG
+        super().__init__(host, port, app, handler=handler)
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(workers)
+        self._active = 0
+        self._idle = threading.Condition()
+        self._closing = threading.Event()
+
+    @property
+    def active(self) -> int:
+        """Nombre de connexions en cours de traitement."""
+        return self._active
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        """Attend une place libre puis sert la connexion dans un nouveau thread."""
+        while not self._slots.acquire(timeout=0.1):
+            if self._closing.is_set():
+                self.shutdown_request(request)  # Arrêt en cours : connexion refusée
+                return
+        with self._idle:
+            self._active += 1
+        super().process_request(request, client_address)
+
+    def process_request_thread(self, request: Any, client_address: Any) -> None:
+        """Sert la connexion puis libère sa place."""
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            with self._idle:
+                self._active -= 1
+                self._idle.notify_all()
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        """Cesse d'accepter des connexions (les connexions en cours continuent)."""
+        self._closing.set()
+        super().shutdown()
+
+    def drain(self, timeout: float) -> bool:
+        """Attend la fin des connexions en cours.
+
+        Args:
+            timeout (float): Attente maximale, en secondes.
+
+        Returns:
+            bool: True si toutes les connexions sont terminées.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._active == 0, timeout)
+
+
+def serve(app: Callable, host: str = "0.0.0.0", port: int = 5000, worker: str = "threads",
+          workers: int = DEFAULT_WORKERS, keepalive: float = DEFAULT_KEEPALIVE, grace: float = SHUTDOWN_GRACE,
+          access_log: bool = False, on_stop: Optional[Callable[[], None]] = None,
+          ready: Optional[Callable[[int], None]] = None, stop: Optional[threading.Event] = None) -> None:
+    """Sert une application WSGI en production jusqu'à SIGINT ou SIGTERM.
+
+    À l'arrêt, le port cesse d'accepter des connexions, ``on_stop`` est appelé
+    (par exemple pour fermer les connexions Socket.IO), puis les requêtes en
+    cours disposent de ``grace`` secondes pour se terminer.
+
+    Avec ``worker="gevent"`` (paquet gevent requis, et ``gevent.monkey.patch_all()``
+    appelé avant tout autre import), les connexions sont servies par des
+    greenlets ; ``keepalive`` n'y est pas réglable.
+
+    Args:
+        app (Callable): Application WSGI.
+        host (str): Adresse d'écoute.
+        port (int): Port d'écoute (0 : port libre choisi par le système).
+        worker (str): "threads" (serveur werkzeug borné) ou "gevent".
+        workers (int): Nombre maximal de connexions servies simultanément.
+        keepalive (float): Attente maximale d'une requête sur une connexion inactive.
+        grace (float): Délai accordé aux requêtes en cours à l'arrêt, en secondes.
+        access_log (bool): Journalise chaque requête.
+        on_stop (Optional[Callable]): Appelé quand le port est fermé, avant l'attente
+            des requêtes en cours.
+        ready (Optional[Callable[[int], None]]): Appelé avec le port d'écoute une
+            fois le serveur prêt.
+        stop (Optional[threading.Event]): Événement d'arrêt ; par défaut, SIGINT et
+            SIGTERM arrêtent le serveur.
+
+    Raises:
+        ValueError: Si le mode de worker est inconnu.
+        ImportError: Si gevent est demandé mais n'est pas installé.
+    """
+    if worker not in WORKER_MODES:
+        raise ValueError(f"Mode de worker invalide : {worker}. Doit être l'un de {', '.join(WORKER_MODES)}")
+    previous_handlers = {}
+    if stop is None:
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous_handlers[signum] = signal.signal(signum, lambda *_: stop.set())
+    try:
+        if worker == "gevent":
+            from gevent import pywsgi
+            server = pywsgi.WSGIServer((host, port), app, backlog=LISTEN_BACKLOG, spawn=workers,
+                                       log="default" if access_log else None)
+            server.start()
+            if ready is not None:
+                ready(server.server_port)
+            stop.wait()
+            server.close()
+            if on_stop is not None:
+                on_stop()
+            server.stop(timeout=grace)
+            return
+        server = PooledWSGIServer(host, port, app, workers=workers, keepalive=keepalive, access_log=access_log)
+        thread = threading.Thread(target=server.serve_forever, name="wsgi-server", daemon=True)
+        thread.start()
+        if ready is not None:
+            ready(server.server_port)
+        stop.wait()
+        server.shutdown()
+        thread.join()
+        if on_stop is not None:
+            on_stop()
+        server.drain(grace)
+        server.server_close()
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
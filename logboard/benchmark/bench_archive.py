@@ -0,0 +1,86 @@
+"""Mesure le taux de compression des archives et la latence des lectures par période.
+
+Compare la taille de journaux synthétiques dans logs.json (JSON indenté) et dans
+des archives compressées par blocs (zlib, lzma), puis chronomètre la lecture
+d'une heure de journaux : relecture complète de logs.json contre lecture des
+seuls blocs de l'archive. À lancer depuis le dossier logboard :
+
+    python -m benchmark.bench_archive --count 200000
+"""
+import os
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+from datetime import datetime, timedelta
+from manager.log_archive import write_archive
+
+MESSAGES = [
+    "Connexion réussie", "Connexion refusée", "Requête SQL exécutée", "Délai dépassé (timeout)",
+    "Fichier introuvable", "Cache vidé", "Utilisateur déconnecté", "Erreur de validation",
+]
+LEVELS = ["DEBUG", "INFO", "INFO", "INFO", "WARNING", "ERROR", "CRITICAL"]
+MODULES = ["auth", "database", "api", "cache", "preprocessor"]
+
+
+def generate(count: int) -> list:
+    """Génère ``count`` journaux synthétiques espacés d'une seconde."""
+    rng = random.Random(42)
+    start = datetime(2025, 7, 1)
+    return [{
+        "id": str(i + 1),
+        "timestamp": (start + timedelta(seconds=i)).isoformat(),
+        "level": rng.choice(LEVELS),
+        "module": rng.choice(MODULES),
+        "message": rng.choice(MESSAGES),
+        "context": {"user_id": f"user{rng.randrange(10000)}", "duration_ms": rng.randrange(2000)},
+    } for i in range(count)]
+
+
+def median_ms(action, repeat: int = 5) -> float:
+    """Retourne la durée médiane (ms) d'une action."""
+    timings = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - begin) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200000)
+    parser.add_argument("--block-records", type=int, default=1000)
+    args = parser.parse_args()
+
+    records = generate(args.count)
+    since = records[len(records) // 2]["timestamp"]
+    until = (datetime.fromisoformat(since) + timedelta(hours=1)).isoformat()
+    directory = tempfile.mkdtemp()
+    try:
+        json_path = os.path.join(directory, "logs.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False, indent=2)
+        json_size = os.path.getsize(json_path)
+
+        def read_json() -> list:
+            with open(json_path, "r", encoding="utf-8") as f:
+                return [r for r in json.load(f) if since <= r["timestamp"] <= until]
+
+        print(f"{args.count} journaux, blocs de {args.block_records}")
+        print(f"  logs.json (indent=2)     : {json_size / 1e6:>8.1f} Mo, lecture d'une heure : "
+              f"{median_ms(read_json):>9.1f} ms")
+        for codec in ("zlib", "lzma"):
+            path = os.path.join(directory, f"logs-archive-{codec}.jsonz")
+            begin = time.perf_counter()
+            archive = write_archive(path, records, codec=codec, block_records=args.block_records)
+            elapsed = time.perf_counter() - begin
+            size = os.path.getsize(path)
+            latency = median_ms(lambda: list(archive.records(since, until)))
+            print(f"  archive {codec:<16} : {size / 1e6:>8.1f} Mo (x{json_size / size:.1f}), "
+                  f"lecture d'une heure : {latency:>9.1f} ms, écriture : {elapsed:.1f} s")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
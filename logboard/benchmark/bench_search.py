@@ -0,0 +1,83 @@
+"""Mesure la latence de la recherche plein texte de l'index résident.
+
+Construit un index de journaux synthétiques puis chronomètre des recherches
+courantes (mot rare, mot fréquent, paire clé=valeur, combinaison avec un
+niveau). À lancer depuis le dossier logboard :
+
+    python -m benchmark.bench_search --count 1000000
+"""
+import time
+import random
+import argparse
+
+from datetime import datetime, timedelta
+from manager.log_index import LogIndex, parse_search
+
+MESSAGES = [
+    "Connexion réussie", "Connexion refusée", "Requête SQL exécutée", "Délai dépassé (timeout)",
+    "Fichier introuvable", "Cache vidé", "Utilisateur déconnecté", "Erreur de validation",
+]
+LEVELS = ["DEBUG", "INFO", "INFO", "INFO", "WARNING", "ERROR", "CRITICAL"]
+MODULES = ["auth", "database", "api", "cache", "preprocessor"]
+
+
+def build(count: int) -> LogIndex:
+    """Construit un index de ``count`` journaux synthétiques.
+
+    Args:
+        count (int): Nombre de journaux.
+
+    Returns:
+        LogIndex: Index rempli.
+    """
+    rng = random.Random(42)
+    start = datetime(2025, 7, 1)
+    index = LogIndex()
+    for i in range(count):
+        index.add({
+            "id": str(i + 1),
+            "timestamp": (start + timedelta(seconds=i)).isoformat(),
+            "level": rng.choice(LEVELS),
+            "module": rng.choice(MODULES),
+            "message": rng.choice(MESSAGES),
+            "context": {"user_id": f"user{rng.randrange(10000)}", "error_code": rng.choice([200, 404, 500])},
+        })
+    return index
+
+
+def measure(index: LogIndex, query: str, level: str = None, limit: int = 200, repeat: int = 20) -> float:
+    """Retourne la latence médiane (ms) d'une recherche paginée.
+
+    Args:
+        index (LogIndex): Index interrogé.
+        query (str): Recherche au format de ``parse_search``.
+        level (str): Filtre de niveau optionnel.
+        limit (int): Taille de page.
+        repeat (int): Nombre de mesures.
+
+    Returns:
+        float: Latence médiane en millisecondes.
+    """
+    terms = parse_search(query)
+    timings = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        matches = index.query(level=level, terms=terms)
+        for _, _ in zip(range(limit), matches):
+            pass
+        timings.append((time.perf_counter() - begin) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000000)
+    args = parser.parse_args()
+
+    begin = time.perf_counter()
+    index = build(args.count)
+    print(f"Indexation de {args.count} journaux : {time.perf_counter() - begin:.1f} s")
+    for query, level in [("timeout", None), ("connexion", None), ("user_id=user42", None),
+                         ("connexion error_code=500", "ERROR"), ("introuvable user_id=user7", None)]:
+        label = f"{query} ({level})" if level else query
+        print(f"  {label:<35}: {measure(index, query, level):>8.2f} ms")
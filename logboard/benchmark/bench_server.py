@@ -0,0 +1,139 @@
+"""Mesure le débit du serveur logboard en production sous requêtes concurrentes.
+
+Lance ``python -m interface.server --production`` sur un répertoire de journaux
+temporaire, le remplit, puis ``--clients`` clients enchaînent pendant
+``--duration`` secondes des lectures (GET /logs), des écritures par lots
+(POST /logs/batch) et des lectures de métriques (GET /metrics), chacun sur sa
+propre connexion. La mesure est faite avec et sans keep-alive. À lancer depuis
+le dossier logboard :
+
+    python -m benchmark.bench_server --clients 32 --workers 32
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import signal
+import argparse
+import tempfile
+import threading
+import subprocess
+import http.client
+
+from typing import Dict, List, Tuple
+
+# Requêtes envoyées par les clients : (méthode, chemin, corps) et proportion
+BATCH_BODY = json.dumps([
+    {"level": "INFO", "message": f"Fichier {i} traité", "module": "benchmark"} for i in range(10)
+])
+REQUESTS: List[Tuple[Tuple[str, str, str], float]] = [
+    (("GET", "/logs?limit=50", ""), 0.6),
+    (("GET", "/logs?q=erreur&limit=50", ""), 0.1),
+    (("POST", "/logs/batch", BATCH_BODY), 0.2),
+    (("GET", "/metrics", ""), 0.1),
+]
+
+
+def start_server(directory: str, port: int, workers: int, keepalive: float, storage: str) -> subprocess.Popen:
+    """Lance le serveur en production et attend qu'il soit prêt."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root, LOGBOARD_STORAGE=storage)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "interface.server", "--production", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--keepalive", str(keepalive)],
+        cwd=directory, env=env, stdout=subprocess.PIPE, text=True
+    )
+    line = process.stdout.readline()
+    if "écoute" not in line:
+        process.kill()
+        raise RuntimeError(f"Le serveur n'a pas démarré : {line!r}")
+    return process
+
+
+def fill(port: int, count: int) -> None:
+    """Écrit ``count`` journaux, dont un sur dix en erreur, par lots de 1000."""
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    for start in range(0, count, 1000):
+        body = json.dumps([{
+            "level": "ERROR" if i % 10 == 0 else "INFO",
+            "message": f"{'Erreur' if i % 10 == 0 else 'Traitement'} du fichier {i}",
+            "module": f"worker{i % 8}"
+        } for i in range(start, min(start + 1000, count))])
+        connection.request("POST", "/logs/batch", body, {"Content-Type": "application/json"})
+        connection.getresponse().read()
+    connection.close()
+
+
+def client(port: int, deadline: float, latencies: Dict[str, List[float]], errors: List[int]) -> None:
+    """Enchaîne des requêtes tirées au hasard jusqu'à ``deadline``, sur une connexion."""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    requests, weights = zip(*REQUESTS)
+    rng = random.Random()
+    while time.perf_counter() < deadline:
+        method, path, body = rng.choices(requests, weights)[0]
+        start = time.perf_counter()
+        try:
+            connection.request(method, path, body or None, {"Content-Type": "application/json"} if body else {})
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException):
+            errors.append(0)
+            connection.close()
+            continue
+        latencies.setdefault(path.split("?")[0] if method == "POST" else path, []).append(
+            time.perf_counter() - start)
+    connection.close()
+
+
+def run(clients: int, duration: float, workers: int, keepalive: float, storage: str, count: int) -> None:
+    """Mesure et affiche le débit et les latences pour une configuration du serveur."""
+    directory = tempfile.mkdtemp()
+    port = 5100 + random.randrange(800)
+    process = start_server(directory, port, workers, keepalive, storage)
+    try:
+        fill(port, count)
+        per_client: List[Dict[str, List[float]]] = [{} for _ in range(clients)]
+        errors: List[int] = []
+        deadline = time.perf_counter() + duration
+        threads = [threading.Thread(target=client, args=(port, deadline, per_client[i], errors))
+                   for i in range(clients)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        process.send_signal(signal.SIGTERM)
+        code = process.wait(timeout=30)
+        shutil.rmtree(directory, ignore_errors=True)
+
+    latencies: Dict[str, List[float]] = {}
+    for measures in per_client:
+        for path, values in measures.items():
+            latencies.setdefault(path, []).extend(values)
+    total = sum(len(values) for values in latencies.values())
+    label = f"keep-alive {keepalive:g} s" if keepalive else "sans keep-alive"
+    print(f"{label:<18}: {total / elapsed:>8.0f} requêtes/s ({clients} clients, {workers} workers, "
+          f"{len(errors)} erreurs, arrêt code {code})")
+    for path, values in sorted(latencies.items()):
+        values.sort()
+        p50, p99 = values[len(values) // 2], values[int(len(values) * 0.99)]
+        print(f"    {path:<24} {len(values):>7} requêtes   p50 {p50 * 1000:>7.1f} ms   p99 {p99 * 1000:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--storage", choices=("json", "segments", "sqlite"), default="segments")
+    parser.add_argument("--count", type=int, default=20000, help="Nombre de journaux écrits avant la mesure")
+    args = parser.parse_args()
+
+    for keepalive in (5.0, 0.0):
+        run(args.clients, args.duration, args.workers, keepalive, args.storage, args.count)
@@ -0,0 +1,88 @@
+"""Mesure l'écriture concurrente de plusieurs processus sur un même répertoire.
+
+Chaque processus crée son propre LogManager sur le répertoire partagé, comme le
+serveur, ``add_sample_logs`` et les workers de prétraitement. Après chaque
+exécution, les journaux sont relus pour vérifier qu'aucun n'a été perdu, dupliqué
+ou tronqué. À lancer depuis le dossier logboard :
+
+    python -m benchmark.bench_writers --count 20000 --writers 1 2 4 8
+"""
+import time
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+import multiprocessing.synchronize
+
+from model.log import Log
+from manager.log_manager import LogManager
+
+
+def write_logs(directory: str, storage: str, worker: int, count: int, buffered: bool,
+               start: multiprocessing.synchronize.Event) -> None:
+    """Écrit ``count`` journaux depuis un processus écrivain."""
+    log_manager = LogManager(directory=directory, storage=storage, buffered=buffered)
+    start.wait()
+    for i in range(count):
+        log_manager.create_log(Log(level="INFO", message=f"{worker}-{i}", module=f"worker{worker}",
+                                   context={"batch": i}))
+    log_manager.close()
+
+
+def run(storage: str, writers: int, count: int, buffered: bool) -> float:
+    """Lance ``writers`` processus écrivant chacun ``count`` journaux.
+
+    Args:
+        storage (str): Mode de stockage de LogManager.
+        writers (int): Nombre de processus écrivains.
+        count (int): Nombre de journaux par processus.
+        buffered (bool): Active l'écriture différée dans chaque processus.
+
+    Returns:
+        float: Débit total mesuré (journaux par seconde).
+
+    Raises:
+        AssertionError: Si des journaux ont été perdus ou dupliqués.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        LogManager(directory=directory, storage=storage).close()
+        start = multiprocessing.Event()
+        processes = [
+            multiprocessing.Process(target=write_logs,
+                                    args=(directory, storage, worker, count, buffered, start))
+            for worker in range(writers)
+        ]
+        for process in processes:
+            process.start()
+        began = time.perf_counter()
+        start.set()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - began
+
+        logs = LogManager(directory=directory, storage=storage).read_logs()
+        expected = writers * count
+        assert len(logs) == expected, f"{expected - len(logs)} journaux perdus"
+        assert len({log.id for log in logs}) == expected, "IDs en double"
+        assert {log.message for log in logs} == {
+            f"{worker}-{i}" for worker in range(writers) for i in range(count)
+        }, "Journaux altérés"
+        return expected / elapsed
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20000, help="Journaux par processus")
+    parser.add_argument("--json-count", type=int, default=200,
+                        help="Journaux par processus en mode json (réécriture complète)")
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    for writers in args.writers:
+        print(f"{writers} écrivain(s)")
+        print(f"  json synchrone           : {run('json', writers, args.json_count, False):>10.0f} journaux/s")
+        print(f"  segments différé         : {run('segments', writers, args.count, True):>10.0f} journaux/s")
+        print(f"  sqlite différé           : {run('sqlite', writers, args.count, True):>10.0f} journaux/s")
@@ -0,0 +1,48 @@
+"""Agent logboard : envoie les journaux d'une machine à un logboard central.
+
+L'agent suit le stockage local (celui qu'utilisent les tâches de prétraitement
+de la machine) et envoie les nouveaux journaux par lots au serveur central
+(voir ``LogShipper``). À lancer depuis le dossier logboard de chaque machine :
+
+    python -m interface.agent --collector http://central:5000 --directory ./logs
+
+Pour essayer en local, lancer un serveur central (``python -m interface.server``)
+puis un agent sur un autre répertoire de journaux, avec ``--once`` pour envoyer
+les journaux en attente et s'arrêter.
+"""
+import os
+import time
+import argparse
+
+from manager.log_manager import LogManager, STORAGE_MODES
+from manager.log_shipper import LogShipper
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--collector", required=True, help="URL du logboard central")
+    parser.add_argument("--directory", default="./logs", help="Répertoire des journaux locaux")
+    parser.add_argument("--storage", choices=STORAGE_MODES, default=os.environ.get("LOGBOARD_STORAGE", "json"))
+    parser.add_argument("--spool", help="Répertoire des lots en attente (par défaut <directory>/spool)")
+    parser.add_argument("--node", help="Nom de la machine (par défaut le nom d'hôte)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--once", action="store_true", help="Envoyer les journaux en attente puis s'arrêter")
+    args = parser.parse_args()
+
+    shipper = LogShipper(
+        LogManager(directory=args.directory, storage=args.storage),
+        args.collector,
+        spool_dir=args.spool or os.path.join(args.directory, "spool"),
+        node=args.node,
+        batch_size=args.batch_size,
+        interval=args.interval
+    )
+    if args.once:
+        print(f"{shipper.run_once()} journaux envoyés depuis {shipper.node}")
+    else:
+        shipper.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            shipper.stop()
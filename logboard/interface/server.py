@@ -1,54 +1,617 @@
-import time
+import os
+
+# Worker "gevent" : threads, verrous et sockets doivent devenir coopératifs avant tout autre import
+WORKER = os.environ.get("LOGBOARD_WORKER", "threads")
+if WORKER == "gevent":
+    from gevent import monkey
+    monkey.patch_all()
+
+import io
+import re
+import csv
 import json
+import time
+import zlib
+import argparse
 import threading
+import itertools
 
-from typing import Dict, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from datetime import datetime, timedelta
 from flask_socketio import SocketIO, emit
+from model.log import Log
+from manager.json_store import JsonStore
 from manager.log_manager import LogManager
+from manager.segment_store import SegmentStore
 from utilities.sample_logs import add_sample_logs
-from utilities.system_monitor import get_system_performance
-from flask import Flask, jsonify, send_from_directory, request, Response
+from utilities.system_monitor import IoMonitor, ProcessMonitor, SystemSampler, get_system_performance
+from utilities.metrics_history import MetricsHistory
+from utilities.metrics_registry import CONTENT_TYPE, CallbackMetric, Histogram, MetricsRegistry
+from manager.log_rollups import parse_bucket
+from manager.log_index import encode_cursor
+from interface.wsgi_server import DEFAULT_KEEPALIVE, DEFAULT_WORKERS, SHUTDOWN_GRACE, serve
+from flask import Flask, g, jsonify, send_from_directory, request, Response, stream_with_context
 
 app = Flask(__name__, static_folder="../public")
-socketio = SocketIO(app, cors_allowed_origins="*")
-log_manager = LogManager(directory="./logs")
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode="gevent" if WORKER == "gevent" else "threading")
 
-def send_performance_periodically():
-    """Envoie les performances du système via WebSocket toutes les 2 secondes."""
-    while True:
-        performance = get_system_performance()
-        socketio.emit("performance", performance)
-        time.sleep(2)
+def open_log_manager(directory: str = "./logs") -> LogManager:
+    """Crée le gestionnaire de journaux selon les variables d'environnement.
+
+    - LOGBOARD_STORAGE : "json" (défaut), "segments" ou "sqlite" (plusieurs workers).
+    - LOGBOARD_PARTITION : "daily" (défaut) ou "hourly", en mode "segments".
+    - LOGBOARD_RETENTION_DAYS, LOGBOARD_RETENTION_BYTES : rétention des segments.
+    - LOGBOARD_ARCHIVE_DAYS : âge à partir duquel les journaux sont archivés
+      (compressés) hors de logs.json, en mode "json".
+
+    Returns:
+        LogManager: Gestionnaire configuré.
+    """
+    storage = os.environ.get("LOGBOARD_STORAGE", "json")
+    archive_days = os.environ.get("LOGBOARD_ARCHIVE_DAYS")
+    if storage == "json" and archive_days:
+        os.makedirs(directory, exist_ok=True)
+        storage = JsonStore(os.path.join(directory, "logs.json"), archive_after=timedelta(days=float(archive_days)))
+    elif storage == "segments":
+        days = os.environ.get("LOGBOARD_RETENTION_DAYS")
+        max_bytes = os.environ.get("LOGBOARD_RETENTION_BYTES")
+        storage = SegmentStore(
+            os.path.join(directory, "segments"),
+            partition=os.environ.get("LOGBOARD_PARTITION", "daily"),
+            max_age=timedelta(days=float(days)) if days else None,
+            max_bytes=int(max_bytes) if max_bytes else None
+        )
+    return LogManager(directory=directory, storage=storage)
+
+# Gestionnaire des journaux, ouvert au premier usage : importer ce module ne
+# crée ni répertoire ni fichier
+log_manager: Optional[LogManager] = None
+_log_manager_lock = threading.Lock()
+
+def get_log_manager() -> LogManager:
+    """Retourne le gestionnaire de journaux, ouvert au premier appel.
+
+    Le répertoire est ``LOGBOARD_DIRECTORY`` (./logs par défaut), voir
+    ``open_log_manager`` pour les autres réglages.
+
+    Returns:
+        LogManager: Gestionnaire partagé par les routes du serveur.
+    """
+    global log_manager
+    if log_manager is None:
+        with _log_manager_lock:
+            if log_manager is None:
+                log_manager = open_log_manager(os.environ.get("LOGBOARD_DIRECTORY", "./logs"))
+    return log_manager
+
+# Processus suivis : ceux enregistrés par POST /performance/processes, plus les
+# LOGBOARD_TOP_PROCESSES (5 par défaut) plus gros consommateurs
+process_monitor = ProcessMonitor(top=int(os.environ.get("LOGBOARD_TOP_PROCESSES", 5)))
+# Débits disque et réseau, détaillés par périphérique si LOGBOARD_IO_PER_DEVICE=1
+io_monitor = IoMonitor(per_device=os.environ.get("LOGBOARD_IO_PER_DEVICE") == "1")
+# Performances échantillonnées en arrière-plan (LOGBOARD_SAMPLE_INTERVAL secondes, 1 par défaut)
+SAMPLE_INTERVAL = float(os.environ.get("LOGBOARD_SAMPLE_INTERVAL", 1.0))
+# Le parcours des processus, le plus coûteux des échantillons, n'a lieu que si les
+# processus sont lus : par un abonné aux performances, ou par GET /performance/processes
+# dans les PROCESS_READ_WINDOW dernières secondes. L'historique ne garde que les compteurs.
+PROCESS_READ_WINDOW = 30.0
+_processes_read_at = float("-inf")
+
+def processes_wanted() -> bool:
+    """Indique si le prochain échantillon doit parcourir les processus."""
+    return bool(performance_subscriptions) or time.monotonic() - _processes_read_at < PROCESS_READ_WINDOW
+
+def sample_performance(interval: Optional[float]) -> Dict[str, Any]:
+    """Mesure un échantillon pour ``performance_sampler`` (voir ``get_system_performance``)."""
+    return get_system_performance(interval, process_monitor=process_monitor if processes_wanted() else None,
+                                  io_monitor=io_monitor)
+
+performance_sampler = SystemSampler(interval=SAMPLE_INTERVAL, sample=sample_performance)
+# Historique des performances en mémoire bornée, alimenté par l'échantillonneur
+performance_history = MetricsHistory()
+performance_sampler.add_listener(performance_history.add)
+
+# Nombre maximal de points par métrique dans /performance/history
+MAX_HISTORY_POINTS = 5000
+
+# Diffusion des performances : cadence choisie par chaque client (en secondes),
+# variations inférieures au seuil non renvoyées, au plus une trame par
+# PERFORMANCE_FRAME_INTERVAL (les échantillons plus rapprochés sont groupés)
+PERFORMANCE_INTERVAL = 2.0
+PERFORMANCE_MIN_INTERVAL = 0.25
+PERFORMANCE_MAX_INTERVAL = 60.0
+PERFORMANCE_THRESHOLD = 0.5
+PERFORMANCE_FRAME_INTERVAL = 1.0
+# Abonnements aux performances, par identifiant de client Socket.IO
+performance_subscriptions: Dict[str, Dict[str, Any]] = {}
+_performance_lock = threading.Lock()
+
+# Export : formats disponibles et colonnes du CSV
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_COLUMNS = ["id", "timestamp", "level", "module", "message", "context"]
+EXPORT_PAGE_SIZE = 1000
+
+# Écriture par lots (POST /logs/batch) : taille maximale du corps décompressé,
+# nombre maximal de journaux et d'erreurs détaillées dans une réponse 400
+BATCH_MAX_BYTES = 64 * 1024 * 1024
+BATCH_MAX_LOGS = 50000
+BATCH_MAX_ERRORS = 20
+# Nom de machine d'un agent (voir ``LogShipper``)
+NODE_PATTERN = re.compile(r"^[\w.-]{1,128}$")
+# Sérialise la déduplication et l'écriture des lots d'agents
+_ingest_lock = threading.Lock()
+
+# Suivi en direct : les journaux arrivés pendant l'intervalle sont envoyés en un lot
+LOG_STREAM_INTERVAL = 0.5
+LOG_STREAM_BATCH = 500
+# Abonnements au flux des journaux, par identifiant de client Socket.IO
+log_subscriptions: Dict[str, Dict[str, Any]] = {}
+_subscriptions_lock = threading.Lock()
+_stream_lock = threading.Lock()
+_stream_started = False
+
+# Métriques exposées par GET /metrics, au format texte de Prometheus
+metrics_registry = MetricsRegistry()
+request_latency = metrics_registry.register(Histogram(
+    "logboard_http_request_duration_seconds", "Durée de traitement des requêtes HTTP, par route.",
+    ["method", "route", "status"]
+))
+
+def performance_gauge(key: str, per_gpu: Optional[str] = None) -> Callable[[], Dict[tuple, Optional[float]]]:
+    """Retourne la lecture d'une métrique du dernier échantillon (par GPU avec ``per_gpu``)."""
+    def collect() -> Dict[tuple, Optional[float]]:
+        sample = performance_sampler.snapshot()
+        if per_gpu is None:
+            return {(): sample.get(key)}
+        return {(str(gpu["index"]),): gpu.get(per_gpu) for gpu in sample.get("gpus", [])}
+    return collect
+
+for name, documentation, collect, labels in (
+    ("logboard_cpu_percent", "Utilisation du CPU (%).", performance_gauge("cpu_percent"), ()),
+    ("logboard_ram_percent", "Utilisation de la RAM (%).", performance_gauge("ram_percent"), ()),
+    ("logboard_gpu_percent", "Utilisation du GPU (%).", performance_gauge("gpus", "gpu_percent"), ("gpu",)),
+    ("logboard_gpu_memory_percent", "Utilisation de la mémoire du GPU (%).",
+     performance_gauge("gpus", "memory_percent"), ("gpu",)),
+    ("logboard_disk_read_bytes_per_second", "Débit de lecture disque (octets/s).",
+     performance_gauge("disk_read_bytes_per_s"), ()),
+    ("logboard_disk_write_bytes_per_second", "Débit d'écriture disque (octets/s).",
+     performance_gauge("disk_write_bytes_per_s"), ()),
+    ("logboard_disk_read_iops", "Lectures disque par seconde.", performance_gauge("disk_read_iops"), ()),
+    ("logboard_disk_write_iops", "Écritures disque par seconde.", performance_gauge("disk_write_iops"), ()),
+    ("logboard_network_receive_bytes_per_second", "Débit réseau reçu (octets/s).",
+     performance_gauge("net_rx_bytes_per_s"), ()),
+    ("logboard_network_transmit_bytes_per_second", "Débit réseau émis (octets/s).",
+     performance_gauge("net_tx_bytes_per_s"), ()),
+    ("logboard_performance_sample_age_seconds", "Âge du dernier échantillon de performances.",
+     lambda: {(): time.time() - performance_sampler.sampled_at if performance_sampler.sampled_at else None}, ()),
+    ("logboard_log_queue_depth", "Journaux en attente d'écriture.", lambda: {(): get_log_manager().pending}, ()),
+    ("logboard_subscribers", "Clients Socket.IO abonnés, par canal.",
+     lambda: {("logs",): len(log_subscriptions), ("performance",): len(performance_subscriptions)}, ("channel",)),
+):
+    metrics_registry.register(CallbackMetric(name, documentation, collect, labels))
+metrics_registry.register(CallbackMetric(
+    "logboard_logs_ingested_total", "Journaux écrits par ce processus, par niveau et module.",
+    lambda: dict(get_log_manager().ingested), ["level", "module"], kind="counter"
+))
+
+@app.before_request
+def start_request_timer() -> None:
+    """Note l'heure de début de la requête (latence mesurée par ``record_request_latency``)."""
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response: Response) -> Response:
+    """Enregistre la durée de la requête dans ``request_latency``.
+
+    Pour une réponse en flux (export), la durée mesurée s'arrête au premier octet.
+    """
+    started = g.pop("request_started", None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else "<inconnue>"
+        request_latency.observe(time.perf_counter() - started, method=request.method,
+                                route=route, status=str(response.status_code))
+    return response
+
+@app.route("/metrics", methods=["GET"])
+def get_metrics() -> Response:
+    """Expose les métriques au format texte de Prometheus.
+
+    Toutes les valeurs sont lues en mémoire (dernier échantillon de performances,
+    compteurs d'écriture, files et abonnements, histogrammes de latence) : une
+    collecte ne mesure rien et ne lit pas le stockage.
+
+    Returns:
+        str: Métriques au format d'exposition texte (version 0.0.4).
+    """
+    return Response(metrics_registry.render(), content_type=CONTENT_TYPE)
 
 @app.route("/performance", methods=["GET"])
 def get_performance() -> Response:
     """Récupère les performances actuelles du système.
 
     Returns:
-        Dict[str, float]: Dictionnaire avec l'utilisation du CPU, RAM et GPU (si disponible).
+        Dict[str, float]: Dictionnaire avec l'utilisation du CPU, RAM et GPU (si disponible),
+        issu du dernier échantillon de ``performance_sampler`` (sans attente).
     """
-    return jsonify(get_system_performance())
+    return jsonify(performance_sampler.snapshot())
+
+@app.route("/performance/history", methods=["GET"])
+def get_performance_history() -> Response:
+    """Retourne l'historique récent des performances, sous-échantillonné.
+
+    Paramètres de requête (tous optionnels) :
+        - range : période jusqu'à maintenant ("15m", "1h" par défaut, "7d"...).
+        - points : nombre maximal de points par métrique (300 par défaut).
+        - metrics : métriques séparées par des virgules (par défaut toutes).
+        - mode : sous-échantillonnage "lttb" (défaut) ou "minmax".
+
+    Returns:
+        Dict: Résolution source et points ``[horodatage, valeur]`` par métrique
+        (voir ``MetricsHistory.query``).
+    """
+    args = request.args
+    performance_sampler.start()
+    try:
+        points = int(args.get("points", 300))
+        if points > MAX_HISTORY_POINTS:
+            raise ValueError(f"Le nombre de points est limité à {MAX_HISTORY_POINTS}")
+        history = performance_history.query(
+            parse_bucket(args.get("range", "1h")),
+            points=points,
+            metrics=args["metrics"].split(",") if args.get("metrics") else None,
+            mode=args.get("mode", "lttb")
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(history)
+
+@app.route("/performance/processes", methods=["GET"])
+def get_processes() -> Response:
+    """Retourne les mesures par processus du dernier échantillon (ou mesurées à la demande).
+
+    Returns:
+        Dict: 'processes' (voir ``ProcessMonitor.processes``) et 'registered'
+        (identifiants des processus enregistrés).
+    """
+    global _processes_read_at
+    _processes_read_at = time.monotonic()
+    processes = performance_sampler.snapshot().get("processes")
+    if processes is None:
+        # Parcours en pause jusqu'ici : mesurer maintenant, les échantillons suivants le reprennent
+        processes = process_monitor.processes()
+    return jsonify({"processes": processes, "registered": process_monitor.registered()})
+
+@app.route("/performance/processes", methods=["POST"])
+def register_process() -> Response:
+    """Enregistre un processus à suivre (par exemple un worker de prétraitement).
+
+    Corps JSON : {"pid": 1234, "name": "clean_image_directory"} ("name" optionnel).
+
+    Returns:
+        Dict: Processus enregistré (201), ou erreur 400 si le processus n'existe pas.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        pid = data.get("pid")
+        if isinstance(pid, bool) or not isinstance(pid, int):
+            raise ValueError(f"Identifiant de processus invalide : {pid}")
+        process_monitor.register(pid, name=data.get("name"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"pid": pid, "name": data.get("name")}), 201
+
+@app.route("/performance/processes/<int:pid>", methods=["DELETE"])
+def unregister_process(pid: int) -> Response:
+    """Arrête le suivi d'un processus enregistré.
+
+    Returns:
+        Dict: Message de confirmation, ou erreur 404 si le processus n'était pas suivi.
+    """
+    if not process_monitor.unregister(pid):
+        return jsonify({"error": f"Processus non suivi : {pid}"}), 404
+    return jsonify({"message": f"Processus {pid} retiré du suivi"})
 
 @app.route("/logs", methods=["GET"])
 def get_logs() -> Response:
-    """Récupère les journaux stockés.
+    """Récupère les journaux stockés, du plus récent au plus ancien.
+
+    Paramètres de requête (tous optionnels) :
+        - level, module : filtres exacts.
+        - since, until : bornes temporelles ISO 8601 incluses.
+        - limit : taille de la page (sans limite, tous les journaux sont retournés).
+        - before, after : curseurs de pagination (voir ``LogManager.query_records``).
+        - q : recherche plein texte dans les messages et le contexte
+          (ex. ``q=timeout user_id=user123``, voir ``LogManager.search``).
+        - node : machine d'origine des journaux reçus d'agents (un journal local
+          dont le contexte a une clé "node" n'est pas concerné).
+
+    Le curseur de la page suivante est transmis dans l'en-tête ``X-Next-Cursor`` ;
+    pour la première page, l'en-tête ``X-Head-Cursor`` désigne le journal le plus
+    récent, à partir duquel suivre les nouveaux journaux.
 
     Returns:
         List[Dict]: Liste des journaux sous forme de dictionnaires.
     """
-    level = request.args.get("level")
-    logs = log_manager.read_logs(filter_level=level)
-    return jsonify([log.to_dict() for log in logs])
+    args = request.args
+    try:
+        limit = int(args["limit"]) if args.get("limit") else None
+        # Journaux sérialisés tels que stockés, sans objet Log intermédiaire
+        records, next_cursor = get_log_manager().query_records(
+            level=args.get("level"),
+            module=args.get("module"),
+            since=args.get("since"),
+            until=args.get("until"),
+            before=args.get("before"),
+            after=args.get("after"),
+            limit=limit,
+            q=args.get("q"),
+            node=args.get("node")
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    response = jsonify(records)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if records and not args.get("before") and not args.get("after"):
+        # Point de départ du suivi en direct (événement "subscribe_logs")
+        response.headers["X-Head-Cursor"] = encode_cursor(records[0])
+    return response
+
+@app.route("/logs/stats", methods=["GET"])
+def get_logs_stats() -> Response:
+    """Retourne le nombre de journaux par intervalle de temps, niveau et module.
+
+    Paramètres de requête (tous optionnels) :
+        - bucket : durée des intervalles ("1m", "15m", "1h" par défaut, "1d"...).
+        - since, until : bornes temporelles ISO 8601.
+        - level, module : filtres exacts.
+
+    Returns:
+        Dict: Histogramme calculé à partir des compteurs pré-agrégés
+        (voir ``LogManager.stats``).
+    """
+    args = request.args
+    try:
+        stats = get_log_manager().stats(
+            bucket=args.get("bucket", "1h"),
+            since=args.get("since"),
+            until=args.get("until"),
+            level=args.get("level"),
+            module=args.get("module")
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(stats)
+
+@app.route("/logs/export", methods=["GET"])
+def export_logs() -> Response:
+    """Exporte les journaux en flux NDJSON ou CSV, du plus récent au plus ancien.
+
+    Les journaux sont lus par pages et envoyés au fur et à mesure (réponse
+    découpée) : la mémoire du serveur reste constante quel que soit le volume
+    exporté. Le flux est compressé en gzip si le client l'accepte
+    (en-tête ``Accept-Encoding``).
+
+    Paramètres de requête (tous optionnels) :
+        - format : "ndjson" (défaut, un journal JSON par ligne) ou "csv".
+        - level, module, since, until, q, node : mêmes filtres que ``GET /logs``.
+
+    Returns:
+        Response: Flux des journaux en pièce jointe.
+    """
+    args = request.args
+    export_format = args.get("format", "ndjson")
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"Format invalide : {export_format}. "
+                                 f"Doit être l'un de {', '.join(EXPORT_FORMATS)}"}), 400
+    pages = get_log_manager().iter_pages(
+        level=args.get("level"),
+        module=args.get("module"),
+        since=args.get("since"),
+        until=args.get("until"),
+        q=args.get("q"),
+        node=args.get("node"),
+        page_size=EXPORT_PAGE_SIZE
+    )
+    try:
+        # Lire la première page avant d'envoyer l'en-tête : un filtre invalide donne une 400
+        first_page = next(pages, None)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    def chunks() -> Iterator[bytes]:
+        if export_format == "csv":
+            yield encode_csv([EXPORT_COLUMNS])
+        for page in itertools.chain([first_page] if first_page else [], pages):
+            if export_format == "csv":
+                yield encode_csv([record.get(column) if column != "context"
+                                  else json.dumps(record.get("context") or {}, ensure_ascii=False)
+                                  for column in EXPORT_COLUMNS] for record in page)
+            else:
+                yield "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in page).encode("utf-8")
+
+    body: Iterable[bytes] = chunks()
+    headers = {"Content-Disposition": f"attachment; filename=logs.{export_format}"}
+    if "gzip" in request.accept_encodings:
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+    mimetype = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return Response(stream_with_context(body), mimetype=mimetype, headers=headers)
+
+def encode_csv(rows: Iterable[List[Any]]) -> bytes:
+    """Encode des lignes CSV en UTF-8."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Compresse un flux au format gzip, morceau par morceau."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+@app.route("/logs/batch", methods=["POST"])
+def create_logs_batch() -> Response:
+    """Ajoute un lot de journaux en une seule écriture.
+
+    Le corps est un tableau JSON de journaux ou du NDJSON (un journal JSON par
+    ligne), éventuellement compressé en gzip (en-tête ``Content-Encoding: gzip``).
+    Chaque journal a la forme ``{"level", "message", "module", "context",
+    "timestamp"}`` : ``level`` et ``message`` sont obligatoires, ``module`` vaut
+    "unknown" par défaut et ``timestamp`` (ISO 8601) maintenant ; un ``id``
+    fourni est ignoré. Le lot est validé en entier avant l'écriture : au moindre
+    journal invalide, rien n'est écrit.
+
+    Avec le paramètre de requête ``node`` (lots envoyés par un agent, voir
+    ``LogShipper``), chaque journal doit porter son ``id`` d'origine ; il est
+    conservé dans ``source_id`` et le journal reçoit le champ ``node``. Un agent
+    renvoie un lot tant qu'il n'a pas reçu de réponse : un journal dont le
+    couple (machine, ID d'origine) est déjà enregistré est un doublon, ignoré.
+
+    Returns:
+        Dict: ``{"count": n, "ids": [...], "duplicates": d}`` (201), IDs dans
+        l'ordre du lot (pour un doublon, l'ID du journal déjà enregistré) ; erreur 400
+        avec le détail des premiers journaux invalides (``errors`` : index et
+        message), ou 413 si le lot dépasse ``BATCH_MAX_BYTES`` ou ``BATCH_MAX_LOGS``.
+    """
+    if request.content_length is not None and request.content_length > BATCH_MAX_BYTES:
+        return jsonify({"error": f"Lot trop volumineux (plus de {BATCH_MAX_BYTES} octets)"}), 413
+    encoding = request.headers.get("Content-Encoding", "identity").lower()
+    try:
+        # Un corps envoyé par morceaux (Transfer-Encoding: chunked) n'a pas de Content-Length
+        data = read_limited(request.stream, BATCH_MAX_BYTES)
+        if encoding == "gzip":
+            data = gunzip_limited(data, BATCH_MAX_BYTES)
+        elif encoding != "identity":
+            return jsonify({"error": f"Encodage non pris en charge : {encoding}"}), 415
+        entries = parse_batch(data)
+    except OverflowError as e:
+        return jsonify({"error": str(e)}), 413
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if len(entries) > BATCH_MAX_LOGS:
+        return jsonify({"error": f"Lot trop volumineux (plus de {BATCH_MAX_LOGS} journaux)"}), 413
+    node = request.args.get("node")
+    if node is not None and not NODE_PATTERN.match(node):
+        return jsonify({"error": f"Nom de machine invalide : {node}"}), 400
+    logs, errors = [], []
+    for index, entry in enumerate(entries):
+        try:
+            logs.append(batch_entry_to_log(entry, node))
+        except (TypeError, ValueError) as e:
+            errors.append({"index": index, "error": str(e)})
+            if len(errors) >= BATCH_MAX_ERRORS:
+                break
+    if errors:
+        return jsonify({"error": "Lot refusé : journaux invalides", "errors": errors}), 400
+    if node is None:
+        get_log_manager().create_logs(logs)
+        return jsonify({"count": len(logs), "ids": [log.id for log in logs], "duplicates": 0}), 201
+    with _ingest_lock:
+        stored = get_log_manager().stored_sources(node, logs)
+        fresh: Dict[str, Log] = {}
+        for log in logs:
+            if log.source_id not in stored and log.source_id not in fresh:  # Ni enregistré, ni déjà dans ce lot
+                fresh[log.source_id] = log
+        get_log_manager().create_logs(list(fresh.values()))
+    ids = [stored[log.source_id] if log.source_id in stored else fresh[log.source_id].id for log in logs]
+    return jsonify({"count": len(fresh), "ids": ids, "duplicates": len(logs) - len(fresh)}), 201
+
+def read_limited(stream: Any, limit: int) -> bytes:
+    """Lit un corps de requête sans dépasser ``limit`` octets.
+
+    Raises:
+        OverflowError: Si le corps dépasse ``limit`` octets.
+    """
+    chunks, size = [], 0
+    while True:
+        chunk = stream.read(min(64 * 1024, limit + 1 - size))
+        if not chunk:
+            return b"".join(chunks)
+        size += len(chunk)
+        if size > limit:
+            raise OverflowError(f"Lot trop volumineux (plus de {limit} octets)")
+        chunks.append(chunk)
+
+def gunzip_limited(data: bytes, limit: int) -> bytes:
+    """Décompresse un corps gzip sans dépasser ``limit`` octets.
+
+    Raises:
+        OverflowError: Si le contenu décompressé dépasse ``limit`` octets.
+        ValueError: Si les données ne sont pas au format gzip.
+    """
+    decompressor = zlib.decompressobj(31)
+    try:
+        result = decompressor.decompress(data, limit + 1)
+    except zlib.error as e:
+        raise ValueError(f"Corps gzip invalide : {e}")
+    if len(result) > limit or decompressor.unconsumed_tail:
+        raise OverflowError(f"Lot trop volumineux (plus de {limit} octets décompressés)")
+    return result
+
+def parse_batch(data: bytes) -> List[Any]:
+    """Décode un lot : tableau JSON, ou NDJSON (lignes vides ignorées).
+
+    Raises:
+        ValueError: Si le corps n'est pas du JSON valide (avec le numéro de ligne en NDJSON).
+    """
+    text = data.decode("utf-8")
+    if text.lstrip().startswith("["):
+        try:
+            entries = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Tableau JSON invalide : {e}")
+        return entries
+    entries = []
+    for number, line in enumerate(text.splitlines(), start=1):
+        if line.strip():
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Ligne {number} : JSON invalide : {e}")
+    return entries
+
+def batch_entry_to_log(entry: Any, node: Optional[str] = None) -> Log:
+    """Valide un journal reçu par lot et le convertit en ``Log``.
+
+    Un horodatage avec fuseau horaire est converti en heure locale, comme les
+    horodatages des journaux créés sur place. Avec ``node``, l'``id`` du journal
+    (obligatoire) devient son ``source_id``.
+
+    Raises:
+        ValueError: Si un champ est absent ou invalide (dont un niveau hors de ``LogLevel``).
+    """
+    if not isinstance(entry, dict):
+        raise ValueError("Un journal doit être un objet JSON")
+    for field, required in (("level", True), ("message", True), ("module", False)):
+        if (required or field in entry) and not isinstance(entry.get(field), str):
+            raise ValueError(f"Le champ '{field}' doit être une chaîne")
+    context = entry.get("context") or {}
+    if not isinstance(context, dict):
+        raise ValueError("Le champ 'context' doit être un objet")
+    source_id = entry.get("id")
+    if node is not None and (isinstance(source_id, bool) or not isinstance(source_id, (str, int))):
+        raise ValueError("Le champ 'id' (ID d'origine) est obligatoire pour un lot d'agent")
+    timestamp = entry.get("timestamp")
+    if timestamp is not None:
+        timestamp = datetime.fromisoformat(timestamp)
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone().replace(tzinfo=None)
+    return Log(level=entry["level"], message=entry["message"], module=entry.get("module", "unknown"),
+               context=context, timestamp=timestamp, node=node,
+               source_id=str(source_id) if node is not None else None)
 
 @app.route("/logs/clear", methods=["POST"])
 def clear_logs() -> Response:
-    """Supprime tous les journaux dans le fichier logs.json.
+    """Supprime tous les journaux du stockage.
 
     Returns:
         Dict[str, str]: Message de confirmation.
     """
-    with open(log_manager.log_file, "w", encoding="utf-8") as f:
-        json.dump([], f, ensure_ascii=False)
+    get_log_manager().clear_logs()
     return jsonify({"message": "Journaux supprimés avec succès"})
 
 @app.route("/", defaults={"path": ""})
@@ -71,17 +634,267 @@ def handle_connect():
     """Gère la connexion d'un client WebSocket."""
     emit("message", {"data": "Connecté au serveur WebSocket"})
 
-def start_server():
+@socketio.on("subscribe_logs")
+def handle_subscribe_logs(data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Abonne le client aux nouveaux journaux correspondant à ses filtres.
+
+    Un nouvel abonnement remplace le précédent. Les journaux sont ensuite poussés
+    par lots dans l'événement ``logs`` (``{"logs": [...], "cursor": ...}``, plus
+    récent d'abord). Pour reprendre après une reconnexion, le client renvoie le
+    dernier curseur reçu dans ``after`` : seuls les journaux manqués sont envoyés.
+
+    Args:
+        data (Optional[Dict[str, Any]]): Filtres ``level``, ``module``, ``q`` et
+            curseur de reprise ``after`` (par défaut : le journal le plus récent).
+
+    Returns:
+        Dict[str, Any]: ``{"cursor": ...}`` ou ``{"error": ...}`` si un paramètre
+        est invalide.
+    """
+    data = data or {}
+    subscription = {key: data.get(key) or None for key in ("level", "module", "q")}
+    try:
+        subscription["cursor"] = data.get("after") or get_log_manager().head_cursor(**subscription)
+        # Valider le curseur et les filtres avant d'enregistrer l'abonnement
+        get_log_manager().query_records(after=subscription["cursor"], limit=1, **subscription_filters(subscription))
+    except ValueError as e:
+        return {"error": str(e)}
+    with _subscriptions_lock:
+        log_subscriptions[request.sid] = subscription
+    start_log_stream()
+    return {"cursor": subscription["cursor"]}
+
+@socketio.on("unsubscribe_logs")
+def handle_unsubscribe_logs() -> None:
+    """Arrête l'envoi des nouveaux journaux au client."""
+    with _subscriptions_lock:
+        log_subscriptions.pop(request.sid, None)
+
+@socketio.on("disconnect")
+def handle_disconnect(reason: Optional[str] = None) -> None:
+    """Oublie les abonnements d'un client déconnecté (il reprendra avec son curseur)."""
+    handle_unsubscribe_logs()
+    handle_unsubscribe_performance()
+
+@socketio.on("subscribe_performance")
+def handle_subscribe_performance(data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Abonne le client aux performances, à la cadence de son choix.
+
+    Un nouvel abonnement remplace le précédent. Le client reçoit aussitôt
+    l'échantillon courant, puis des trames ``performance`` de la forme
+    ``{"samples": [{"timestamp": ..., "values": {...}}, ...]}`` : chaque
+    échantillon ne contient que les métriques qui ont varié d'au moins
+    ``threshold`` depuis la dernière valeur envoyée (les autres sont inchangées),
+    et les échantillons plus rapprochés que ``PERFORMANCE_FRAME_INTERVAL`` sont
+    groupés dans une même trame. Sans abonné, rien n'est calculé ni envoyé.
+
+    Args:
+        data (Optional[Dict[str, Any]]): ``interval`` entre deux échantillons en
+            secondes (``PERFORMANCE_INTERVAL`` par défaut) et ``threshold``,
+            variation minimale d'une métrique pour être renvoyée
+            (``PERFORMANCE_THRESHOLD`` par défaut, 0 pour tout renvoyer).
+
+    Returns:
+        Dict[str, Any]: ``{"interval": ..., "threshold": ...}`` ou ``{"error": ...}``
+        si un paramètre est invalide.
     """
-    Demarer le serveur pour afficher les logs
-    :return:
+    data = data or {}
+    try:
+        interval = float(data.get("interval", PERFORMANCE_INTERVAL))
+        threshold = float(data.get("threshold", PERFORMANCE_THRESHOLD))
+        if not PERFORMANCE_MIN_INTERVAL <= interval <= PERFORMANCE_MAX_INTERVAL:
+            raise ValueError(f"L'intervalle doit être compris entre {PERFORMANCE_MIN_INTERVAL} "
+                             f"et {PERFORMANCE_MAX_INTERVAL} secondes : {interval}")
+        if threshold < 0:
+            raise ValueError(f"Le seuil doit être positif : {threshold}")
+    except (TypeError, ValueError) as e:
+        return {"error": str(e)}
+    performance_sampler.start()
+    timestamp, sample = performance_sampler.sampled_at or time.time(), performance_sampler.snapshot()
+    with _performance_lock:
+        performance_subscriptions[request.sid] = {
+            "interval": interval, "threshold": threshold, "sent": dict(sample),
+            "pending": [], "taken": timestamp, "flushed": timestamp
+        }
+        update_sample_interval()
+    emit("performance", {"samples": [{"timestamp": timestamp, "values": sample}]})
+    return {"interval": interval, "threshold": threshold}
+
+@socketio.on("unsubscribe_performance")
+def handle_unsubscribe_performance() -> None:
+    """Arrête l'envoi des performances au client."""
+    with _performance_lock:
+        if performance_subscriptions.pop(request.sid, None) is not None:
+            update_sample_interval()
+
+def update_sample_interval() -> None:
+    """Accélère l'échantillonnage pour l'abonné le plus rapide (à appeler sous ``_performance_lock``)."""
+    performance_sampler.interval = min([SAMPLE_INTERVAL] + [s["interval"] for s in performance_subscriptions.values()])
+
+def performance_changes(sent: Dict[str, Any], sample: Dict[str, Any], threshold: float) -> Dict[str, Any]:
+    """Retourne les métriques d'un échantillon qui diffèrent des dernières valeurs envoyées.
+
+    Une valeur numérique n'est retenue que si elle s'écarte d'au moins
+    ``threshold`` de la dernière valeur envoyée (une dérive lente finit donc par
+    être envoyée) ; les autres valeurs (mesures par GPU, par processus) dès
+    qu'elles changent.
+
+    Args:
+        sent (Dict[str, Any]): Dernières valeurs envoyées au client.
+        sample (Dict[str, Any]): Nouvel échantillon.
+        threshold (float): Variation minimale d'une valeur numérique.
+
+    Returns:
+        Dict[str, Any]: Métriques modifiées.
+    """
+    changes = {}
+    for key, value in sample.items():
+        if key in sent:
+            previous = sent[key]
+            numeric = all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (value, previous))
+            if (abs(value - previous) < threshold) if numeric else value == previous:
+                continue
+        changes[key] = value
+    return changes
+
+def broadcast_performance(timestamp: float, sample: Dict[str, Any]) -> None:
+    """Envoie un nouvel échantillon aux abonnés selon leur cadence (appelée par l'échantillonneur).
+
+    Args:
+        timestamp (float): Date de l'échantillon (``time.time()``).
+        sample (Dict[str, Any]): Échantillon au format de ``get_system_performance``.
+    """
+    frames = []
+    with _performance_lock:
+        # Tolérance d'un demi-intervalle d'échantillonnage (les échantillons ne tombent pas pile)
+        tolerance = performance_sampler.interval / 2
+        for sid, subscription in performance_subscriptions.items():
+            if timestamp + tolerance < subscription["taken"] + subscription["interval"]:
+                continue
+            subscription["taken"] = timestamp
+            changes = performance_changes(subscription["sent"], sample, subscription["threshold"])
+            subscription["sent"].update(changes)
+            subscription["pending"].append({"timestamp": timestamp, "values": changes})
+            if timestamp + tolerance >= subscription["flushed"] + PERFORMANCE_FRAME_INTERVAL:
+                frames.append((sid, subscription["pending"]))
+                subscription["pending"], subscription["flushed"] = [], timestamp
+    for sid, samples in frames:
+        socketio.emit("performance", {"samples": samples}, to=sid)
+
+performance_sampler.add_listener(broadcast_performance)
+
+def subscription_filters(subscription: Dict[str, Any]) -> Dict[str, Any]:
+    """Extrait les filtres d'un abonnement sous forme d'arguments de ``query_records``."""
+    return {"level": subscription["level"], "module": subscription["module"], "q": subscription["q"]}
+
+def push_new_logs() -> bool:
+    """Envoie à chaque abonné les journaux écrits depuis son curseur.
+
+    Les abonnés qui partagent les mêmes filtres et le même curseur sont servis
+    par une seule lecture.
+
+    Returns:
+        bool: True si un lot a atteint ``LOG_STREAM_BATCH`` (d'autres journaux
+        attendent).
+    """
+    with _stream_lock:
+        with _subscriptions_lock:
+            groups: Dict[tuple, List[str]] = {}
+            for sid, subscription in log_subscriptions.items():
+                key = (subscription["level"], subscription["module"], subscription["q"], subscription["cursor"])
+                groups.setdefault(key, []).append(sid)
+        backlog = False
+        for (level, module, q, cursor), sids in groups.items():
+            try:
+                records, next_cursor = get_log_manager().query_records(level=level, module=module, q=q,
+                                                                 after=cursor, limit=LOG_STREAM_BATCH)
+            except ValueError:
+                continue
+            if not records:
+                continue
+            backlog = backlog or len(records) == LOG_STREAM_BATCH
+            payload = {"logs": records, "cursor": next_cursor}
+            for sid in sids:
+                socketio.emit("logs", payload, to=sid)
+                with _subscriptions_lock:
+                    subscription = log_subscriptions.get(sid)
+                    # Ne pas écraser un abonnement remplacé entre-temps
+                    if subscription is not None and subscription["cursor"] == cursor:
+                        subscription["cursor"] = next_cursor
+        return backlog
+
+def stream_logs_periodically():
+    """Pousse les nouveaux journaux aux abonnés toutes les ``LOG_STREAM_INTERVAL`` secondes."""
+    while True:
+        # Sous forte charge, enchaîner les lots sans attendre
+        if not push_new_logs():
+            socketio.sleep(LOG_STREAM_INTERVAL)
+
+def start_log_stream() -> None:
+    """Démarre la tâche de suivi en direct au premier abonnement."""
+    global _stream_started
+    with _subscriptions_lock:
+        if _stream_started:
+            return
+        _stream_started = True
+    socketio.start_background_task(stream_logs_periodically)
+
+def stop_server() -> None:
+    """Ferme les connexions Socket.IO et arrête la diffusion des performances."""
+    socketio.server.eio.disconnect()
+    socketio.server.shutdown()
+    performance_sampler.stop()
+
+def start_server(host: str = "0.0.0.0", port: int = 5000, production: bool = False,
+                 workers: int = DEFAULT_WORKERS, keepalive: float = DEFAULT_KEEPALIVE,
+                 access_log: bool = False) -> None:
+    """Démarre le serveur du tableau de bord et de l'API des journaux.
+
+    Par défaut, le serveur de développement de werkzeug est lancé en mode debug,
+    avec rechargement automatique. En production, debug et rechargement sont
+    désactivés et les connexions sont servies par ``workers`` threads (ou par des
+    greenlets avec ``LOGBOARD_WORKER=gevent``, voir ``serve``). SIGINT ou SIGTERM
+    arrêtent alors proprement le serveur : les requêtes en cours se terminent,
+    puis les journaux en attente sont écrits et le stockage est fermé.
+
+    Args:
+        host (str): Adresse d'écoute.
+        port (int): Port d'écoute.
+        production (bool): Active le mode production.
+        workers (int): Nombre maximal de connexions servies simultanément.
+        keepalive (float): Attente maximale d'une requête sur une connexion
+            inactive, en secondes (0 : une requête par connexion).
+        access_log (bool): Journalise chaque requête (mode production).
     """
-    threading.Thread(target=send_performance_periodically, daemon=True).start()
-    socketio.run(app, host="0.0.0.0", port=5000, debug=True, allow_unsafe_werkzeug=True)
+    get_log_manager()  # Stockage ouvert au démarrage : une erreur de configuration apparaît tout de suite
+    performance_sampler.start()
+    if not production:
+        socketio.run(app, host=host, port=port, debug=True, allow_unsafe_werkzeug=True)
+        return
+    app.debug = False
+    try:
+        serve(app, host, port, worker=WORKER, workers=workers, keepalive=keepalive, grace=SHUTDOWN_GRACE,
+              access_log=access_log, on_stop=stop_server,
+              ready=lambda bound: print(f"Logboard en écoute sur http://{host}:{bound} "
+                                        f"({workers} workers {WORKER})", flush=True))
+    finally:
+        performance_sampler.stop()
+        get_log_manager().close()
 
 
 if __name__ == "__main__":
-    # Lancer le thread pour envoyer les performances périodiquement
-    add_sample_logs()
-    threading.Thread(target=send_performance_periodically, daemon=True).start()
-    socketio.run(app, host="0.0.0.0", port=5000, debug=True, allow_unsafe_werkzeug=True)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Serveur logboard : tableau de bord et API des journaux.")
+    parser.add_argument("--production", action="store_true",
+                        help="Sans debug ni rechargement ; worker choisi par LOGBOARD_WORKER (threads ou gevent)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("LOGBOARD_WORKERS", DEFAULT_WORKERS)))
+    parser.add_argument("--keepalive", type=float,
+                        default=float(os.environ.get("LOGBOARD_KEEPALIVE", DEFAULT_KEEPALIVE)))
+    parser.add_argument("--access-log", action="store_true")
+    args = parser.parse_args()
+    if not args.production:
+        # Journaux d'exemple pour le développement
+        add_sample_logs(os.environ.get("LOGBOARD_DIRECTORY", "logs"))
+    start_server(args.host, args.port, production=args.production, workers=args.workers,
+                 keepalive=args.keepalive, access_log=args.access_log)
@@ -0,0 +1,64 @@
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Plateformes sans fcntl (Windows) : verrou limité au processus
+
+
+class DirectoryLock:
+    """Verrou exclusif sur un répertoire, partagé entre threads et processus.
+
+    Le verrou combine un ``threading.RLock`` (threads du processus) et un verrou
+    consultatif ``fcntl.flock`` posé sur le répertoire lui-même (autres
+    processus), ce qui évite de créer un fichier de verrou à côté des journaux.
+    Il s'utilise comme gestionnaire de contexte et peut être ré-acquis par le
+    thread qui le détient.
+
+    Attributes:
+        directory (str): Répertoire verrouillé.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Prépare le verrou (le répertoire est ouvert à la première acquisition).
+
+        Args:
+            directory (str): Répertoire existant à verrouiller.
+        """
+        self.directory = directory
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fd: int = -1
+        self._pid = os.getpid()
+
+    def __enter__(self) -> "DirectoryLock":
+        """Acquiert le verrou, en attendant les autres threads et processus."""
+        self._lock.acquire()
+        try:
+            if self._depth == 0 and fcntl is not None:
+                if self._pid != os.getpid():
+                    # Après un fork, le descripteur hérité partage le verrou du parent
+                    self._fd, self._pid = -1, os.getpid()
+                if self._fd < 0:
+                    self._fd = os.open(self.directory, os.O_RDONLY)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+        except BaseException:
+            self._lock.release()
+            raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Libère le verrou."""
+        self._depth -= 1
+        if self._depth == 0 and self._fd >= 0:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._lock.release()
+
+    def close(self) -> None:
+        """Ferme le descripteur du répertoire."""
+        with self._lock:
+            if self._fd >= 0 and self._pid == os.getpid():
+                os.close(self._fd)
+            self._fd = -1
@@ -0,0 +1,426 @@
+import os
+import re
+import copy
+import json
+import warnings
+import threading
+
+from datetime import datetime, timedelta
+from manager.file_lock import DirectoryLock
+from manager.log_store import IndexedLogStore
+from manager.log_rollups import build_stats, granularity
+from manager.log_archive import BLOCK_RECORDS, CODECS, LogArchive, merge_results, write_archive
+from typing import List, Dict, Any, Optional, Tuple
+
+# Archives des journaux anciens : logs-archive-000001.jsonz, logs-archive-000002.jsonz...
+_ARCHIVE_NAME = re.compile(r"^logs-archive-(\d{6})\.jsonz$")
+# Journaux ajoutés par ce processus en attente d'indexation, au-delà desquels
+# la prochaine lecture relit plutôt logs.json
+MAX_APPENDED = 100000
+
+
+class JsonStore(IndexedLogStore):
+    """Stocke les journaux dans un tableau JSON unique (logs.json).
+
+    C'est le stockage historique de LogManager : chaque écriture relit et réécrit
+    tout le fichier. Il reste le mode par défaut pour la compatibilité avec les
+    fichiers existants.
+
+    Chaque cycle lecture-modification-écriture se fait sous un verrou consultatif
+    exclusif sur le répertoire, partagé par tous les processus, et le fichier
+    est remplacé par renommage atomique : aucun ajout concurrent n'est perdu et
+    un lecteur ne voit jamais un fichier à moitié écrit.
+
+    Les journaux ajoutés par ce processus complètent directement l'index
+    résident : logs.json n'est relu en entier que s'il a été modifié autrement
+    (autre processus, mise à jour, suppression, archivage).
+
+    Le dernier ID attribué est conservé dans ``logs.json.sequence``, mis à jour
+    sous le même verrou : les IDs sont monotones et jamais réutilisés, même
+    après la suppression du journal le plus récent ou ``clear()``.
+
+    Avec ``archive_after``, les journaux plus anciens que cet âge sont déplacés
+    hors de logs.json vers des archives compressées par blocs
+    (``logs-archive-NNNNNN.jsonz``, voir ``LogArchive``) dès qu'ils remplissent un
+    bloc ; ``archive()`` force l'opération. Les archives restent lues par
+    ``query``, ``get`` et ``stats`` sans être chargées dans l'index résident : une
+    lecture sur une période ne décompresse que les blocs concernés. Les journaux
+    archivés ne sont plus modifiables (``update`` et ``delete`` les ignorent).
+
+    Attributes:
+        log_file (str): Chemin complet vers le fichier JSON des journaux.
+        sequence_file (str): Chemin du fichier du dernier ID attribué.
+        archive_after (Optional[timedelta]): Âge à partir duquel un journal est archivé.
+        codec (str): Compression des archives ("zlib" ou "lzma").
+    """
+
+    def __init__(self, log_file: str, archive_after: Optional[timedelta] = None,
+                 codec: str = "zlib", block_records: int = BLOCK_RECORDS) -> None:
+        """Initialise le stockage et crée le fichier s'il n'existe pas.
+
+        Args:
+            log_file (str): Chemin du fichier logs.json.
+            archive_after (Optional[timedelta]): Âge à partir duquel les journaux
+                sont archivés automatiquement (None : jamais).
+            codec (str): Compression des archives ("zlib" ou "lzma").
+            block_records (int): Nombre de journaux par bloc compressé.
+
+        Raises:
+            ValueError: Si la compression est inconnue.
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Compression invalide : {codec}. Doit être l'une de {', '.join(CODECS)}")
+        super().__init__()
+        self.log_file = log_file
+        self.archive_after = archive_after
+        self.codec = codec
+        self.block_records = block_records
+        self.sequence_file = log_file + ".sequence"
+        self._directory = os.path.dirname(os.path.abspath(log_file))
+        self._lock = DirectoryLock(self._directory)
+        self._archives: Dict[str, LogArchive] = {}
+        # Ajouts de ce processus : (signature avant, signature après, journaux écrits)
+        self._appended: List[Tuple[Tuple[int, int, int], Tuple[int, int, int], List[Dict[str, Any]]]] = []
+        self._appended_lock = threading.Lock()
+        self._init_file()
+
+    def _init_file(self) -> None:
+        """Crée le fichier JSON s'il n'existe pas.
+
+        Si le fichier logs.json n'existe pas, crée un fichier vide avec une liste vide.
+        """
+        with self._lock:
+            if not os.path.exists(self.log_file):
+                self._save([])
+
+    def _load(self) -> List[Dict[str, Any]]:
+        """Lit tout le tableau JSON (verrou acquis).
+
+        Un fichier illisible n'est jamais écrasé : il est mis de côté (voir
+        ``_quarantine``) et la lecture repart d'un tableau vide.
+        """
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError:
+                pass
+        self._quarantine()
+        return []
+
+    def _quarantine(self) -> str:
+        """Renomme un logs.json illisible puis recrée un tableau vide (verrou acquis).
+
+        Returns:
+            str: Chemin du fichier mis de côté (``logs.json.corrupt-<horodatage>``).
+        """
+        path = f"{self.log_file}.corrupt-{datetime.now():%Y%m%d-%H%M%S-%f}"
+        os.replace(self.log_file, path)
+        self._save([])
+        warnings.warn(f"{self.log_file} illisible : mis de côté dans {path}", RuntimeWarning)
+        return path
+
+    def _signature(self) -> Tuple[int, int, int]:
+        """Retourne l'inode, la taille et la date de modification de logs.json."""
+        stat = os.stat(self.log_file)
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def _save(self, logs: List[Dict[str, Any]], fsync: bool = False, invalidate: bool = True) -> None:
+        """Réécrit tout le tableau JSON (fichier temporaire puis renommage atomique).
+
+        Sauf avec ``invalidate=False``, l'index sera reconstruit à la prochaine lecture.
+        """
+        tmp_path = self.log_file + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(logs, f, ensure_ascii=False, indent=2)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.log_file)
+        if invalidate:
+            # La taille peut être inchangée : forcer la relecture de l'index
+            self._invalidate()
+
+    def append(self, records: List[Dict[str, Any]], fsync: bool = False) -> None:
+        """Ajoute des journaux en réécrivant le tableau JSON."""
+        with self._lock:
+            self._append(records, fsync)
+
+    def _append(self, records: List[Dict[str, Any]], fsync: bool) -> None:
+        """Implémente ``append`` (verrou acquis)."""
+        # Lire les journaux existants
+        before = self._signature()
+        stored = self._load()
+        # Repartir du dernier ID attribué ; les journaux présents le complètent
+        # pour un stockage créé avant le fichier de séquence
+        sequence = self._read_sequence()
+        last_id = max((int(log["id"]) for log in stored if str(log.get("id", "")).isdigit()), default=0)
+        last_id = max([sequence, last_id] + [archive.last_id for archive in self._current_archives()])
+        for record in records:
+            # Générer un ID si aucun n'est fourni
+            if record.get("id") is None:
+                last_id += 1
+                record["id"] = str(last_id)
+            elif str(record["id"]).isdigit():
+                last_id = max(last_id, int(record["id"]))
+            # Ajouter le nouveau journal
+            stored.append(record)
+        if last_id > sequence:
+            # Réserver les IDs avant d'écrire : un arrêt brutal laisse un trou, jamais un doublon
+            self._write_sequence(last_id)
+        count = len(stored)
+        if self.archive_after is not None:
+            # N'archiver que des blocs complets
+            cutoff = (datetime.now() - self.archive_after).isoformat()
+            stored = self._archive(stored, cutoff, self.block_records)
+        # Sauvegarder dans le fichier
+        archived = len(stored) < count
+        self._save(stored, fsync=fsync, invalidate=archived)
+        if not archived and self._cursor is not None:
+            # Index déjà chargé : lui transmettre les journaux écrits (voir ``_tail``)
+            with self._appended_lock:
+                if sum(len(written) for _, _, written in self._appended) + len(records) <= MAX_APPENDED:
+                    # Copies : l'appelant garde les contextes de ses objets Log
+                    self._appended.append((before, self._signature(), copy.deepcopy(records)))
+                else:
+                    self._appended.clear()
+
+    def _read_sequence(self) -> int:
+        """Lit le dernier ID attribué (verrou acquis, 0 si le fichier est absent ou illisible)."""
+        try:
+            with open(self.sequence_file, "r", encoding="utf-8") as f:
+                return int(f.read())
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _write_sequence(self, last_id: int) -> None:
+        """Enregistre le dernier ID attribué (verrou acquis, remplacement atomique)."""
+        with open(self.sequence_file + ".tmp", "w", encoding="utf-8") as f:
+            f.write(str(last_id))
+        os.replace(self.sequence_file + ".tmp", self.sequence_file)
+
+    def archive(self, max_age: Optional[timedelta] = None, now: Optional[datetime] = None) -> int:
+        """Déplace les journaux anciens de logs.json vers une nouvelle archive.
+
+        Args:
+            max_age (Optional[timedelta]): Âge minimal des journaux à archiver
+                (par défaut ``archive_after``, ou tous les journaux).
+            now (Optional[datetime]): Date de référence (par défaut : maintenant).
+
+        Returns:
+            int: Nombre de journaux archivés.
+        """
+        max_age = max_age if max_age is not None else self.archive_after
+        cutoff = ((now or datetime.now()) - max_age).isoformat() if max_age is not None else None
+        with self._lock:
+            stored = self._load()
+            remaining = self._archive(stored, cutoff, 1)
+            if len(remaining) < len(stored):
+                self._save(remaining)
+            return len(stored) - len(remaining)
+
+    def _archive(self, stored: List[Dict[str, Any]], cutoff: Optional[str],
+                 min_records: int) -> List[Dict[str, Any]]:
+        """Archive les journaux antérieurs à ``cutoff`` (verrou acquis).
+
+        L'archive est écrite avant la réécriture de logs.json par l'appelant : en
+        cas d'interruption, un journal peut être présent dans les deux fichiers
+        (il n'est alors retourné qu'une fois), jamais perdu.
+
+        Args:
+            stored (List[Dict[str, Any]]): Contenu de logs.json.
+            cutoff (Optional[str]): Horodatage ISO limite (None : tous les journaux).
+            min_records (int): Nombre minimal de journaux pour créer une archive.
+
+        Returns:
+            List[Dict[str, Any]]: Journaux à conserver dans logs.json.
+        """
+        cold = [log for log in stored if cutoff is None or (log.get("timestamp") or "") < cutoff]
+        if not cold or len(cold) < min_records:
+            return stored
+        numbers = [int(_ARCHIVE_NAME.match(name).group(1)) for name in self._archive_names()]
+        path = os.path.join(self._directory, f"logs-archive-{max(numbers, default=0) + 1:06d}.jsonz")
+        write_archive(path, cold, codec=self.codec, block_records=self.block_records)
+        if cutoff is None:
+            return []
+        return [log for log in stored if (log.get("timestamp") or "") >= cutoff]
+
+    def _archive_names(self) -> List[str]:
+        """Retourne les noms des fichiers d'archive, du plus ancien au plus récent."""
+        return sorted(name for name in os.listdir(self._directory) if _ARCHIVE_NAME.match(name))
+
+    def _current_archives(self) -> List[LogArchive]:
+        """Ouvre les archives apparues depuis la lecture précédente (index seul).
+
+        Returns:
+            List[LogArchive]: Archives existantes, de la plus ancienne à la plus récente.
+        """
+        archives: Dict[str, LogArchive] = {}
+        for name in self._archive_names():
+            path = os.path.join(self._directory, name)
+            try:
+                archives[path] = self._archives[path] if path in self._archives else LogArchive(path)
+            except FileNotFoundError:
+                continue  # Supprimée entre-temps par clear() dans un autre processus
+        self._archives = archives
+        return list(archives.values())
+
+    def get(self, log_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne un journal de logs.json ou, à défaut, des archives."""
+        record = super().get(log_id)
+        if record is None:
+            for archive in reversed(self._current_archives()):
+                record = archive.get(log_id)
+                if record is not None:
+                    break
+        return record
+
+    def query(self, level: Optional[str] = None, module: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None,
+              before: Optional[Tuple[str, int]] = None,
+              after: Optional[Tuple[str, int]] = None,
+              limit: Optional[int] = None,
+              terms: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Recherche dans logs.json puis dans les archives (voir ``LogStore.query``).
+
+        Les archives sont parcourues dans l'ordre de lecture ; une archive dont
+        tous les journaux se trouvent au-delà d'une page déjà complète n'est pas
+        lue, et seuls les blocs de la période demandée sont décompressés.
+        """
+        results = super().query(level=level, module=module, since=since, until=until,
+                                before=before, after=after, limit=limit, terms=terms)
+        lower = max(since, after[0]) if since and after else (since or (after[0] if after else None))
+        upper = min(until, before[0]) if until and before else (until or (before[0] if before else None))
+        archives = [archive for archive in self._current_archives() if archive.overlaps(lower, upper)]
+        descending = after is None
+        for archive in sorted(archives, key=lambda a: a.last if descending else a.first, reverse=descending):
+            if limit is not None and len(results) >= limit:
+                edge = results[limit - 1].get("timestamp") or ""
+                if (archive.last < edge) if descending else (archive.first > edge):
+                    break
+            found = archive.query(level=level, module=module, since=since, until=until,
+                                  before=before, after=after, limit=limit, terms=terms)
+            results = merge_results(results, found, descending, limit)
+        return results
+
+    def read_after_id(self, last_id: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Lit logs.json puis les archives par ID croissant (voir ``LogStore.read_after_id``).
+
+        Seules les archives contenant un ID supérieur à ``last_id`` sont décompressées.
+        """
+        results = super().read_after_id(last_id, limit)
+        for archive in self._current_archives():
+            if archive.last_id > last_id:
+                results.extend(record for record in archive.records()
+                               if str(record.get("id", "")).isdigit() and int(record["id"]) > last_id)
+        results.sort(key=lambda record: int(record["id"]))
+        return results[:limit]
+
+    def stored_sources(self, node: str, records: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Recherche les journaux d'agent dans logs.json puis dans les archives (voir ``LogStore.stored_sources``).
+
+        Seuls les blocs d'archive de la période couverte par ``records`` sont décompressés.
+        """
+        found = super().stored_sources(node, records)
+        wanted = {str(record.get("source_id")) for record in records} - found.keys()
+        if not wanted:
+            return found
+        timestamps = [record.get("timestamp") or "" for record in records]
+        since, until = min(timestamps), max(timestamps)
+        for archive in self._current_archives():
+            if archive.overlaps(since, until):
+                found.update((str(record.get("source_id")), record["id"]) for record in archive.records(since, until)
+                             if record.get("node") == node and str(record.get("source_id")) in wanted)
+        return found
+
+    def stats(self, bucket_seconds: int, since: Optional[str] = None, until: Optional[str] = None,
+              level: Optional[str] = None, module: Optional[str] = None) -> Dict[str, Any]:
+        """Calcule l'histogramme de logs.json et des archives (voir ``LogStore.stats``)."""
+        with self._index_lock:
+            self._refresh()
+            rows = list(self._index.rollups.rows(granularity(bucket_seconds), since=since, until=until,
+                                                 level=level, module=module))
+        for archive in self._current_archives():
+            rows.extend(archive.rollups.rows(granularity(bucket_seconds), since=since, until=until,
+                                             level=level, module=module))
+        return build_stats(rows, bucket_seconds)
+
+    def update(self, log_id: str, fields: Dict[str, Any]) -> bool:
+        """Met à jour un journal en réécrivant le tableau JSON."""
+        with self._lock:
+            logs = self._load()
+            # Chercher le journal avec l'ID donné
+            for log_data in logs:
+                if log_data["id"] == log_id:
+                    log_data.update(fields)
+                    # Sauvegarder les modifications
+                    self._save(logs)
+                    return True
+            return False
+
+    def delete(self, log_id: str) -> bool:
+        """Supprime un journal en réécrivant le tableau JSON."""
+        with self._lock:
+            logs = self._load()
+            # Filtrer le journal avec l'ID donné
+            initial_length = len(logs)
+            logs = [log for log in logs if log["id"] != log_id]
+            # Si un journal a été supprimé, sauvegarder
+            if len(logs) < initial_length:
+                self._save(logs)
+                return True
+            return False
+
+    def clear(self) -> None:
+        """Remplace le tableau JSON par une liste vide et supprime les archives (la numérotation des IDs continue)."""
+        with self._lock:
+            self._save([])
+            for name in self._archive_names():
+                os.remove(os.path.join(self._directory, name))
+
+    def close(self) -> None:
+        """Libère le verrou."""
+        self._lock.close()
+
+    def _tail(self, cursor: Optional[Tuple[int, int, int]]
+              ) -> Tuple[List[Dict[str, Any]], Tuple[int, int, int], bool]:
+        """Relit logs.json uniquement s'il a changé depuis la dernière lecture.
+
+        Les changements (détectés par inode, taille et date de modification) dus
+        aux seuls ajouts de ce processus depuis la lecture précédente sont
+        retournés sans relire le fichier. Un tableau JSON ne pouvant pas être lu
+        partiellement, tout autre changement entraîne une relecture complète. Un
+        fichier illisible est mis de côté (``_quarantine``).
+
+        Args:
+            cursor (Optional[Tuple[int, int, int]]): Signature du fichier lors de la
+                lecture précédente.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Tuple[int, int, int], bool]: Les journaux
+            lus, la nouvelle signature et True si l'index doit être reconstruit.
+        """
+        with self._appended_lock:
+            appended, self._appended = self._appended, []
+        chained, records = cursor, []
+        for before, after, written in appended:
+            if before == chained:
+                records.extend(written)
+                chained = after
+        if cursor is not None and chained != cursor and chained == self._signature():
+            return records, chained, False
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            # Signature et contenu du même fichier, même s'il est remplacé entre-temps
+            stat = os.fstat(f.fileno())
+            signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            if signature == cursor:
+                return [], signature, False
+            try:
+                return json.load(f), signature, True
+            except json.JSONDecodeError:
+                pass
+        # Les écritures étant atomiques, le fichier a été altéré hors de LogManager :
+        # le relire sous verrou, ce qui le met de côté s'il est toujours illisible
+        with self._lock:
+            logs = self._load()
+            stat = os.stat(self.log_file)
+        return logs, (stat.st_ino, stat.st_size, stat.st_mtime_ns), True
@@ -0,0 +1,262 @@
+import os
+import json
+import lzma
+import zlib
+import heapq
+import bisect
+import struct
+
+from manager.log_index import LogIndex, record_position
+from manager.log_rollups import MINUTE, Rollups
+from typing import Callable, Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+# Fin de fichier : position de l'index des blocs et signature du format
+_TRAILER = struct.Struct(">Q8s")
+_MAGIC = b"LBARCH01"
+
+# Algorithmes de compression disponibles : (compression, décompression)
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+# Nombre de journaux par bloc compressé
+BLOCK_RECORDS = 1000
+
+# Entrée de l'index : (premier horodatage, dernier horodatage, position, taille, nombre de journaux)
+BlockEntry = Tuple[str, str, int, int, int]
+
+
+def write_archive(path: str, records: Iterable[Dict[str, Any]], codec: str = "zlib",
+                  block_records: int = BLOCK_RECORDS) -> "LogArchive":
+    """Écrit des journaux dans un fichier d'archive compressé par blocs.
+
+    Les journaux sont triés par (horodatage, ID) puis découpés en blocs de
+    ``block_records`` lignes JSON compactes, compressés séparément. Un index des
+    blocs (horodatages extrêmes et position de chaque bloc), le plus grand ID et
+    les compteurs par minute sont écrits en fin de fichier. Le fichier est écrit
+    sous un nom temporaire, synchronisé sur disque puis renommé.
+
+    Args:
+        path (str): Chemin du fichier d'archive.
+        records (Iterable[Dict[str, Any]]): Journaux sérialisés à archiver.
+        codec (str): Algorithme de compression ("zlib" ou "lzma").
+        block_records (int): Nombre de journaux par bloc.
+
+    Returns:
+        LogArchive: L'archive écrite.
+
+    Raises:
+        ValueError: Si l'algorithme de compression est inconnu.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Compression invalide : {codec}. Doit être l'une de {', '.join(CODECS)}")
+    compress = CODECS[codec][0]
+    records = sorted(records, key=record_position)
+    rollups = Rollups()
+    blocks: List[BlockEntry] = []
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        for start in range(0, len(records), block_records):
+            block = records[start:start + block_records]
+            lines = "\n".join(json.dumps(record, ensure_ascii=False) for record in block)
+            payload = compress(lines.encode("utf-8"))
+            blocks.append((block[0].get("timestamp") or "", block[-1].get("timestamp") or "",
+                           f.tell(), len(payload), len(block)))
+            f.write(payload)
+            for record in block:
+                rollups.add(record)
+        index = {
+            "codec": codec,
+            "blocks": blocks,
+            "last_id": max((int(record["id"]) for record in records
+                            if str(record.get("id", "")).isdigit()), default=0),
+            "rollups": list(rollups.rows(MINUTE)),
+        }
+        offset = f.tell()
+        f.write(json.dumps(index, ensure_ascii=False).encode("utf-8"))
+        f.write(_TRAILER.pack(offset, _MAGIC))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return LogArchive(path)
+
+
+def merge_results(results: List[Dict[str, Any]], others: List[Dict[str, Any]],
+                  descending: bool, limit: Optional[int]) -> List[Dict[str, Any]]:
+    """Fusionne deux listes de journaux triées dans le même ordre.
+
+    Un journal présent dans les deux listes (pendant un archivage concurrent)
+    n'est conservé qu'une fois.
+
+    Args:
+        results (List[Dict[str, Any]]): Première liste triée.
+        others (List[Dict[str, Any]]): Seconde liste triée.
+        descending (bool): True si les listes vont du plus récent au plus ancien.
+        limit (Optional[int]): Nombre maximal de journaux (None : tous).
+
+    Returns:
+        List[Dict[str, Any]]: Liste fusionnée, dans le même ordre.
+    """
+    merged: List[Dict[str, Any]] = []
+    previous = None
+    for record in heapq.merge(results, others, key=record_position, reverse=descending):
+        identity = (record_position(record), record.get("id"))
+        if identity == previous:
+            continue
+        previous = identity
+        merged.append(record)
+        if limit is not None and len(merged) >= limit:
+            break
+    return merged
+
+
+class LogArchive:
+    """Archive de journaux en lecture seule, compressée par blocs.
+
+    L'index des blocs est lu à l'ouverture ; une lecture sur une période ne
+    décompresse que les blocs dont l'intervalle d'horodatages la recoupe, et une
+    recherche paginée s'arrête au premier bloc qui complète la page.
+
+    Attributes:
+        path (str): Chemin du fichier d'archive.
+        codec (str): Algorithme de compression des blocs.
+        blocks (List[BlockEntry]): Index des blocs, dans l'ordre chronologique.
+        last_id (int): Plus grand ID numérique archivé.
+        rollups (Rollups): Compteurs par minute et par heure des journaux archivés.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Ouvre une archive et lit son index.
+
+        Args:
+            path (str): Chemin du fichier d'archive.
+
+        Raises:
+            ValueError: Si le fichier n'est pas une archive de journaux valide.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            end = f.seek(0, os.SEEK_END) - _TRAILER.size
+            if end < 0:
+                raise ValueError(f"Archive de journaux invalide : {path}")
+            f.seek(end)
+            offset, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+            if magic != _MAGIC or offset > end:
+                raise ValueError(f"Archive de journaux invalide : {path}")
+            f.seek(offset)
+            index = json.loads(f.read(end - offset).decode("utf-8"))
+        self.codec = index["codec"]
+        self._decompress = CODECS[self.codec][1]
+        self.blocks = [tuple(entry) for entry in index["blocks"]]
+        self._firsts = [entry[0] for entry in self.blocks]
+        self._lasts = [entry[1] for entry in self.blocks]
+        self.last_id = index["last_id"]
+        self.rollups = Rollups()
+        for key, level, module, count in index["rollups"]:
+            self.rollups.add({"timestamp": key, "level": level, "module": module}, count)
+
+    def __len__(self) -> int:
+        """Nombre de journaux archivés."""
+        return sum(entry[4] for entry in self.blocks)
+
+    @property
+    def first(self) -> str:
+        """Horodatage du plus ancien journal archivé."""
+        return self._firsts[0] if self.blocks else ""
+
+    @property
+    def last(self) -> str:
+        """Horodatage du plus récent journal archivé."""
+        return self._lasts[-1] if self.blocks else ""
+
+    def overlaps(self, since: Optional[str], until: Optional[str]) -> bool:
+        """Indique si l'archive contient des journaux dans [since, until]."""
+        return bool(self.blocks) and (not since or self.last >= since) and (not until or self.first <= until)
+
+    def read_block(self, number: int) -> List[Dict[str, Any]]:
+        """Décompresse un bloc.
+
+        Args:
+            number (int): Position du bloc dans l'index.
+
+        Returns:
+            List[Dict[str, Any]]: Journaux du bloc, dans l'ordre chronologique.
+        """
+        _, _, offset, length, _ = self.blocks[number]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            payload = f.read(length)
+        return [json.loads(line) for line in self._decompress(payload).decode("utf-8").split("\n")]
+
+    def block_range(self, since: Optional[str] = None, until: Optional[str] = None) -> range:
+        """Retourne les positions des blocs qui recoupent [since, until].
+
+        Args:
+            since (Optional[str]): Horodatage ISO minimal.
+            until (Optional[str]): Horodatage ISO maximal.
+
+        Returns:
+            range: Positions des blocs, dans l'ordre chronologique.
+        """
+        low = bisect.bisect_left(self._lasts, since) if since else 0
+        high = bisect.bisect_right(self._firsts, until) if until else len(self.blocks)
+        return range(low, max(low, high))
+
+    def records(self, since: Optional[str] = None, until: Optional[str] = None
+                ) -> Iterator[Dict[str, Any]]:
+        """Parcourt les journaux archivés d'une période, du plus ancien au plus récent.
+
+        Args:
+            since (Optional[str]): Horodatage ISO minimal (inclus).
+            until (Optional[str]): Horodatage ISO maximal (inclus).
+
+        Yields:
+            Dict[str, Any]: Journaux sérialisés.
+        """
+        for number in self.block_range(since, until):
+            for record in self.read_block(number):
+                timestamp = record.get("timestamp") or ""
+                if (not since or timestamp >= since) and (not until or timestamp <= until):
+                    yield record
+
+    def get(self, log_id: str) -> Optional[Dict[str, Any]]:
+        """Recherche un journal archivé par son ID (décompresse les blocs un à un).
+
+        Args:
+            log_id (str): ID du journal recherché.
+
+        Returns:
+            Optional[Dict[str, Any]]: Le journal, ou None s'il n'est pas archivé.
+        """
+        for number in range(len(self.blocks)):
+            for record in self.read_block(number):
+                if record.get("id") == log_id:
+                    return record
+        return None
+
+    def query(self, level: Optional[str] = None, module: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None,
+              before: Optional[Tuple[str, int]] = None,
+              after: Optional[Tuple[str, int]] = None,
+              limit: Optional[int] = None,
+              terms: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Recherche des journaux archivés (voir ``LogStore.query``).
+
+        Seuls les blocs qui recoupent la période demandée (bornes et curseur
+        compris) sont décompressés, dans l'ordre de lecture ; le parcours s'arrête
+        dès que ``limit`` journaux ont été trouvés.
+        """
+        lower = max(since, after[0]) if since and after else (since or (after[0] if after else None))
+        upper = min(until, before[0]) if until and before else (until or (before[0] if before else None))
+        blocks = self.block_range(lower, upper)
+        results: List[Dict[str, Any]] = []
+        for number in (blocks if after else reversed(blocks)):
+            index = LogIndex()
+            index.add_many(self.read_block(number))
+            for record in index.query(level=level, module=module, since=since, until=until,
+                                      before=before, after=after, terms=terms):
+                results.append(record)
+                if limit is not None and len(results) >= limit:
+                    return results
+        return results
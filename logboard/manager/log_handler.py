@@ -0,0 +1,197 @@
+import json
+import queue
+import logging
+import logging.handlers
+
+from datetime import datetime
+from model.log import Log
+from typing import Any, Dict, List
+
+# Attributs présents sur tout LogRecord : les autres proviennent de ``extra=``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))) | {"message", "asctime"}
+# Attente maximale d'une place dans la file pleine à la fermeture du handler (secondes)
+CLOSE_TIMEOUT = 5.0
+
+
+def json_safe(value: Any) -> Any:
+    """Retourne ``value`` si elle est sérialisable en JSON, sinon une version qui l'est.
+
+    Les objets non sérialisables sont remplacés par leur ``repr`` (dans une liste
+    ou un dictionnaire, seuls ceux-là) ; une valeur impossible à parcourir (clés
+    non textuelles, références circulaires) devient entièrement son ``repr``.
+    """
+    try:
+        json.dumps(value)
+        return value
+    except (TypeError, ValueError):
+        pass
+    try:
+        return json.loads(json.dumps(value, default=repr))
+    except (TypeError, ValueError):
+        return repr(value)
+
+
+def record_to_log(record: logging.LogRecord) -> Log:
+    """Convertit un ``LogRecord`` du module logging en journal logboard.
+
+    Le niveau est ramené au niveau logboard immédiatement inférieur ou égal
+    (un niveau personnalisé entre INFO et WARNING devient INFO), le nom du logger
+    sert de module et le contexte reçoit l'emplacement de l'appel, les champs
+    passés par ``extra=`` (rendus sérialisables en JSON, voir ``json_safe``) et,
+    le cas échéant, la trace de l'exception.
+
+    Args:
+        record (logging.LogRecord): Enregistrement émis par un logger.
+
+    Returns:
+        Log: Journal correspondant.
+    """
+    if record.levelno >= logging.CRITICAL:
+        level = "CRITICAL"
+    elif record.levelno >= logging.ERROR:
+        level = "ERROR"
+    elif record.levelno >= logging.WARNING:
+        level = "WARNING"
+    elif record.levelno >= logging.INFO:
+        level = "INFO"
+    else:
+        level = "DEBUG"
+    context: Dict[str, Any] = {"file": record.filename, "function": record.funcName, "line": record.lineno}
+    for key, value in vars(record).items():
+        if key not in _RECORD_ATTRIBUTES:
+            context[key] = json_safe(value)
+    if record.exc_info:
+        context["exception"] = logging.Formatter().formatException(record.exc_info)
+    message = record.message if hasattr(record, "message") else record.getMessage()
+    return Log(level=level, message=message, module=record.name, context=context,
+               timestamp=datetime.fromtimestamp(record.created))
+
+
+class _LogManagerSink(logging.Handler):
+    """Destination du ``QueueListener`` : écrit les enregistrements par lots.
+
+    Les journaux s'accumulent tant que la file contient d'autres enregistrements ;
+    le lot est écrit dès qu'elle est vide ou qu'il atteint ``batch_size``.
+    """
+
+    def __init__(self, log_manager: Any, source: "queue.Queue", batch_size: int) -> None:
+        """Initialise la destination.
+
+        Args:
+            log_manager (LogManager): Gestionnaire qui reçoit les journaux.
+            source (queue.Queue): File lue par le ``QueueListener``.
+            batch_size (int): Taille maximale d'un lot.
+        """
+        super().__init__()
+        self.log_manager = log_manager
+        self.source = source
+        self.batch_size = batch_size
+        self._pending: List[Log] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Ajoute l'enregistrement au lot en cours et l'écrit si la file est vide."""
+        try:
+            self._pending.append(record_to_log(record))
+        except Exception:
+            self.handleError(record)
+        if len(self._pending) >= self.batch_size or self.source.empty():
+            self.flush()
+
+    def flush(self) -> None:
+        """Écrit le lot en cours."""
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            self.log_manager.create_logs(batch)
+        except Exception:
+            # Même traitement qu'un handler logging en échec : message sur stderr
+            self.handleError(logging.makeLogRecord({"msg": f"{len(batch)} journaux non écrits"}))
+
+
+class _Listener(logging.handlers.QueueListener):
+    """``QueueListener`` dont l'arrêt attend une place dans la file bornée."""
+
+    def enqueue_sentinel(self) -> None:
+        """Dépose la sentinelle d'arrêt, en attendant au plus ``CLOSE_TIMEOUT`` secondes.
+
+        Raises:
+            queue.Full: Si la file est restée pleine (écriture bloquée).
+        """
+        self.queue.put(self._sentinel, timeout=CLOSE_TIMEOUT)
+
+
+class LogboardHandler(logging.handlers.QueueHandler):
+    """Handler ``logging`` non bloquant qui alimente un ``LogManager``.
+
+    Un appel de journalisation se contente de figer le message puis de déposer
+    l'enregistrement dans une file bornée (quelques microsecondes) ; un
+    ``QueueListener`` le convertit ensuite en ``Log`` (voir ``record_to_log``) et
+    l'écrit par lots depuis son propre thread. Si la file est pleine,
+    l'enregistrement est abandonné et compté dans ``dropped`` plutôt que de
+    bloquer l'appelant.
+
+    Exemple :
+
+        handler = LogboardHandler(LogManager(directory="./logs"))
+        logging.getLogger().addHandler(handler)
+
+    ``logging.shutdown()`` (appelée à la sortie du programme) vide la file avant
+    de fermer le handler.
+
+    Attributes:
+        log_manager (LogManager): Gestionnaire qui reçoit les journaux.
+        dropped (int): Nombre d'enregistrements abandonnés faute de place.
+    """
+
+    def __init__(self, log_manager: Any, level: int = logging.NOTSET,
+                 max_queue: int = 100000, batch_size: int = 1000) -> None:
+        """Initialise le handler et démarre le thread d'écriture.
+
+        Args:
+            log_manager (LogManager): Gestionnaire qui reçoit les journaux.
+            level (int): Niveau minimal des enregistrements traités.
+            max_queue (int): Nombre maximal d'enregistrements en attente.
+            batch_size (int): Taille maximale d'un lot écrit.
+        """
+        super().__init__(queue.Queue(maxsize=max_queue))
+        self.setLevel(level)
+        self.log_manager = log_manager
+        self.dropped = 0
+        self._sink = _LogManagerSink(log_manager, self.queue, batch_size)
+        self._listener = _Listener(self.queue, self._sink)
+        self._listener.start()
+        self._running = True
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Fige le message (les arguments peuvent changer ensuite) sans autre mise en forme."""
+        record.message = record.getMessage()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Dépose l'enregistrement sans attendre ; l'abandonne si la file est pleine."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """Attend que les enregistrements déjà déposés soient écrits."""
+        if self._running:
+            self.queue.join()
+
+    def close(self) -> None:
+        """Écrit les enregistrements restants puis arrête le thread d'écriture.
+
+        Si l'écriture reste bloquée plus de ``CLOSE_TIMEOUT`` secondes avec une
+        file pleine, les enregistrements en attente sont comptés dans ``dropped``.
+        """
+        if self._running:
+            self._running = False
+            try:
+                self._listener.stop()
+            except queue.Full:
+                self.dropped += self.queue.qsize()
+            else:
+                self._sink.flush()
+        super().close()
@@ -0,0 +1,445 @@
+import re
+import base64
+import bisect
+import unicodedata
+
+from datetime import datetime
+from manager.log_rollups import Rollups
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Set, Tuple
+
+# Clé de tri d'un journal : (horodatage ISO, ID numérique, numéro d'insertion)
+SortKey = Tuple[str, int, int]
+
+_INF = float("inf")
+
+# Préfixe du terme de la machine d'origine d'un journal d'agent : le caractère
+# nul le distingue du terme ``node=...`` d'une clé de contexte "node"
+NODE_TERM = "\x00node="
+
+_WORD = re.compile(r"\w+")
+
+
+def _fold(text: str) -> str:
+    """Met un texte en minuscules et retire les accents ("Réussie" -> "reussie")."""
+    text = text.lower()
+    if text.isascii():
+        return text
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def tokenize(text: Any) -> List[str]:
+    """Découpe un texte en mots normalisés pour la recherche plein texte.
+
+    Args:
+        text (Any): Texte à découper (converti en chaîne).
+
+    Returns:
+        List[str]: Mots en minuscules et sans accents.
+    """
+    return _WORD.findall(_fold(str(text)))
+
+
+def _context_value(value: Any) -> str:
+    """Représente une valeur de contexte comme dans le JSON ("true", "null", "42")."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    return _fold(str(value))
+
+
+def _flatten_context(context: Any, prefix: str = "") -> Iterator[Tuple[str, Any]]:
+    """Aplatit un contexte imbriqué en paires (clé pointée, valeur)."""
+    if isinstance(context, dict):
+        for key, value in context.items():
+            yield from _flatten_context(value, f"{prefix}{_fold(str(key))}.")
+    elif isinstance(context, (list, tuple)):
+        for value in context:
+            yield from _flatten_context(value, prefix)
+    elif prefix:
+        yield prefix[:-1], context
+
+
+def log_terms(record: Dict[str, Any]) -> Set[str]:
+    """Calcule les termes de recherche d'un journal sérialisé.
+
+    Les termes sont les mots du message, les paires ``clé=valeur`` du contexte
+    aplati (clés imbriquées jointes par un point, ex. ``request.method=get``)
+    ainsi que les mots des valeurs textuelles et numériques du contexte. Un
+    journal reçu d'un agent a aussi le terme réservé ``node_term(machine)``, que
+    ni le message ni le contexte ne peuvent produire.
+
+    Args:
+        record (Dict[str, Any]): Journal au format de ``Log.to_dict()``.
+
+    Returns:
+        Set[str]: Termes indexés.
+    """
+    terms = set(tokenize(record.get("message") or ""))
+    for key, raw in _flatten_context(record.get("context") or {}):
+        value = _context_value(raw)
+        if not key.startswith(NODE_TERM[0]):
+            terms.add(f"{key}={value}")
+        if raw is not None and not isinstance(raw, bool):
+            terms.update(_WORD.findall(value))
+    if record.get("node"):
+        terms.add(node_term(record["node"]))
+    return terms
+
+
+def node_term(node: str) -> str:
+    """Retourne le terme réservé des journaux reçus de la machine ``node``.
+
+    Args:
+        node (str): Machine d'origine.
+
+    Returns:
+        str: Terme à passer dans la recherche (voir ``LogManager.query_records``).
+    """
+    return NODE_TERM + _context_value(node)
+
+
+def parse_search(query: Optional[str]) -> Optional[List[str]]:
+    """Convertit une recherche utilisateur en termes à trouver tous.
+
+    Chaque mot doit apparaître dans le message ou les valeurs du contexte ; un
+    élément ``clé=valeur`` doit correspondre exactement à une valeur du contexte.
+
+    Args:
+        query (Optional[str]): Recherche (ex. "timeout user_id=user123").
+
+    Returns:
+        Optional[List[str]]: Termes normalisés, ou None si la recherche est vide.
+    """
+    terms: List[str] = []
+    for part in (query or "").split():
+        if "=" in part:
+            key, value = part.split("=", 1)
+            terms.append(f"{_fold(key)}={_context_value(value)}")
+        else:
+            terms.extend(tokenize(part))
+    return list(dict.fromkeys(terms)) or None
+
+
+def normalize_timestamp(value: Any) -> str:
+    """Normalise une borne temporelle au format ISO 8601 des journaux.
+
+    Args:
+        value (Any): ``datetime`` ou chaîne ISO 8601 (ex. "2025-07-10" ou
+            "2025-07-10T08:00:00").
+
+    Returns:
+        str: Horodatage au format de ``datetime.isoformat()``.
+
+    Raises:
+        ValueError: Si la chaîne n'est pas un horodatage ISO 8601 valide.
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return datetime.fromisoformat(str(value)).isoformat()
+
+
+def record_position(record: Dict[str, Any]) -> Tuple[str, int]:
+    """Retourne la position d'un journal dans l'ordre de tri (horodatage, ID).
+
+    Args:
+        record (Dict[str, Any]): Journal sérialisé.
+
+    Returns:
+        Tuple[str, int]: Horodatage ISO et ID numérique (0 si l'ID n'est pas numérique).
+    """
+    log_id = str(record.get("id") or "")
+    return record.get("timestamp") or "", int(log_id) if log_id.isdigit() else 0
+
+
+def encode_cursor(record: Dict[str, Any]) -> str:
+    """Construit un curseur de pagination opaque désignant un journal.
+
+    Args:
+        record (Dict[str, Any]): Journal sérialisé.
+
+    Returns:
+        str: Curseur utilisable dans une URL.
+    """
+    raw = "%s|%d" % record_position(record)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Décode un curseur produit par ``encode_cursor``.
+
+    Args:
+        cursor (str): Curseur de pagination.
+
+    Returns:
+        Tuple[str, int]: Horodatage et ID numérique du journal désigné.
+
+    Raises:
+        ValueError: Si le curseur est invalide.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, log_id = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").rsplit("|", 1)
+        return timestamp, int(log_id)
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Curseur de pagination invalide : {cursor}") from e
+
+
+class LogIndex:
+    """Index résident des journaux, maintenu de façon incrémentale.
+
+    L'index conserve chaque journal sérialisé une seule fois et l'ordonne par
+    horodatage. Des listes de clés triées (« posting lists ») par niveau et par
+    module permettent de parcourir un sous-ensemble du plus récent au plus ancien
+    sans examiner les autres journaux : le coût d'une lecture filtrée est
+    proportionnel au nombre de journaux retournés, pas à la taille du stockage.
+
+    Un index inversé associe de même à chaque terme de recherche (voir
+    ``log_terms``) la liste triée des journaux qui le contiennent : une recherche
+    parcourt la liste la plus courte et vérifie les autres termes par recherche
+    dichotomique, sans jamais examiner les journaux qui ne correspondent pas.
+
+    Des compteurs par minute et par heure (``rollups``) sont tenus à jour au fil
+    des ajouts et retraits pour servir les statistiques sans parcourir les journaux.
+
+    Les IDs numériques sont aussi conservés triés (lecture dans l'ordre des
+    écritures, voir ``after_id``), et les journaux reçus d'un agent sont
+    retrouvés par leur couple (machine, ID d'origine).
+
+    Les horodatages ISO 8601 sont comparés comme des chaînes, ce qui évite de les
+    convertir en ``datetime`` à l'indexation.
+    """
+
+    def __init__(self) -> None:
+        """Initialise un index vide."""
+        self.clear()
+
+    def clear(self) -> None:
+        """Vide l'index."""
+        self._seq = 0
+        self._entries: Dict[SortKey, Dict[str, Any]] = {}
+        self._ids: Dict[str, SortKey] = {}
+        self._numeric_ids: List[int] = []
+        self._sources: Dict[Tuple[str, str], str] = {}
+        self._order: List[SortKey] = []
+        self._by_level: Dict[str, List[SortKey]] = {}
+        self._by_module: Dict[str, List[SortKey]] = {}
+        self._by_term: Dict[str, List[SortKey]] = {}
+        self.rollups = Rollups()
+
+    def __len__(self) -> int:
+        """Nombre de journaux indexés."""
+        return len(self._entries)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Indexe un journal sérialisé.
+
+        Args:
+            record (Dict[str, Any]): Journal au format de ``Log.to_dict()``.
+        """
+        self._seq += 1
+        log_id = str(record.get("id") or "")
+        key = (record.get("timestamp") or "", int(log_id) if log_id.isdigit() else 0, self._seq)
+        self._entries[key] = record
+        self._ids[log_id] = key
+        if log_id.isdigit():
+            self._insert(self._numeric_ids, int(log_id))
+        if record.get("node") is not None:
+            self._sources[(record["node"], str(record.get("source_id")))] = log_id
+        self._insert(self._order, key)
+        self._insert(self._by_level.setdefault(record.get("level", "INFO"), []), key)
+        self._insert(self._by_module.setdefault(record.get("module", "unknown"), []), key)
+        for term in log_terms(record):
+            self._insert(self._by_term.setdefault(term, []), key)
+        self.rollups.add(record)
+
+    def add_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Indexe plusieurs journaux.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Journaux sérialisés.
+        """
+        for record in records:
+            self.add(record)
+
+    def get(self, log_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne un journal indexé à partir de son ID.
+
+        Args:
+            log_id (str): ID du journal recherché.
+
+        Returns:
+            Optional[Dict[str, Any]]: Le journal sérialisé, ou None s'il est inconnu.
+        """
+        key = self._ids.get(str(log_id))
+        return self._entries.get(key) if key is not None else None
+
+    def update(self, log_id: str, fields: Dict[str, Any]) -> bool:
+        """Remplace des champs d'un journal indexé.
+
+        Le journal est retiré puis réindexé, ses termes de recherche pouvant changer.
+
+        Args:
+            log_id (str): ID du journal à modifier.
+            fields (Dict[str, Any]): Champs à remplacer.
+
+        Returns:
+            bool: True si le journal était indexé.
+        """
+        record = self.get(log_id)
+        if record is None:
+            return False
+        self.remove(log_id)
+        record.update(fields)
+        self.add(record)
+        return True
+
+    def remove(self, log_id: str) -> Optional[Dict[str, Any]]:
+        """Retire un journal de l'index.
+
+        Args:
+            log_id (str): ID du journal à retirer.
+
+        Returns:
+            Optional[Dict[str, Any]]: Le journal retiré, ou None s'il était inconnu.
+        """
+        key = self._ids.pop(str(log_id), None)
+        if key is None:
+            return None
+        record = self._entries.pop(key)
+        if key[1]:
+            self._discard(self._numeric_ids, key[1])
+        if record.get("node") is not None:
+            self._sources.pop((record["node"], str(record.get("source_id"))), None)
+        self._discard(self._order, key)
+        self._discard(self._by_level.get(record.get("level", "INFO"), []), key)
+        self._discard(self._by_module.get(record.get("module", "unknown"), []), key)
+        for term in log_terms(record):
+            postings = self._by_term.get(term)
+            if postings is not None:
+                self._discard(postings, key)
+                if not postings:
+                    del self._by_term[term]
+        self.rollups.remove(record)
+        return record
+
+    def after_id(self, last_id: int) -> Iterator[Dict[str, Any]]:
+        """Parcourt les journaux d'ID numérique supérieur à ``last_id``, par ID croissant.
+
+        Args:
+            last_id (int): Dernier ID déjà lu (0 : depuis le début).
+
+        Yields:
+            Dict[str, Any]: Journaux sérialisés.
+        """
+        start = bisect.bisect_right(self._numeric_ids, last_id)
+        for log_id in self._numeric_ids[start:]:
+            yield self._entries[self._ids[str(log_id)]]
+
+    def has_source(self, node: str, source_id: str) -> bool:
+        """Indique si le journal ``source_id`` de la machine ``node`` est indexé.
+
+        Args:
+            node (str): Machine d'origine.
+            source_id (str): ID du journal sur sa machine d'origine.
+
+        Returns:
+            bool: True si le journal a déjà été reçu.
+        """
+        return (node, str(source_id)) in self._sources
+
+    def source_log_id(self, node: str, source_id: str) -> Optional[str]:
+        """Retourne l'ID du journal ``source_id`` reçu de la machine ``node``.
+
+        Args:
+            node (str): Machine d'origine.
+            source_id (str): ID du journal sur sa machine d'origine.
+
+        Returns:
+            Optional[str]: ID du journal enregistré, None s'il n'a pas été reçu.
+        """
+        return self._sources.get((node, str(source_id)))
+
+    @staticmethod
+    def _insert(postings: List[SortKey], key: SortKey) -> None:
+        """Insère une clé dans une liste triée (ajout direct dans le cas courant)."""
+        if not postings or postings[-1] <= key:
+            postings.append(key)
+        else:
+            bisect.insort(postings, key)
+
+    @staticmethod
+    def _discard(postings: List[SortKey], key: SortKey) -> None:
+        """Retire une clé d'une liste triée (recherche dichotomique)."""
+        position = bisect.bisect_left(postings, key)
+        if position < len(postings) and postings[position] == key:
+            del postings[position]
+
+    @staticmethod
+    def _contains(postings: List[SortKey], key: SortKey) -> bool:
+        """Indique si une liste triée contient une clé (recherche dichotomique)."""
+        position = bisect.bisect_left(postings, key)
+        return position < len(postings) and postings[position] == key
+
+    def query(self, level: Optional[str] = None, module: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None,
+              before: Optional[Tuple[str, int]] = None,
+              after: Optional[Tuple[str, int]] = None,
+              terms: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Parcourt les journaux du plus récent au plus ancien.
+
+        La liste de clés la plus courte parmi les filtres demandés est parcourue,
+        les autres filtres étant vérifiés sur chaque journal rencontré. Les bornes
+        temporelles et les curseurs sont résolus par recherche dichotomique.
+
+        Args:
+            level (Optional[str]): Niveau à conserver (ex. "ERROR").
+            module (Optional[str]): Module à conserver.
+            since (Optional[str]): Horodatage ISO minimal (inclus).
+            until (Optional[str]): Horodatage ISO maximal (inclus).
+            before (Optional[Tuple[str, int]]): Position décodée d'un curseur ; seuls
+                les journaux plus anciens sont retournés.
+            after (Optional[Tuple[str, int]]): Position décodée d'un curseur ; seuls
+                les journaux plus récents sont retournés, cette fois du plus ancien
+                au plus récent pour permettre de suivre les nouveaux journaux.
+            terms (Optional[List[str]]): Termes de recherche (voir ``parse_search``)
+                que chaque journal doit tous contenir.
+
+        Yields:
+            Dict[str, Any]: Journaux sérialisés correspondant aux filtres.
+        """
+        postings = self._order
+        if level:
+            level = level.upper()
+            postings = self._by_level.get(level, [])
+        if module:
+            module_postings = self._by_module.get(module, [])
+            if len(module_postings) < len(postings):
+                postings = module_postings
+        term_postings: List[List[SortKey]] = []
+        if terms:
+            term_postings = sorted((self._by_term.get(term, []) for term in terms), key=len)
+            if len(term_postings[0]) < len(postings):
+                postings = term_postings.pop(0)
+
+        low, high = 0, len(postings)
+        if since:
+            low = max(low, bisect.bisect_left(postings, (since,)))
+        if until:
+            high = min(high, bisect.bisect_right(postings, (until, _INF)))
+        if before:
+            high = min(high, bisect.bisect_left(postings, before))
+        if after:
+            low = max(low, bisect.bisect_right(postings, (after[0], after[1], _INF)))
+        positions = range(low, high) if after else range(high - 1, low - 1, -1)
+
+        for position in positions:
+            key = postings[position]
+            record = self._entries[key]
+            if level and record.get("level") != level:
+                continue
+            if module and record.get("module") != module:
+                continue
+            if term_postings and not all(self._contains(other, key) for other in term_postings):
+                continue
+            yield record
@@ -1,102 +1,462 @@
 import os
 import json
+import atexit
+import threading
 
 from pathlib import Path
+from collections import Counter
 from model.log import Log
-from typing import List, Optional, Dict, Any
+from manager.log_store import LogStore
+from manager.json_store import JsonStore
+from manager.sqlite_store import SqliteStore
+from manager.segment_store import SegmentStore
+from manager.log_writer import BufferedLogWriter
+from manager.log_rollups import parse_bucket
+from manager.log_index import encode_cursor, decode_cursor, node_term, normalize_timestamp, parse_search
+from typing import Iterator, List, Optional, Dict, Any, Tuple, Union
 
 BASE_DIR = Path(__file__).resolve().parent
 
+STORAGE_MODES = ("json", "segments", "sqlite")
+
 class LogManager:
     """Gère les journaux dans un fichier JSON.
 
     Cette classe permet de sauvegarder, lire, modifier et supprimer des journaux
     dans un fichier JSON. Le répertoire du fichier peut être spécifié à l'initialisation.
 
+    Le stockage est délégué à un moteur (``LogStore``) ; trois moteurs sont fournis :
+        - ``"json"`` : un tableau JSON unique dans logs.json (mode historique).
+        - ``"segments"`` : des segments JSONL en ajout seul dans ``<directory>/segments``,
+          où créer un journal revient à ajouter une ligne. Les segments sont
+          partitionnés par jour ; pour une autre granularité ou une rétention,
+          passer une instance de ``SegmentStore``.
+        - ``"sqlite"`` : une base SQLite en mode WAL (``<directory>/logs.db``) avec
+          des index, adaptée aux écritures concurrentes de plusieurs processus.
+    Un moteur personnalisé peut aussi être passé directement sous forme d'instance.
+
+    Avec ``buffered=True``, ``create_log`` se contente de déposer le journal dans
+    une file en mémoire : un thread d'arrière-plan l'écrit ensuite par lots
+    (voir ``BufferedLogWriter``). Les journaux déposés ne sont visibles en lecture
+    qu'après leur écriture ; ``flush()`` permet de l'attendre.
+
+    Les stockages fichiers servent les lectures par un index résident (``LogIndex``)
+    chargé une seule fois puis complété à chaque lecture par les seuls journaux
+    ajoutés depuis, y compris par d'autres processus partageant le répertoire.
+
     Attributes:
         log_file (str): Chemin complet vers le fichier JSON des journaux.
+        storage (str): Mode de stockage utilisé ("json", "segments", "sqlite" ou
+            le nom de la classe d'un moteur personnalisé).
+        ingested (Counter): Nombre de journaux écrits par ce processus, par
+            couple (niveau, module).
     """
 
-    def __init__(self, directory: str = BASE_DIR) -> None:
+    def __init__(self, directory: str = BASE_DIR, storage: Union[str, LogStore] = "json",
+                 buffered: bool = False, **writer_options: Any) -> None:
         """Initialise le gestionnaire de journaux.
 
+        Avec un autre moteur que ``"json"``, un logs.json existant est migré une
+        seule fois vers ce moteur puis renommé en ``logs.json.migrated``.
+
         Args:
             directory (str): Répertoire où sauvegarder le fichier logs.json.
                            Par défaut, utilise le répertoire courant.
+            storage (Union[str, LogStore]): Mode de stockage ("json" par défaut,
+                "segments", "sqlite") ou instance d'un moteur ``LogStore``.
+            buffered (bool): Active l'écriture différée par lots en arrière-plan.
+            **writer_options: Options de ``BufferedLogWriter`` (max_queue, batch_size,
+                max_delay, overflow, fsync, fsync_interval).
 
         Raises:
             OSError: Si le répertoire n'est pas accessible ou non valide.
+            ValueError: Si le mode de stockage est inconnu.
         """
+        if not isinstance(storage, LogStore) and storage not in STORAGE_MODES:
+            raise ValueError(
+                f"Mode de stockage invalide : {storage}. "
+                f"Doit être l'un de {', '.join(STORAGE_MODES)}"
+            )
         # Vérifier si le répertoire existe, sinon le créer
-        if not os.path.exists(directory):
-            os.makedirs(directory)
+        os.makedirs(directory, exist_ok=True)
         # Définir le chemin du fichier logs.json
         self.log_file = os.path.join(directory, "logs.json")
-        # S'assurer que le fichier JSON existe
-        self._init_file()
+        # Sérialise les écritures (threads du serveur et écrivain différé)
+        self._lock = threading.RLock()
+        self.ingested: Counter = Counter()
+        if isinstance(storage, LogStore):
+            self.storage = type(storage).__name__
+            self._store = storage
+        else:
+            self.storage = storage
+            self._store = self._open_store(directory, storage)
+        if not isinstance(self._store, JsonStore) and os.path.exists(self.log_file):
+            self._migrate_json()
+        self._writer: Optional[BufferedLogWriter] = None
+        if buffered:
+            self._writer = BufferedLogWriter(self._commit, **writer_options)
+            atexit.register(self.close)
+
+    def _open_store(self, directory: str, storage: str) -> LogStore:
+        """Instancie le moteur de stockage correspondant à un mode.
 
-    def _init_file(self) -> None:
-        """Crée le fichier JSON s'il n'existe pas.
+        Args:
+            directory (str): Répertoire des journaux.
+            storage (str): Mode de stockage.
 
-        Si le fichier logs.json n'existe pas, crée un fichier vide avec une liste vide.
+        Returns:
+            LogStore: Moteur de stockage.
         """
-        if not os.path.exists(self.log_file):
-            with open(self.log_file, "w", encoding="utf-8") as f:
-                json.dump([], f, ensure_ascii=False)
+        if storage == "segments":
+            return SegmentStore(os.path.join(directory, "segments"))
+        if storage == "sqlite":
+            return SqliteStore(os.path.join(directory, "logs.db"))
+        return JsonStore(self.log_file)
+
+    def _migrate_json(self) -> int:
+        """Importe en une fois l'ancien logs.json (tableau JSON) dans le moteur.
+
+        Les IDs existants sont conservés ; un ID en double reçoit un nouvel ID.
+        Une fois l'import terminé, le fichier source est renommé en
+        ``logs.json.migrated`` pour que la migration ne soit pas rejouée.
+
+        Returns:
+            int: Nombre de journaux importés.
+
+        Raises:
+            json.JSONDecodeError: Si le fichier source est corrompu.
+        """
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        seen = set()
+        for record in records:
+            if record.get("id") in seen:
+                record["id"] = None
+            seen.add(record.get("id"))
+        with self._lock:
+            self._store.append(records)
+        os.replace(self.log_file, self.log_file + ".migrated")
+        return len(records)
 
     def create_log(self, log: Log) -> None:
         """Ajoute un nouveau journal au fichier JSON.
 
+        En mode différé, le journal est seulement déposé dans la file d'écriture
+        et son ID est attribué au moment de l'écriture du lot.
+
         Args:
             log (Log): Objet Log à sauvegarder.
 
         Raises:
             IOError: Si l'écriture dans le fichier échoue.
+            queue.Full: Si la file d'écriture est pleine avec la politique "raise".
         """
-        # Lire les journaux existants
-        with open(self.log_file, "r", encoding="utf-8") as f:
-            logs = json.load(f)
+        if self._writer is not None:
+            self._writer.submit(log)
+            return
+        self._commit([log])
 
-        # Générer un ID si aucun n'est fourni
-        if log.id is None:
-            log.id = str(len(logs) + 1)  # ID simple basé sur le nombre de journaux
-        # Ajouter le nouveau journal
-        logs.append(log.to_dict())
+    def create_logs(self, logs: List[Log]) -> None:
+        """Ajoute plusieurs journaux en un seul accès au stockage.
 
-        # Sauvegarder dans le fichier
-        with open(self.log_file, "w", encoding="utf-8") as f:
-            json.dump(logs, f, ensure_ascii=False, indent=2)
+        En mode différé, les journaux sont déposés dans la file d'écriture.
+
+        Args:
+            logs (List[Log]): Objets Log à sauvegarder ; leurs IDs sont attribués.
 
-    def read_logs(self, filter_level: Optional[str] = None) -> List[Log]:
+        Raises:
+            IOError: Si l'écriture dans le fichier échoue.
+            queue.Full: Si la file d'écriture est pleine avec la politique "raise".
+        """
+        if self._writer is not None:
+            for log in logs:
+                self._writer.submit(log)
+            return
+        if logs:
+            self._commit(logs)
+
+    def _commit(self, logs: List[Log], sync: bool = False) -> None:
+        """Écrit un lot de journaux en un seul accès au stockage.
+
+        Args:
+            logs (List[Log]): Journaux à sauvegarder ; les IDs manquants sont attribués.
+            sync (bool): Force la synchronisation sur disque (fsync) après l'écriture.
+
+        Raises:
+            IOError: Si l'écriture dans le fichier échoue.
+        """
+        records = [log.to_dict() for log in logs]
+        with self._lock:
+            self._store.append(records, fsync=sync)
+            self.ingested.update((record["level"], record.get("module") or "") for record in records)
+        for log, record in zip(logs, records):
+            log.id = record["id"]
+
+    @property
+    def pending(self) -> int:
+        """Nombre de journaux en attente dans la file d'écriture (0 sans écriture différée)."""
+        return self._writer.pending if self._writer is not None else 0
+
+    def read_logs(self, filter_level: Optional[str] = None,
+                  module: Optional[str] = None) -> List[Log]:
         """Lit les journaux depuis le fichier JSON.
 
         Args:
             filter_level (Optional[str]): Filtre les journaux par niveau (ex. "INFO").
                                         Si None, retourne tous les journaux.
+            module (Optional[str]): Filtre les journaux par module source.
 
         Returns:
             List[Log]: Liste des objets Log triés par horodatage (plus récent d'abord).
 
         Raises:
             IOError: Si la lecture du fichier échoue.
-            json.JSONDecodeError: Si le fichier JSON est corrompu.
         """
-        try:
-            with open(self.log_file, "r", encoding="utf-8") as f:
-                logs_data = json.load(f)
-        except json.JSONDecodeError:
-            return []  # Retourner une liste vide si le fichier est corrompu
+        logs, _ = self.query_logs(level=filter_level, module=module)
+        return logs
+
+    def query_logs(self, level: Optional[str] = None, module: Optional[str] = None,
+                   since: Optional[Any] = None, until: Optional[Any] = None,
+                   before: Optional[str] = None, after: Optional[str] = None,
+                   limit: Optional[int] = None, q: Optional[str] = None,
+                   node: Optional[str] = None) -> Tuple[List[Log], Optional[str]]:
+        """Lit une page de journaux sous forme d'objets ``Log`` (voir ``query_records``).
+
+        Returns:
+            Tuple[List[Log], Optional[str]]: Les journaux (plus récent d'abord) et le
+            curseur de la page suivante, None s'il n'y a plus de journaux.
+
+        Raises:
+            ValueError: Si un curseur, un horodatage ou la limite est invalide.
+            IOError: Si la lecture du stockage échoue.
+        """
+        records, next_cursor = self.query_records(level=level, module=module, since=since, until=until,
+                                                  before=before, after=after, limit=limit, q=q, node=node)
+        # Les journaux stockés ont déjà été validés : pas de revalidation
+        return [Log.from_stored(data) for data in records], next_cursor
+
+    def query_records(self, level: Optional[str] = None, module: Optional[str] = None,
+                      since: Optional[Any] = None, until: Optional[Any] = None,
+                      before: Optional[str] = None, after: Optional[str] = None,
+                      limit: Optional[int] = None, q: Optional[str] = None,
+                      node: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Lit une page de journaux sérialisés, du plus récent au plus ancien.
+
+        Les journaux sont retournés tels que stockés (format de ``Log.to_dict()``),
+        prêts à être sérialisés en JSON sans créer d'objet ``Log`` ; ils peuvent
+        être partagés avec l'index du stockage et ne doivent pas être modifiés.
+
+        Sans ``after``, la page contient les ``limit`` journaux les plus récents
+        (plus anciens que ``before`` si fourni) et le curseur retourné permet de
+        demander la page suivante avec ``before``. Avec ``after``, la page contient
+        les ``limit`` journaux qui suivent immédiatement le curseur et le curseur
+        retourné permet de continuer à suivre les nouveaux journaux avec ``after``.
+
+        Args:
+            level (Optional[str]): Filtre par niveau (ex. "INFO").
+            module (Optional[str]): Filtre par module source.
+            since (Optional[Any]): Horodatage minimal inclus (datetime ou ISO 8601).
+            until (Optional[Any]): Horodatage maximal inclus (datetime ou ISO 8601).
+            before (Optional[str]): Curseur ; ne retourne que des journaux plus anciens.
+            after (Optional[str]): Curseur ; ne retourne que des journaux plus récents.
+            limit (Optional[int]): Nombre maximal de journaux (None : tous).
+            q (Optional[str]): Recherche plein texte (voir ``search``).
+            node (Optional[str]): Machine d'origine des journaux reçus d'agents.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Optional[str]]: Les journaux (plus récent
+            d'abord) et le curseur de la page suivante, None s'il n'y a plus de journaux.
+
+        Raises:
+            ValueError: Si un curseur, un horodatage ou la limite est invalide.
+            IOError: Si la lecture du stockage échoue.
+        """
+        if limit is not None and limit <= 0:
+            raise ValueError(f"La limite doit être strictement positive : {limit}")
+        since = normalize_timestamp(since) if since else None
+        until = normalize_timestamp(until) if until else None
+        before_key = decode_cursor(before) if before else None
+        after_key = decode_cursor(after) if after else None
+        terms = parse_search(q)
+        if node:
+            terms = (terms or []) + [node_term(node)]
+
+        records = self._store.query(level=level, module=module, since=since, until=until,
+                                    before=before_key, after=after_key,
+                                    limit=limit + 1 if limit else None,
+                                    terms=terms)
+        has_more = limit is not None and len(records) > limit
+        records = records[:limit]
+
+        if after_key is not None:
+            # Suivi des nouveaux journaux : toujours fournir un curseur de reprise
+            next_cursor = encode_cursor(records[-1]) if records else after
+            records.reverse()
+        else:
+            next_cursor = encode_cursor(records[-1]) if has_more else None
+        return records, next_cursor
+
+    def read_after_id(self, last_id: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Lit les journaux dans l'ordre de leur écriture, à partir d'un ID.
+
+        Contrairement au suivi par curseur (``query_records(after=...)``), qui
+        suit l'ordre des horodatages, un lecteur qui retient le dernier ID lu ne
+        manque aucun journal écrit ensuite, même horodaté dans le passé.
+
+        Args:
+            last_id (int): Dernier ID déjà lu (0 : depuis le début).
+            limit (Optional[int]): Nombre maximal de journaux (None : tous).
 
-        # Convertir chaque dictionnaire en objet Log
-        logs = [Log.from_dict(data) for data in logs_data]
+        Returns:
+            List[Dict[str, Any]]: Journaux sérialisés, par ID croissant.
+
+        Raises:
+            ValueError: Si la limite est invalide.
+            IOError: Si la lecture du stockage échoue.
+        """
+        if limit is not None and limit <= 0:
+            raise ValueError(f"La limite doit être strictement positive : {limit}")
+        return self._store.read_after_id(last_id, limit)
+
+    def stored_sources(self, node: str, logs: List[Log]) -> Dict[str, str]:
+        """Retourne les journaux d'agent de ``logs`` déjà enregistrés pour la machine ``node``.
+
+        Args:
+            node (str): Machine d'origine.
+            logs (List[Log]): Journaux reçus de cette machine (``source_id`` renseigné).
+
+        Returns:
+            Dict[str, str]: ID enregistré, par ``source_id``, des journaux déjà
+            présents dans le stockage.
+        """
+        return self._store.stored_sources(node, [log.to_dict() for log in logs]) if logs else {}
 
-        # Filtrer par niveau si spécifié
-        if filter_level:
-            filter_level = filter_level.upper()
-            logs = [log for log in logs if log.level == filter_level]
+    def iter_pages(self, level: Optional[str] = None, module: Optional[str] = None,
+                   since: Optional[Any] = None, until: Optional[Any] = None,
+                   q: Optional[str] = None, node: Optional[str] = None,
+                   page_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """Parcourt tous les journaux d'une sélection par pages, du plus récent au plus ancien.
 
-        # Trier par horodatage (plus récent d'abord)
-        return sorted(logs, key=lambda x: x.timestamp, reverse=True)
+        Chaque page est lue à la demande à partir du curseur de la précédente :
+        la mémoire utilisée ne dépend pas du nombre total de journaux.
+
+        Args:
+            level (Optional[str]): Filtre par niveau.
+            module (Optional[str]): Filtre par module source.
+            since (Optional[Any]): Horodatage minimal inclus (datetime ou ISO 8601).
+            until (Optional[Any]): Horodatage maximal inclus (datetime ou ISO 8601).
+            q (Optional[str]): Recherche plein texte (voir ``search``).
+            node (Optional[str]): Machine d'origine des journaux reçus d'agents.
+            page_size (int): Nombre de journaux par page.
+
+        Yields:
+            List[Dict[str, Any]]: Pages non vides de journaux sérialisés.
+
+        Raises:
+            ValueError: Si un horodatage ou la taille de page est invalide.
+        """
+        cursor = None
+        while True:
+            records, cursor = self.query_records(level=level, module=module, since=since, until=until,
+                                                 before=cursor, limit=page_size, q=q, node=node)
+            if records:
+                yield records
+            if cursor is None:
+                return
+
+    def head_cursor(self, level: Optional[str] = None, module: Optional[str] = None,
+                    q: Optional[str] = None) -> str:
+        """Retourne un curseur désignant le journal le plus récent d'une sélection.
+
+        Passé à ``query_logs(after=...)``, il permet de ne recevoir que les
+        journaux écrits ensuite (suivi en direct).
+
+        Args:
+            level (Optional[str]): Filtre par niveau.
+            module (Optional[str]): Filtre par module source.
+            q (Optional[str]): Recherche plein texte (voir ``search``).
+
+        Returns:
+            str: Curseur du journal le plus récent, ou curseur de début de
+            stockage s'il n'y a aucun journal.
+        """
+        records = self._store.query(level=level, module=module, limit=1, terms=parse_search(q))
+        return encode_cursor(records[0] if records else {"timestamp": "", "id": "0"})
+
+    def search(self, q: str, level: Optional[str] = None, module: Optional[str] = None,
+               since: Optional[Any] = None, until: Optional[Any] = None,
+               limit: Optional[int] = 100) -> List[Log]:
+        """Recherche des journaux par mots du message et valeurs du contexte.
+
+        La recherche s'appuie sur un index inversé : seuls les journaux qui
+        contiennent les termes demandés sont examinés. Chaque mot doit apparaître
+        dans le message ou une valeur du contexte (sans tenir compte de la casse ni
+        des accents) ; un élément ``clé=valeur`` doit correspondre exactement à une
+        valeur du contexte, les clés imbriquées étant jointes par un point.
+
+        Exemple :
+            >>> log_manager.search("timeout user_id=user123", level="ERROR")
+
+        Args:
+            q (str): Termes à trouver tous (ex. "connexion", "error_code=500").
+            level (Optional[str]): Filtre par niveau.
+            module (Optional[str]): Filtre par module source.
+            since (Optional[Any]): Horodatage minimal inclus (datetime ou ISO 8601).
+            until (Optional[Any]): Horodatage maximal inclus (datetime ou ISO 8601).
+            limit (Optional[int]): Nombre maximal de journaux (None : tous).
+
+        Returns:
+            List[Log]: Journaux correspondants, du plus récent au plus ancien.
+
+        Raises:
+            ValueError: Si un horodatage ou la limite est invalide.
+        """
+        logs, _ = self.query_logs(level=level, module=module, since=since, until=until,
+                                  limit=limit, q=q)
+        return logs
+
+    def stats(self, bucket: str = "1h", since: Optional[Any] = None, until: Optional[Any] = None,
+              level: Optional[str] = None, module: Optional[str] = None) -> Dict[str, Any]:
+        """Compte les journaux par intervalle de temps, niveau et module.
+
+        Les compteurs sont maintenus par minute et par heure à chaque écriture :
+        le coût ne dépend que du nombre d'intervalles couverts, pas du nombre de
+        journaux. Les bornes sont appliquées à la minute (intervalles de moins
+        d'une heure) ou à l'heure près.
+
+        Args:
+            bucket (str): Durée des intervalles ("1m", "15m", "1h", "1d"...).
+            since (Optional[Any]): Horodatage minimal (datetime ou ISO 8601).
+            until (Optional[Any]): Horodatage maximal (datetime ou ISO 8601).
+            level (Optional[str]): Filtre par niveau.
+            module (Optional[str]): Filtre par module source.
+
+        Returns:
+            Dict[str, Any]: Totaux (``total``, ``levels``, ``modules``) et liste
+            chronologique ``buckets`` des intervalles non vides, chacun avec
+            ``start``, ``total``, ``levels`` et ``modules``.
+
+        Raises:
+            ValueError: Si l'intervalle ou un horodatage est invalide.
+        """
+        bucket_seconds = parse_bucket(bucket)
+        since = normalize_timestamp(since) if since else None
+        until = normalize_timestamp(until) if until else None
+        result = self._store.stats(bucket_seconds, since=since, until=until, level=level, module=module)
+        result["bucket"] = bucket
+        return result
+
+    def get_log(self, log_id: str) -> Optional[Log]:
+        """Retourne un journal à partir de son ID.
+
+        Args:
+            log_id (str): ID du journal recherché.
+
+        Returns:
+            Optional[Log]: Le journal, ou None s'il n'existe pas.
+        """
+        record = self._store.get(log_id)
+        return Log.from_stored(record) if record else None
 
     def update_log(self, log_id: str, new_message: Optional[str] = None,
                    new_context: Optional[Dict[str, Any]] = None) -> bool:
@@ -113,21 +473,13 @@ class LogManager:
         Raises:
             IOError: Si l'écriture dans le fichier échoue.
         """
-        with open(self.log_file, "r", encoding="utf-8") as f:
-            logs = json.load(f)
-
-        # Chercher le journal avec l'ID donné
-        for log_data in logs:
-            if log_data["id"] == log_id:
-                if new_message:
-                    log_data["message"] = new_message
-                if new_context:
-                    log_data["context"] = new_context
-                # Sauvegarder les modifications
-                with open(self.log_file, "w", encoding="utf-8") as f:
-                    json.dump(logs, f, ensure_ascii=False, indent=2)
-                return True
-        return False
+        fields: Dict[str, Any] = {}
+        if new_message:
+            fields["message"] = new_message
+        if new_context:
+            fields["context"] = new_context
+        with self._lock:
+            return self._store.update(log_id, fields)
 
     def delete_log(self, log_id: str) -> bool:
         """Supprime un journal du fichier JSON.
@@ -141,16 +493,33 @@ class LogManager:
         Raises:
             IOError: Si l'écriture dans le fichier échoue.
         """
-        with open(self.log_file, "r", encoding="utf-8") as f:
-            logs = json.load(f)
-
-        # Filtrer le journal avec l'ID donné
-        initial_length = len(logs)
-        logs = [log for log in logs if log["id"] != log_id]
-
-        # Si un journal a été supprimé, sauvegarder
-        if len(logs) < initial_length:
-            with open(self.log_file, "w", encoding="utf-8") as f:
-                json.dump(logs, f, ensure_ascii=False, indent=2)
-            return True
-        return False
\ No newline at end of file
+        with self._lock:
+            return self._store.delete(log_id)
+
+    def clear_logs(self) -> None:
+        """Supprime tous les journaux, quel que soit le mode de stockage.
+
+        Raises:
+            IOError: Si l'écriture dans le fichier échoue.
+        """
+        with self._lock:
+            self._store.clear()
+
+    def flush(self) -> None:
+        """Attend l'écriture des journaux en file (sans effet en mode synchrone).
+
+        Raises:
+            IOError: Si une écriture différée a échoué.
+        """
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """Écrit les journaux en file puis arrête l'écriture différée.
+
+        Raises:
+            IOError: Si une écriture différée a échoué.
+        """
+        if self._writer is not None:
+            self._writer.close()
+        self._store.close()
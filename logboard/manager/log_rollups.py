@@ -0,0 +1,155 @@
+import re
+import bisect
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+# Compteur : (intervalle ISO tronqué, niveau, module, nombre de journaux)
+RollupRow = Tuple[str, str, str, int]
+
+# Granularités conservées : longueur du préfixe ISO et durée en secondes
+MINUTE = (16, 60)  # "2025-07-10T08:05"
+HOUR = (13, 3600)  # "2025-07-10T08"
+
+_BUCKET = re.compile(r"^(\d+)([mhd])$")
+_UNITS = {"m": 60, "h": 3600, "d": 86400}
+_EPOCH = datetime(1970, 1, 1)
+
+
+def parse_bucket(bucket: str) -> int:
+    """Convertit une taille d'intervalle ("5m", "1h", "1d") en secondes.
+
+    Args:
+        bucket (str): Nombre suivi de l'unité m (minutes), h (heures) ou d (jours).
+
+    Returns:
+        int: Durée de l'intervalle en secondes.
+
+    Raises:
+        ValueError: Si le format est invalide.
+    """
+    match = _BUCKET.match(str(bucket).strip())
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f"Intervalle invalide : {bucket} (exemples : 1m, 15m, 1h, 1d)")
+    return int(match.group(1)) * _UNITS[match.group(2)]
+
+
+def granularity(bucket_seconds: int) -> Tuple[int, int]:
+    """Choisit les compteurs les plus grossiers compatibles avec un intervalle.
+
+    Returns:
+        Tuple[int, int]: ``HOUR`` si l'intervalle est un multiple de l'heure,
+        sinon ``MINUTE``.
+    """
+    return HOUR if bucket_seconds % HOUR[1] == 0 else MINUTE
+
+
+def build_stats(rows: Iterable[RollupRow], bucket_seconds: int) -> Dict[str, Any]:
+    """Regroupe des compteurs en histogramme.
+
+    Les intervalles sont alignés sur des multiples de leur durée (minuit pour
+    ``1d``, l'heure pile pour ``1h``...).
+
+    Args:
+        rows (Iterable[RollupRow]): Compteurs par minute ou par heure.
+        bucket_seconds (int): Durée des intervalles de l'histogramme.
+
+    Returns:
+        Dict[str, Any]: Totaux ``total``, ``levels`` et ``modules``, ainsi que la
+        liste chronologique ``buckets`` dont chaque élément contient ``start``,
+        ``total``, ``levels`` et ``modules``.
+    """
+    totals: Dict[str, Any] = {"total": 0, "levels": {}, "modules": {}}
+    buckets: Dict[str, Dict[str, Any]] = {}
+    starts: Dict[str, str] = {}
+    for key, level, module, count in rows:
+        if count <= 0:
+            continue
+        start = starts.get(key)
+        if start is None:
+            moment = datetime.fromisoformat(key + (":00" if len(key) == MINUTE[0] else ":00:00"))
+            offset = int((moment - _EPOCH).total_seconds()) % bucket_seconds
+            start = starts[key] = (moment - timedelta(seconds=offset)).isoformat()
+        bucket = buckets.get(start)
+        if bucket is None:
+            bucket = buckets[start] = {"start": start, "total": 0, "levels": {}, "modules": {}}
+        for target in (bucket, totals):
+            target["total"] += count
+            target["levels"][level] = target["levels"].get(level, 0) + count
+            target["modules"][module] = target["modules"].get(module, 0) + count
+    totals["buckets"] = [buckets[start] for start in sorted(buckets)]
+    return totals
+
+
+class Rollups:
+    """Compteurs de journaux pré-agrégés par minute et par heure.
+
+    Pour chaque minute et chaque heure, le nombre de journaux est tenu par couple
+    (niveau, module) à chaque ajout ou retrait : un histogramme sur des mois se
+    calcule à partir de quelques milliers de compteurs horaires, sans relire les
+    journaux.
+    """
+
+    def __init__(self) -> None:
+        """Initialise des compteurs vides."""
+        self._counts: Dict[int, Dict[str, Dict[Tuple[str, str], int]]] = {MINUTE[0]: {}, HOUR[0]: {}}
+        self._keys: Dict[int, List[str]] = {MINUTE[0]: [], HOUR[0]: []}
+
+    def add(self, record: Dict[str, Any], count: int = 1) -> None:
+        """Compte un journal (ou le décompte avec ``count=-1``).
+
+        Args:
+            record (Dict[str, Any]): Journal au format de ``Log.to_dict()``.
+            count (int): Variation à appliquer.
+        """
+        timestamp = record.get("timestamp") or ""
+        if len(timestamp) < MINUTE[0]:
+            return
+        pair = (record.get("level", "INFO"), record.get("module", "unknown"))
+        for length, _ in (MINUTE, HOUR):
+            key = timestamp[:length]
+            counters = self._counts[length].get(key)
+            if counters is None:
+                counters = self._counts[length][key] = {}
+                keys = self._keys[length]
+                if not keys or keys[-1] < key:
+                    keys.append(key)
+                else:
+                    bisect.insort(keys, key)
+            counters[pair] = counters.get(pair, 0) + count
+
+    def remove(self, record: Dict[str, Any]) -> None:
+        """Décompte un journal retiré.
+
+        Args:
+            record (Dict[str, Any]): Journal au format de ``Log.to_dict()``.
+        """
+        self.add(record, -1)
+
+    def rows(self, precision: Tuple[int, int], since: Optional[str] = None,
+             until: Optional[str] = None, level: Optional[str] = None,
+             module: Optional[str] = None) -> Iterator[RollupRow]:
+        """Parcourt les compteurs d'une granularité.
+
+        Les bornes sont appliquées à la granularité des compteurs : un intervalle
+        est retenu s'il recoupe [since, until].
+
+        Args:
+            precision (Tuple[int, int]): ``MINUTE`` ou ``HOUR``.
+            since (Optional[str]): Horodatage ISO minimal.
+            until (Optional[str]): Horodatage ISO maximal.
+            level (Optional[str]): Niveau à conserver.
+            module (Optional[str]): Module à conserver.
+
+        Yields:
+            RollupRow: Compteurs non nuls.
+        """
+        length = precision[0]
+        keys = self._keys[length]
+        low = bisect.bisect_left(keys, since[:length]) if since else 0
+        high = bisect.bisect_right(keys, until[:length]) if until else len(keys)
+        level = level.upper() if level else None
+        for key in keys[low:high]:
+            for (row_level, row_module), count in self._counts[length][key].items():
+                if count and (not level or row_level == level) and (not module or row_module == module):
+                    yield key, row_level, row_module, count
@@ -0,0 +1,215 @@
+import os
+import glob
+import gzip
+import json
+import socket
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from typing import Any, Dict, List, Optional
+
+
+class LogShipper:
+    """Agent qui envoie les journaux d'un ``LogManager`` local à un logboard central.
+
+    L'agent suit le stockage local dans l'ordre des IDs, qui est celui des
+    écritures (voir ``LogManager.read_after_id``) : un journal écrit après les
+    autres mais horodaté dans le passé est envoyé comme les autres. Les journaux
+    écrits par d'autres processus sont suivis de même. L'agent en fait des lots NDJSON
+    compressés en gzip. Chaque lot est d'abord écrit dans un répertoire tampon
+    (``spool_dir``) avant que la position de lecture n'avance, puis envoyé à
+    ``POST /logs/batch?node=<machine>`` du serveur central et supprimé une fois
+    accepté. Un lot non acquitté (serveur injoignable, erreur 5xx, arrêt de
+    l'agent) reste dans le tampon et est renvoyé plus tard, avec une attente
+    croissante entre les tentatives : la livraison est garantie au moins une
+    fois, et le serveur central écarte les doublons par (machine, ID d'origine).
+    Cela suppose qu'un ID local ne soit jamais réutilisé, ce que garantissent
+    les trois modes de stockage, y compris après une suppression ou ``clear_logs``.
+
+    Un lot refusé comme invalide (erreur 4xx) est déplacé dans
+    ``<spool_dir>/rejected`` pour ne pas bloquer les suivants. Quand le tampon
+    contient ``max_spool`` lots, l'agent cesse de lire le stockage local (les
+    journaux y restent) jusqu'à ce que le serveur central réponde à nouveau.
+
+    Exemple (sur chaque machine de prétraitement) :
+
+        shipper = LogShipper(LogManager(directory="./logs"), "http://central:5000",
+                             spool_dir="./logs/spool")
+        shipper.start()
+
+    Attributes:
+        log_manager (LogManager): Stockage local suivi.
+        collector_url (str): URL du logboard central (ex. "http://central:5000").
+        node (str): Nom de la machine, transmis avec chaque lot.
+        spool_dir (str): Répertoire des lots en attente et de la position de lecture.
+        batch_size (int): Nombre maximal de journaux par lot.
+        interval (float): Attente entre deux lectures du stockage local, en secondes.
+        shipped (int): Nombre de journaux acceptés par le serveur central.
+    """
+
+    def __init__(self, log_manager: Any, collector_url: str, spool_dir: str,
+                 node: Optional[str] = None, batch_size: int = 1000, interval: float = 1.0,
+                 timeout: float = 10.0, max_spool: int = 100, max_backoff: float = 60.0) -> None:
+        """Initialise l'agent sans démarrer son thread.
+
+        Args:
+            log_manager (LogManager): Stockage local à suivre.
+            collector_url (str): URL du logboard central.
+            spool_dir (str): Répertoire des lots en attente (créé si besoin).
+            node (Optional[str]): Nom de la machine (par défaut le nom d'hôte).
+            batch_size (int): Nombre maximal de journaux par lot.
+            interval (float): Attente entre deux lectures du stockage local.
+            timeout (float): Délai maximal d'une requête HTTP, en secondes.
+            max_spool (int): Nombre maximal de lots en attente.
+            max_backoff (float): Attente maximale entre deux tentatives d'envoi.
+
+        Raises:
+            ValueError: Si ``batch_size``, ``interval`` ou ``max_spool`` n'est pas
+                strictement positif.
+        """
+        if batch_size <= 0 or interval <= 0 or max_spool <= 0:
+            raise ValueError("batch_size, interval et max_spool doivent être strictement positifs")
+        self.log_manager = log_manager
+        self.collector_url = collector_url.rstrip("/")
+        self.node = node or socket.gethostname()
+        self.spool_dir = spool_dir
+        self.batch_size = batch_size
+        self.interval = interval
+        self.timeout = timeout
+        self.max_spool = max_spool
+        self.max_backoff = max_backoff
+        self.shipped = 0
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        os.makedirs(os.path.join(spool_dir, "rejected"), exist_ok=True)
+        self._state_path = os.path.join(spool_dir, "state.json")
+        self._last_id, self._sequence = self._load_state()
+
+    def _load_state(self) -> tuple:
+        """Relit le dernier ID mis en attente et le numéro du dernier lot écrits dans le tampon."""
+        try:
+            with open(self._state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            return state["last_id"], state["sequence"]
+        except FileNotFoundError:
+            return 0, 0
+
+    def _save_state(self) -> None:
+        """Enregistre la position de lecture (remplacement atomique)."""
+        temporary = self._state_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"last_id": self._last_id, "sequence": self._sequence}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self._state_path)
+
+    def pending(self) -> List[str]:
+        """Retourne les lots en attente d'envoi, du plus ancien au plus récent."""
+        return sorted(glob.glob(os.path.join(self.spool_dir, "batch-*.ndjson.gz")))
+
+    def spool(self) -> int:
+        """Lit les nouveaux journaux locaux et les écrit dans le tampon, par lots.
+
+        Returns:
+            int: Nombre de journaux mis en attente.
+        """
+        count = 0
+        with self._lock:
+            while len(self.pending()) < self.max_spool:
+                records = self.log_manager.read_after_id(self._last_id, limit=self.batch_size)
+                if not records:
+                    break
+                self._sequence += 1
+                path = os.path.join(self.spool_dir, f"batch-{self._sequence:012d}.ndjson.gz")
+                body = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+                with open(path + ".tmp", "wb") as f:
+                    f.write(gzip.compress(body.encode("utf-8")))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(path + ".tmp", path)
+                # Le lot est en sécurité dans le tampon : la lecture peut avancer
+                self._last_id = int(records[-1]["id"])
+                self._save_state()
+                count += len(records)
+                if len(records) < self.batch_size:
+                    break
+        return count
+
+    def send(self) -> int:
+        """Envoie les lots en attente dans l'ordre, jusqu'au premier échec.
+
+        Returns:
+            int: Nombre de journaux acceptés par le serveur central.
+
+        Raises:
+            OSError: Si le serveur central est injoignable ou répond par une
+                erreur temporaire (5xx, 408, 429) ; le lot reste en attente.
+        """
+        accepted = 0
+        url = f"{self.collector_url}/logs/batch?{urllib.parse.urlencode({'node': self.node})}"
+        for path in self.pending():
+            with open(path, "rb") as f:
+                body = f.read()
+            request = urllib.request.Request(url, data=body, method="POST", headers={
+                "Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"
+            })
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    result: Dict[str, Any] = json.load(response)
+            except urllib.error.HTTPError as e:
+                if e.code >= 500 or e.code in (408, 429):
+                    raise
+                # Lot invalide : le mettre de côté plutôt que de bloquer les suivants
+                os.replace(path, os.path.join(self.spool_dir, "rejected", os.path.basename(path)))
+                continue
+            os.remove(path)
+            accepted += result.get("count", 0)
+            self.shipped += result.get("count", 0)
+        return accepted
+
+    def run_once(self) -> int:
+        """Met en attente les nouveaux journaux puis envoie le tampon.
+
+        Returns:
+            int: Nombre de journaux acceptés par le serveur central.
+
+        Raises:
+            OSError: Si l'envoi échoue (voir ``send``).
+        """
+        accepted, spooled = 0, True
+        # Tampon plein : continuer tant que la lecture a du retard
+        while spooled:
+            spooled = self.spool() > 0
+            accepted += self.send()
+        return accepted
+
+    def start(self) -> None:
+        """Démarre le thread d'envoi (sans effet s'il tourne déjà)."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="log-shipper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Arrête le thread d'envoi ; les lots non acquittés restent dans le tampon."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def _run(self) -> None:
+        """Boucle du thread : envoi toutes les ``interval`` secondes, attente croissante après un échec."""
+        delay = 0.0
+        while not self._stop.wait(delay):
+            try:
+                self.run_once()
+                self._failures = 0
+                delay = self.interval
+            except (OSError, ValueError):  # Serveur injoignable ou réponse illisible
+                self._failures += 1
+                delay = min(self.max_backoff, self.interval * 2 ** self._failures)
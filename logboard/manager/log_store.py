@@ -0,0 +1,236 @@
+import threading
+
+from itertools import islice
+from manager.log_index import LogIndex
+from manager.log_rollups import build_stats, granularity
+from typing import List, Dict, Any, Optional, Tuple
+
+
+class LogStore:
+    """Interface commune des moteurs de stockage des journaux.
+
+    ``LogManager`` ne manipule les journaux qu'à travers cette interface ; un
+    nouveau moteur s'ajoute en sous-classant ``LogStore`` et en passant une
+    instance à ``LogManager(storage=...)``. Les journaux y circulent sous forme
+    sérialisée (dictionnaires au format de ``Log.to_dict()``).
+
+    Les écritures d'un même processus sont sérialisées par ``LogManager`` ; un
+    moteur n'a donc à gérer que la concurrence entre processus.
+    """
+
+    def append(self, records: List[Dict[str, Any]], fsync: bool = False) -> None:
+        """Ajoute des journaux au stockage.
+
+        Les journaux dont l'ID vaut None reçoivent un nouvel ID, écrit dans le
+        dictionnaire correspondant.
+
+        Args:
+            records (List[Dict[str, Any]]): Journaux sérialisés à ajouter.
+            fsync (bool): Force la synchronisation sur disque après l'écriture.
+
+        Raises:
+            IOError: Si l'écriture échoue.
+        """
+        raise NotImplementedError
+
+    def get(self, log_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne un journal à partir de son ID.
+
+        Args:
+            log_id (str): ID du journal recherché.
+
+        Returns:
+            Optional[Dict[str, Any]]: Le journal sérialisé, ou None s'il n'existe pas.
+        """
+        raise NotImplementedError
+
+    def update(self, log_id: str, fields: Dict[str, Any]) -> bool:
+        """Remplace des champs d'un journal existant.
+
+        Args:
+            log_id (str): ID du journal à modifier.
+            fields (Dict[str, Any]): Champs à remplacer ("message", "context").
+
+        Returns:
+            bool: True si le journal a été trouvé et modifié.
+        """
+        raise NotImplementedError
+
+    def delete(self, log_id: str) -> bool:
+        """Supprime un journal.
+
+        Args:
+            log_id (str): ID du journal à supprimer.
+
+        Returns:
+            bool: True si le journal a été trouvé et supprimé.
+        """
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Supprime tous les journaux."""
+        raise NotImplementedError
+
+    def query(self, level: Optional[str] = None, module: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None,
+              before: Optional[Tuple[str, int]] = None,
+              after: Optional[Tuple[str, int]] = None,
+              limit: Optional[int] = None,
+              terms: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Recherche des journaux triés par (horodatage, ID).
+
+        L'ordre est décroissant (plus récent d'abord), sauf avec ``after`` où il
+        est croissant à partir de la position donnée.
+
+        Args:
+            level (Optional[str]): Niveau à conserver.
+            module (Optional[str]): Module à conserver.
+            since (Optional[str]): Horodatage ISO minimal (inclus).
+            until (Optional[str]): Horodatage ISO maximal (inclus).
+            before (Optional[Tuple[str, int]]): Ne retourne que les journaux antérieurs.
+            after (Optional[Tuple[str, int]]): Ne retourne que les journaux postérieurs.
+            limit (Optional[int]): Nombre maximal de journaux (None : tous).
+            terms (Optional[List[str]]): Termes de recherche plein texte (voir
+                ``log_index.parse_search``) que chaque journal doit tous contenir.
+
+        Returns:
+            List[Dict[str, Any]]: Journaux sérialisés.
+        """
+        raise NotImplementedError
+
+    def read_after_id(self, last_id: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Lit les journaux dans l'ordre de leur écriture, à partir d'un ID.
+
+        Les IDs numériques sont attribués sous le verrou d'écriture, dans l'ordre
+        des écritures : un lecteur qui retient le dernier ID lu reçoit ensuite
+        chaque nouveau journal, y compris un journal horodaté avant ceux qu'il a
+        déjà lus.
+
+        Args:
+            last_id (int): Dernier ID déjà lu (0 : depuis le début).
+            limit (Optional[int]): Nombre maximal de journaux (None : tous).
+
+        Returns:
+            List[Dict[str, Any]]: Journaux sérialisés, par ID croissant.
+        """
+        raise NotImplementedError
+
+    def stored_sources(self, node: str, records: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Retourne les journaux d'agent déjà enregistrés parmi ``records``.
+
+        Args:
+            node (str): Machine d'origine.
+            records (List[Dict[str, Any]]): Journaux reçus de cette machine, avec
+                leur ``source_id`` et leur ``timestamp``.
+
+        Returns:
+            Dict[str, str]: ID enregistré, par ``source_id``, des journaux déjà
+            présents dans le stockage.
+        """
+        raise NotImplementedError
+
+    def stats(self, bucket_seconds: int, since: Optional[str] = None, until: Optional[str] = None,
+              level: Optional[str] = None, module: Optional[str] = None) -> Dict[str, Any]:
+        """Retourne le nombre de journaux par intervalle, niveau et module.
+
+        Les moteurs maintiennent des compteurs par minute et par heure à chaque
+        écriture : le résultat se calcule sans relire les journaux.
+
+        Args:
+            bucket_seconds (int): Durée des intervalles en secondes.
+            since (Optional[str]): Horodatage ISO minimal.
+            until (Optional[str]): Horodatage ISO maximal.
+            level (Optional[str]): Niveau à conserver.
+            module (Optional[str]): Module à conserver.
+
+        Returns:
+            Dict[str, Any]: Histogramme au format de ``log_rollups.build_stats``.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Libère les ressources du stockage (sans effet par défaut)."""
+
+
+class IndexedLogStore(LogStore):
+    """Base des stockages fichiers servis par un index résident.
+
+    Les sous-classes fournissent ``_tail()``, qui lit les journaux écrits depuis
+    une position donnée ; les recherches sont alors servies par un ``LogIndex``
+    chargé une seule fois puis complété à chaque lecture, y compris avec les
+    journaux ajoutés par d'autres processus partageant les fichiers.
+    """
+
+    def __init__(self) -> None:
+        """Initialise l'index résident (vide jusqu'à la première lecture)."""
+        self._index = LogIndex()
+        self._index_lock = threading.Lock()
+        self._cursor: Any = None
+
+    def _tail(self, cursor: Any) -> Tuple[List[Dict[str, Any]], Any, bool]:
+        """Lit les journaux écrits depuis une position donnée.
+
+        Args:
+            cursor (Any): Position retournée par l'appel précédent, ou None.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Any, bool]: Les journaux lus, la nouvelle
+            position et True si l'index doit être reconstruit depuis zéro.
+        """
+        raise NotImplementedError
+
+    def _invalidate(self) -> None:
+        """Force la reconstruction de l'index à la prochaine lecture."""
+        self._cursor = None
+
+    def _refresh(self) -> None:
+        """Complète l'index avec les journaux écrits depuis la dernière lecture.
+
+        Doit être appelée avec ``_index_lock`` acquis.
+        """
+        records, self._cursor, reset = self._tail(self._cursor)
+        if reset:
+            self._index.clear()
+        self._index.add_many(records)
+
+    def get(self, log_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne un journal à partir de son ID, via l'index résident."""
+        with self._index_lock:
+            self._refresh()
+            return self._index.get(log_id)
+
+    def query(self, level: Optional[str] = None, module: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None,
+              before: Optional[Tuple[str, int]] = None,
+              after: Optional[Tuple[str, int]] = None,
+              limit: Optional[int] = None,
+              terms: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Recherche des journaux dans l'index résident (voir ``LogStore.query``)."""
+        with self._index_lock:
+            self._refresh()
+            matches = self._index.query(level=level, module=module, since=since, until=until,
+                                        before=before, after=after, terms=terms)
+            return list(islice(matches, limit)) if limit is not None else list(matches)
+
+    def read_after_id(self, last_id: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Lit les journaux par ID croissant dans l'index résident (voir ``LogStore.read_after_id``)."""
+        with self._index_lock:
+            self._refresh()
+            return list(islice(self._index.after_id(last_id), limit))
+
+    def stored_sources(self, node: str, records: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Recherche les journaux d'agent dans l'index résident (voir ``LogStore.stored_sources``)."""
+        with self._index_lock:
+            self._refresh()
+            found = {str(record.get("source_id")): self._index.source_log_id(node, record.get("source_id"))
+                     for record in records}
+        return {source_id: log_id for source_id, log_id in found.items() if log_id is not None}
+
+    def stats(self, bucket_seconds: int, since: Optional[str] = None, until: Optional[str] = None,
+              level: Optional[str] = None, module: Optional[str] = None) -> Dict[str, Any]:
+        """Calcule l'histogramme à partir des compteurs de l'index résident (voir ``LogStore.stats``)."""
+        with self._index_lock:
+            self._refresh()
+            rows = list(self._index.rollups.rows(granularity(bucket_seconds), since=since, until=until,
+                                                 level=level, module=module))
+        return build_stats(rows, bucket_seconds)
@@ -0,0 +1,230 @@
+import time
+import queue
+import threading
+
+from model.log import Log
+from typing import Callable, List, Optional
+
+OVERFLOW_POLICIES = ("block", "drop_debug", "raise")
+FSYNC_POLICIES = ("none", "batch", "interval")
+
+_STOP = object()
+_FLUSH = object()
+
+
+class BufferedLogWriter:
+    """Écrit les journaux en arrière-plan par lots (« group commit »).
+
+    Les producteurs déposent les journaux dans une file bornée en mémoire ; un
+    thread unique la vide et valide les journaux par lots, dès que ``batch_size``
+    journaux sont disponibles ou que le plus ancien attend depuis ``max_delay``
+    secondes. Un seul accès disque est ainsi partagé par tout le lot.
+
+    Politiques de débordement (file pleine) :
+        - ``"block"`` : le producteur attend qu'une place se libère.
+        - ``"drop_debug"`` : les journaux DEBUG sont abandonnés, les autres attendent.
+        - ``"raise"`` : ``queue.Full`` est levée immédiatement.
+
+    Politiques de synchronisation disque (fsync) :
+        - ``"none"`` : les données sont confiées au système sans fsync.
+        - ``"batch"`` : fsync après chaque lot validé.
+        - ``"interval"`` : au plus un fsync toutes les ``fsync_interval`` secondes,
+          ainsi qu'à chaque ``flush()`` et ``close()``.
+
+    Attributes:
+        dropped (int): Nombre de journaux DEBUG abandonnés faute de place.
+    """
+
+    def __init__(
+        self,
+        commit: Callable[[List[Log], bool], None],
+        max_queue: int = 100000,
+        batch_size: int = 1000,
+        max_delay: float = 0.05,
+        overflow: str = "block",
+        fsync: str = "none",
+        fsync_interval: float = 1.0
+    ) -> None:
+        """Initialise l'écrivain et démarre son thread.
+
+        Args:
+            commit (Callable[[List[Log], bool], None]): Fonction qui écrit un lot
+                de journaux ; le second argument demande un fsync.
+            max_queue (int): Nombre maximal de journaux en attente.
+            batch_size (int): Taille maximale d'un lot.
+            max_delay (float): Âge maximal (en secondes) d'un journal en attente.
+            overflow (str): Politique de débordement ("block", "drop_debug", "raise").
+            fsync (str): Politique de synchronisation ("none", "batch", "interval").
+            fsync_interval (float): Intervalle minimal entre deux fsync en mode "interval".
+
+        Raises:
+            ValueError: Si une politique est inconnue.
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Politique de débordement invalide : {overflow}. "
+                f"Doit être l'une de {', '.join(OVERFLOW_POLICIES)}"
+            )
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(
+                f"Politique fsync invalide : {fsync}. "
+                f"Doit être l'une de {', '.join(FSYNC_POLICIES)}"
+            )
+        self._commit = commit
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.overflow = overflow
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.dropped = 0
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._last_sync = time.monotonic()
+        self._dirty = False
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        """Nombre approximatif de journaux en attente d'écriture."""
+        return self._queue.qsize()
+
+    def submit(self, log: Log) -> None:
+        """Dépose un journal dans la file d'écriture.
+
+        Args:
+            log (Log): Journal à écrire.
+
+        Raises:
+            RuntimeError: Si l'écrivain est fermé.
+            queue.Full: Si la file est pleine avec la politique "raise".
+        """
+        if self._closed:
+            raise RuntimeError("L'écrivain de journaux est fermé")
+        if self.overflow == "block":
+            self._queue.put(log)
+            return
+        try:
+            self._queue.put_nowait(log)
+        except queue.Full:
+            if self.overflow == "raise":
+                raise
+            if log.level == "DEBUG":
+                self.dropped += 1
+                return
+            self._queue.put(log)
+
+    def flush(self) -> None:
+        """Attend que tous les journaux déjà déposés soient écrits.
+
+        En mode fsync "interval", les données sont aussi synchronisées sur disque.
+
+        Raises:
+            Exception: La dernière erreur d'écriture survenue en arrière-plan.
+        """
+        if self._closed:
+            self._raise_pending_error()
+            return
+        self._queue.put(_FLUSH)
+        self._queue.join()
+        self._raise_pending_error()
+
+    def close(self) -> None:
+        """Écrit les journaux restants puis arrête le thread d'écriture.
+
+        Raises:
+            Exception: La dernière erreur d'écriture survenue en arrière-plan.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._raise_pending_error()
+
+    def _raise_pending_error(self) -> None:
+        """Relance dans le thread appelant une erreur d'écriture en attente."""
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self) -> None:
+        """Boucle du thread d'écriture : collecte et valide les lots."""
+        while True:
+            try:
+                item = self._queue.get(timeout=self._idle_timeout())
+            except queue.Empty:
+                # Données écrites mais pas encore synchronisées : fsync différé
+                self._write([], force_sync=True)
+                continue
+            batch: List[Log] = []
+            if item is _STOP or item is _FLUSH:
+                marker = item
+            else:
+                batch.append(item)
+                marker = self._fill_batch(batch)
+            self._write(batch, force_sync=marker is not None)
+            for _ in range(len(batch) + (1 if marker is not None else 0)):
+                self._queue.task_done()
+            if marker is _STOP:
+                return
+
+    def _idle_timeout(self) -> Optional[float]:
+        """Délai d'attente maximal du thread avant un fsync différé.
+
+        Returns:
+            Optional[float]: None si aucun fsync n'est en attente.
+        """
+        if self.fsync != "interval" or not self._dirty:
+            return None
+        return max(0.0, self._last_sync + self.fsync_interval - time.monotonic())
+
+    def _fill_batch(self, batch: List[Log]) -> Optional[object]:
+        """Complète un lot jusqu'à ``batch_size`` journaux ou ``max_delay`` secondes.
+
+        Returns:
+            Optional[object]: Le marqueur de vidage ou d'arrêt rencontré, sinon None.
+        """
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is _STOP or item is _FLUSH:
+                return item
+            batch.append(item)
+        return None
+
+    def _write(self, batch: List[Log], force_sync: bool = False) -> None:
+        """Valide un lot en appliquant la politique fsync.
+
+        Args:
+            batch (List[Log]): Journaux à écrire (éventuellement vide).
+            force_sync (bool): Demande un fsync en mode "interval" (flush ou arrêt).
+        """
+        now = time.monotonic()
+        if self.fsync == "batch":
+            sync = bool(batch)
+        elif self.fsync == "interval":
+            sync = self._dirty or bool(batch)
+            sync = sync and (force_sync or now - self._last_sync >= self.fsync_interval)
+        else:
+            sync = False
+        if not batch and not sync:
+            return
+        try:
+            self._commit(batch, sync)
+        except Exception as e:  # L'erreur est relancée par flush() ou close()
+            self._error = e
+            return
+        if sync:
+            self._last_sync = now
+        self._dirty = not sync and (self._dirty or bool(batch))
@@ -0,0 +1,784 @@
+import os
+import json
+import threading
+
+from itertools import islice
+from manager.log_index import LogIndex
+from manager.file_lock import DirectoryLock
+from manager.log_store import LogStore
+from manager.log_rollups import build_stats, granularity
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+SEQUENCE_FILE = "sequence"
+
+# Granularité des partitions : format du préfixe de nom et durée couverte
+PARTITIONS = {
+    "hourly": ("%Y%m%d%H", timedelta(hours=1)),
+    "daily": ("%Y%m%d", timedelta(days=1)),
+}
+
+
+class _Partition:
+    """Index résident d'une partition temporelle, chargé à la première lecture.
+
+    Attributes:
+        index (LogIndex): Journaux de la partition.
+        cursor (Dict[str, Tuple[int, int]]): Inode et octets déjà lus par segment.
+    """
+
+    def __init__(self) -> None:
+        self.index = LogIndex()
+        self.cursor: Dict[str, Tuple[int, int]] = {}
+
+
+class SegmentStore(LogStore):
+    """Stocke les journaux dans des segments JSONL en ajout seul, partitionnés par période.
+
+    Chaque journal occupe une ligne JSON : créer un journal revient à ajouter une
+    ligne en fin de segment, sans relire ni réécrire les journaux existants.
+    Les journaux sont rangés selon leur horodatage dans des partitions horaires
+    ou journalières (``segment-20250710-000001.jsonl``) ; à l'intérieur d'une
+    partition, un nouveau segment est ouvert lorsque le segment actif dépasse
+    ``max_segment_bytes``.
+
+    Les mises à jour et suppressions ne réécrivent rien : elles ajoutent une
+    courte ligne d'opération (``{"op": "update", ...}`` ou une « tombstone »
+    ``{"op": "delete", ...}``) dans la partition du journal visé, retrouvée en
+    O(1) grâce à un index ID -> partition. Un compacteur d'arrière-plan fusionne
+    ensuite ces opérations dans les segments. Les IDs sont monotones et jamais
+    réutilisés : le dernier ID attribué est conservé dans le fichier ``sequence``.
+
+    Plusieurs processus peuvent écrire dans le même répertoire : chaque écriture
+    (ajout, opération, compaction, rétention) se fait sous un verrou consultatif
+    exclusif (``fcntl.flock`` sur le répertoire) et les réécritures passent par un
+    renommage atomique. Les lecteurs ne prennent pas de verrou : ils ne
+    consomment que des lignes complètes.
+
+    La rétention (par âge et/ou taille totale) supprime des segments entiers,
+    sans jamais réécrire de données. Les lectures ne chargent que les partitions
+    qui recoupent la période demandée, de la plus récente à la plus ancienne,
+    jusqu'à obtenir le nombre de journaux voulu.
+
+    Attributes:
+        directory (str): Répertoire contenant les fichiers de segments.
+        max_segment_bytes (int): Taille au-delà de laquelle un nouveau segment est créé.
+        partition (Optional[str]): "hourly", "daily" ou None (pas de partitionnement).
+        max_age (Optional[timedelta]): Âge au-delà duquel une partition est supprimée.
+        max_bytes (Optional[int]): Taille totale maximale des segments.
+        compact_interval (Optional[float]): Période du compacteur en secondes.
+    """
+
+    def __init__(self, directory: str, max_segment_bytes: int = 64 * 1024 * 1024,
+                 partition: Optional[str] = "daily", max_age: Optional[timedelta] = None,
+                 max_bytes: Optional[int] = None, compact_interval: Optional[float] = 60.0) -> None:
+        """Initialise le stockage par segments.
+
+        Args:
+            directory (str): Répertoire des segments (créé s'il n'existe pas).
+            max_segment_bytes (int): Taille maximale d'un segment en octets.
+            partition (Optional[str]): Granularité des partitions ("hourly",
+                "daily") ou None pour un seul flux de segments.
+            max_age (Optional[timedelta]): Rétention par âge (None : illimitée).
+            max_bytes (Optional[int]): Rétention par taille totale (None : illimitée).
+            compact_interval (Optional[float]): Période (secondes) du compacteur,
+                démarré à la première mise à jour ou suppression (None : compaction
+                uniquement par appel explicite à ``compact()``).
+
+        Raises:
+            ValueError: Si la granularité de partition est inconnue.
+            OSError: Si le répertoire ne peut pas être créé.
+        """
+        if partition is not None and partition not in PARTITIONS:
+            raise ValueError(f"Partitionnement inconnu : {partition}. Valeurs possibles : {', '.join(PARTITIONS)}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.partition = partition
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.compact_interval = compact_interval
+        self._partitions: Dict[str, _Partition] = {}
+        self._locations: Dict[str, str] = {}  # ID -> partition
+        self._dirty: Set[str] = set()  # Partitions contenant des opérations à fusionner
+        self._index_lock = threading.Lock()
+        # Sérialise les écritures entre threads et entre processus
+        self._lock = DirectoryLock(directory)
+        self._compactor: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # --- Nommage des segments et des partitions ---
+
+    @staticmethod
+    def _parse_name(name: str) -> Optional[Tuple[str, int]]:
+        """Extrait la partition et le numéro d'un nom de segment.
+
+        Les segments non partitionnés (``segment-000001.jsonl``) appartiennent à la
+        partition "", considérée comme la plus ancienne.
+
+        Returns:
+            Optional[Tuple[str, int]]: (partition, numéro), ou None si le nom ne
+            correspond pas à un segment.
+        """
+        if not (name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)):
+            return None
+        parts = name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)].split("-")
+        if not all(part.isdigit() for part in parts) or len(parts) > 2:
+            return None
+        if len(parts) == 1:
+            return "", int(parts[0])
+        return parts[0], int(parts[1])
+
+    def _segment_path(self, bucket: str, number: int) -> str:
+        """Construit le chemin d'un segment d'une partition."""
+        stem = f"{bucket}-{number:06d}" if bucket else f"{number:06d}"
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{stem}{SEGMENT_SUFFIX}")
+
+    def _bucket(self, timestamp: Optional[str]) -> str:
+        """Retourne la partition d'un horodatage ISO ("" sans partitionnement)."""
+        if self.partition is None or not timestamp or len(timestamp) < 13:
+            return ""
+        # "2025-07-10T08:05:00" -> "20250710" (journalier) ou "2025071008" (horaire)
+        day = timestamp[0:4] + timestamp[5:7] + timestamp[8:10]
+        bucket = day + timestamp[11:13] if self.partition == "hourly" else day
+        return bucket if bucket.isdigit() else ""
+
+    @staticmethod
+    def _bucket_bounds(bucket: str) -> Tuple[Optional[str], Optional[str]]:
+        """Retourne la période [début, fin) couverte par une partition, en ISO.
+
+        La partition "" (segments non partitionnés) n'a pas de bornes.
+        """
+        for fmt, span in PARTITIONS.values():
+            # "%Y%m%d" -> 8 chiffres, "%Y%m%d%H" -> 10 chiffres
+            if len(bucket) == len(fmt) + 2:
+                start = datetime.strptime(bucket, fmt)
+                return start.isoformat(), (start + span).isoformat()
+        return None, None
+
+    def _buckets(self) -> Dict[str, List[str]]:
+        """Liste les segments existants regroupés par partition.
+
+        Returns:
+            Dict[str, List[str]]: Chemins des segments de chaque partition, par
+            partition croissante puis numéro croissant.
+        """
+        found = []
+        for name in os.listdir(self.directory):
+            parsed = self._parse_name(name)
+            if parsed is not None:
+                found.append((parsed, os.path.join(self.directory, name)))
+        buckets: Dict[str, List[str]] = {}
+        for (bucket, _), path in sorted(found):
+            buckets.setdefault(bucket, []).append(path)
+        return buckets
+
+    def segment_paths(self) -> List[str]:
+        """Liste les segments existants, de la partition la plus ancienne à la plus récente.
+
+        Returns:
+            List[str]: Chemins complets des fichiers de segments.
+        """
+        return [path for paths in self._buckets().values() for path in paths]
+
+    def _active_segment(self, bucket: str, paths: List[str]) -> Tuple[str, bool]:
+        """Retourne le segment dans lequel ajouter les journaux d'une partition.
+
+        Un nouveau segment est créé si la partition n'en a aucun ou si son dernier
+        segment a atteint la taille maximale.
+
+        Returns:
+            Tuple[str, bool]: Chemin du segment et True s'il s'agit d'un nouveau segment.
+        """
+        if not paths:
+            return self._segment_path(bucket, 1), True
+        last = paths[-1]
+        if os.path.getsize(last) >= self.max_segment_bytes:
+            number = self._parse_name(os.path.basename(last))[1]
+            return self._segment_path(bucket, number + 1), True
+        return last, False
+
+    # --- Écriture ---
+
+    def next_id(self) -> str:
+        """Réserve l'identifiant du prochain journal.
+
+        Returns:
+            str: Nouvel identifiant numérique.
+        """
+        with self._lock:
+            last_id = self._read_sequence() + 1
+            self._write_sequence(last_id)
+            return str(last_id)
+
+    def _read_sequence(self) -> int:
+        """Lit le dernier ID attribué (verrou acquis).
+
+        Si le fichier ``sequence`` est absent ou illisible, l'ID est retrouvé à la
+        fin des segments.
+        """
+        try:
+            with open(os.path.join(self.directory, SEQUENCE_FILE), "r", encoding="utf-8") as f:
+                return int(f.read())
+        except (FileNotFoundError, ValueError):
+            return self._read_last_id()
+
+    def _write_sequence(self, last_id: int) -> None:
+        """Enregistre le dernier ID attribué (verrou acquis, remplacement atomique)."""
+        path = os.path.join(self.directory, SEQUENCE_FILE)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(str(last_id))
+        os.replace(path + ".tmp", path)
+
+    def _read_last_id(self) -> int:
+        """Retrouve le plus grand identifiant numérique écrit dans les segments.
+
+        Les opérations de mise à jour et de suppression ajoutées en fin de
+        segment portent l'ID d'un journal plus ancien : tous les segments sont
+        donc lus en entier. Ce parcours n'a lieu que si le fichier ``sequence``
+        est absent ou illisible.
+        """
+        last_id = 0
+        for path in self.segment_paths():
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        record_id = str(json.loads(line).get("id", ""))
+                    except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+                        continue  # Ligne incomplète (arrêt brutal pendant une écriture)
+                    if record_id.isdigit():
+                        last_id = max(last_id, int(record_id))
+        return last_id
+
+    def append(self, records: List[Dict[str, Any]], fsync: bool = False) -> None:
+        """Ajoute des journaux en fin du segment actif de leur partition.
+
+        Les journaux sans ID reçoivent l'ID suivant le dernier ID écrit. Chaque
+        partition concernée reçoit une seule écriture. Si un nouveau segment a été
+        ouvert, la rétention est appliquée.
+
+        Args:
+            records (List[Dict[str, Any]]): Journaux sérialisés à ajouter.
+            fsync (bool): Force la synchronisation des segments sur disque.
+
+        Raises:
+            IOError: Si l'écriture dans un segment échoue.
+        """
+        with self._lock:
+            self._append(records, fsync)
+
+    def _append(self, records: List[Dict[str, Any]], fsync: bool) -> None:
+        """Implémente ``append`` (verrou acquis)."""
+        buckets = self._buckets()
+        if not records:
+            if fsync and buckets:
+                self._fsync(max((paths[-1] for paths in buckets.values()), key=os.path.getmtime))
+            return
+        last_id = self._read_sequence()
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            if record.get("id") is None:
+                last_id += 1
+                record["id"] = str(last_id)
+            elif str(record["id"]).isdigit():
+                # IDs fournis (migration) : les IDs générés doivent les suivre
+                last_id = max(last_id, int(record["id"]))
+            grouped.setdefault(self._bucket(record.get("timestamp")), []).append(record)
+        # Réserver les IDs avant d'écrire : un arrêt brutal laisse un trou, jamais un doublon
+        self._write_sequence(last_id)
+
+        rotated = False
+        for bucket, bucket_records in grouped.items():
+            path, created = self._active_segment(bucket, buckets.get(bucket, []))
+            rotated = rotated or created
+            self._write(path, bucket_records, fsync)
+        if rotated and (self.max_age is not None or self.max_bytes is not None):
+            self.apply_retention()
+
+    @staticmethod
+    def _write(path: str, records: List[Dict[str, Any]], fsync: bool) -> None:
+        """Ajoute des journaux en fin de segment en une seule écriture."""
+        payload = "".join(
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for record in records
+        )
+        # Compléter une éventuelle ligne tronquée par une écriture interrompue
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    payload = "\n" + payload
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(payload)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+    @staticmethod
+    def _fsync(path: str) -> None:
+        """Synchronise un segment existant sur disque."""
+        with open(path, "rb") as f:
+            os.fsync(f.fileno())
+
+    # --- Rétention ---
+
+    def apply_retention(self, max_age: Optional[timedelta] = None, max_bytes: Optional[int] = None,
+                        now: Optional[datetime] = None) -> List[str]:
+        """Supprime les segments entiers qui dépassent la rétention.
+
+        Les partitions dont la période est entièrement plus ancienne que
+        ``max_age`` sont supprimées, puis les segments les plus anciens tant que
+        la taille totale dépasse ``max_bytes``. Le segment le plus récent est
+        toujours conservé. Les segments non partitionnés n'ont pas d'âge connu et
+        ne sont concernés que par la limite de taille.
+
+        Args:
+            max_age (Optional[timedelta]): Âge maximal (défaut : ``self.max_age``).
+            max_bytes (Optional[int]): Taille totale maximale (défaut : ``self.max_bytes``).
+            now (Optional[datetime]): Instant de référence (défaut : maintenant).
+
+        Returns:
+            List[str]: Chemins des segments supprimés.
+        """
+        with self._lock:
+            return self._apply_retention(
+                max_age if max_age is not None else self.max_age,
+                max_bytes if max_bytes is not None else self.max_bytes,
+                now
+            )
+
+    def _apply_retention(self, max_age: Optional[timedelta], max_bytes: Optional[int],
+                         now: Optional[datetime]) -> List[str]:
+        """Implémente ``apply_retention`` (verrou acquis)."""
+        paths = self.segment_paths()
+        expired: List[str] = []
+        if max_age is not None:
+            limit = ((now or datetime.now()) - max_age).isoformat()
+            for path in paths[:-1]:
+                _, end = self._bucket_bounds(self._parse_name(os.path.basename(path))[0])
+                if end is not None and end <= limit:
+                    expired.append(path)
+        if max_bytes is not None:
+            kept = [path for path in paths if path not in expired]
+            sizes = {path: os.path.getsize(path) for path in kept}
+            total = sum(sizes.values())
+            for path in kept[:-1]:
+                if total <= max_bytes:
+                    break
+                expired.append(path)
+                total -= sizes[path]
+
+        removed = []
+        for path in expired:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue  # Déjà supprimé par un autre processus
+            removed.append(path)
+        with self._index_lock:
+            for path in removed:
+                # La partition sera relue à la demande si elle existe encore
+                self._partitions.pop(self._parse_name(os.path.basename(path))[0], None)
+        return removed
+
+    # --- Lecture ---
+
+    def iter_records(self, since: Optional[str] = None, until: Optional[str] = None
+                     ) -> Iterator[Dict[str, Any]]:
+        """Parcourt les journaux stockés, partition par partition, dans l'ordre d'ajout.
+
+        Seuls les segments des partitions qui recoupent [since, until] sont ouverts ;
+        les journaux ne sont pas filtrés individuellement. Les lignes illisibles
+        (par exemple une ligne tronquée par un arrêt brutal) sont ignorées.
+
+        Args:
+            since (Optional[str]): Horodatage ISO minimal.
+            until (Optional[str]): Horodatage ISO maximal.
+
+        Yields:
+            Dict[str, Any]: Journal sérialisé.
+        """
+        for bucket, paths in self._buckets().items():
+            if self._overlaps(bucket, since, until):
+                live: Dict[str, Dict[str, Any]] = {}
+                for path in paths:
+                    for record in self._read_segment(path):
+                        self._apply(live, record)
+                yield from live.values()
+
+    @staticmethod
+    def _apply(live: Dict[str, Dict[str, Any]], record: Dict[str, Any]) -> None:
+        """Applique une ligne de segment (journal ou opération) à un ensemble de journaux."""
+        op = record.get("op")
+        if op is None:
+            live[str(record.get("id"))] = record
+        elif op == "update" and record.get("id") in live:
+            live[record["id"]].update(record.get("fields") or {})
+        elif op == "delete":
+            live.pop(record.get("id"), None)
+
+    def _overlaps(self, bucket: str, since: Optional[str], until: Optional[str]) -> bool:
+        """Indique si une partition recoupe la période [since, until]."""
+        start, end = self._bucket_bounds(bucket)
+        if start is None:
+            return True
+        return (since is None or end > since) and (until is None or start <= until)
+
+    @staticmethod
+    def _read_segment(path: str) -> Iterator[Dict[str, Any]]:
+        """Lit les journaux d'un segment en ignorant les lignes corrompues."""
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def _load(self, bucket: str, paths: List[str]) -> _Partition:
+        """Charge ou complète l'index d'une partition.
+
+        Le curseur associe à chaque segment son inode et le nombre d'octets déjà
+        lus ; seules les lignes complètes au-delà de cette position sont lues.
+        Si un segment connu a été réécrit ou supprimé, la partition est relue.
+        Doit être appelée avec ``_index_lock`` acquis.
+
+        Args:
+            bucket (str): Partition à charger.
+            paths (List[str]): Segments actuels de la partition.
+
+        Returns:
+            _Partition: Partition à jour.
+        """
+        part = self._partitions.get(bucket)
+        if part is None:
+            part = self._partitions[bucket] = _Partition()
+        stats = {}
+        for path in paths:
+            try:
+                stats[path] = os.stat(path)
+            except FileNotFoundError:
+                continue  # Supprimé entre-temps par la rétention
+        if any(
+            path not in stats
+            or stats[path].st_ino != inode
+            or stats[path].st_size < offset
+            for path, (inode, offset) in part.cursor.items()
+        ):
+            part.index.clear()
+            part.cursor = {}
+        for path, stat in stats.items():
+            inode, offset = part.cursor.get(path, (stat.st_ino, 0))
+            if stat.st_size == offset:
+                continue
+            with open(path, "rb") as f:
+                f.seek(offset)
+                chunk = f.read(stat.st_size - offset)
+            # Ne consommer que les lignes complètes (une écriture peut être en cours)
+            end = chunk.rfind(b"\n") + 1
+            for line in chunk[:end].splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                op = record.get("op")
+                if op is None:
+                    part.index.add(record)
+                    self._locations[str(record.get("id"))] = bucket
+                elif op == "update":
+                    part.index.update(record.get("id"), record.get("fields") or {})
+                    self._dirty.add(bucket)
+                elif op == "delete":
+                    part.index.remove(record.get("id"))
+                    self._locations.pop(record.get("id"), None)
+                    self._dirty.add(bucket)
+            part.cursor[path] = (inode, offset + end)
+        return part
+
+    def _current_buckets(self) -> Dict[str, List[str]]:
+        """Liste les partitions et oublie celles qui ont disparu.
+
+        Doit être appelée avec ``_index_lock`` acquis.
+        """
+        buckets = self._buckets()
+        gone = [bucket for bucket in self._partitions if bucket not in buckets]
+        for bucket in gone:
+            del self._partitions[bucket]
+        if gone:
+            self._locations = {
+                log_id: bucket for log_id, bucket in self._locations.items() if bucket in buckets
+            }
+        return buckets
+
+    def _locate(self, log_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Retrouve la partition d'un journal existant.
+
+        L'index ID -> partition désigne directement la partition à relire ; à
+        défaut (journal écrit par un autre processus dans une partition non
+        chargée), les partitions sont chargées de la plus récente à la plus
+        ancienne. Doit être appelée avec ``_index_lock`` acquis.
+
+        Returns:
+            Optional[Tuple[str, Dict[str, Any]]]: La partition et le journal, ou
+            None si le journal n'existe pas.
+        """
+        buckets = self._current_buckets()
+        bucket = self._locations.get(log_id)
+        candidates = [bucket] if bucket in buckets else []
+        candidates += [other for other in reversed(list(buckets)) if other != bucket]
+        for bucket in candidates:
+            record = self._load(bucket, buckets[bucket]).index.get(log_id)
+            if record is not None:
+                return bucket, record
+        return None
+
+    def get(self, log_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne un journal à partir de son ID, via l'index ID -> partition."""
+        with self._index_lock:
+            located = self._locate(str(log_id))
+        return located[1] if located else None
+
+    def query(self, level: Optional[str] = None, module: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None,
+              before: Optional[Tuple[str, int]] = None,
+              after: Optional[Tuple[str, int]] = None,
+              limit: Optional[int] = None,
+              terms: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Recherche des journaux partition par partition (voir ``LogStore.query``).
+
+        Seules les partitions qui recoupent la période demandée (bornes et curseur
+        compris) sont chargées, dans l'ordre de lecture ; le parcours s'arrête dès
+        que ``limit`` journaux ont été trouvés.
+        """
+        lower = max(since, after[0]) if since and after else (since or (after[0] if after else None))
+        upper = min(until, before[0]) if until and before else (until or (before[0] if before else None))
+        results: List[Dict[str, Any]] = []
+        with self._index_lock:
+            buckets = self._current_buckets()
+            selected = [bucket for bucket in buckets if self._overlaps(bucket, lower, upper)]
+            for bucket in (selected if after else reversed(selected)):
+                index = self._load(bucket, buckets[bucket]).index
+                for record in index.query(level=level, module=module, since=since, until=until,
+                                          before=before, after=after, terms=terms):
+                    results.append(record)
+                    if limit is not None and len(results) >= limit:
+                        return results
+        return results
+
+    def read_after_id(self, last_id: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Lit les journaux de toutes les partitions par ID croissant (voir ``LogStore.read_after_id``).
+
+        Un lot réparti sur plusieurs partitions y est écrit partition par
+        partition : la lecture se fait donc sous le verrou d'écriture, pour ne
+        jamais voir un ID avant un ID inférieur encore en cours d'écriture. Rien
+        n'est chargé tant que le fichier ``sequence`` ne dépasse pas ``last_id``.
+        """
+        results: List[Dict[str, Any]] = []
+        with self._lock:
+            if self._read_sequence() <= last_id:
+                return results
+            with self._index_lock:
+                buckets = self._current_buckets()
+                for bucket, paths in buckets.items():
+                    results.extend(islice(self._load(bucket, paths).index.after_id(last_id), limit))
+        results.sort(key=lambda record: int(record["id"]))
+        return results[:limit]
+
+    def stored_sources(self, node: str, records: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Recherche les journaux d'agent dans leurs partitions (voir ``LogStore.stored_sources``).
+
+        Un journal renvoyé garde son horodatage : seules les partitions des
+        horodatages de ``records`` sont chargées.
+        """
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            grouped.setdefault(self._bucket(record.get("timestamp")), []).append(record)
+        found: Dict[str, str] = {}
+        with self._index_lock:
+            buckets = self._current_buckets()
+            for bucket, bucket_records in grouped.items():
+                if bucket not in buckets:
+                    continue
+                index = self._load(bucket, buckets[bucket]).index
+                for record in bucket_records:
+                    log_id = index.source_log_id(node, record.get("source_id"))
+                    if log_id is not None:
+                        found[str(record.get("source_id"))] = log_id
+        return found
+
+    def stats(self, bucket_seconds: int, since: Optional[str] = None, until: Optional[str] = None,
+              level: Optional[str] = None, module: Optional[str] = None) -> Dict[str, Any]:
+        """Calcule l'histogramme à partir des compteurs des partitions concernées (voir ``LogStore.stats``)."""
+        precision = granularity(bucket_seconds)
+        rows = []
+        with self._index_lock:
+            buckets = self._current_buckets()
+            for bucket in buckets:
+                if self._overlaps(bucket, since, until):
+                    rollups = self._load(bucket, buckets[bucket]).index.rollups
+                    rows.extend(rollups.rows(precision, since=since, until=until, level=level, module=module))
+        return build_stats(rows, bucket_seconds)
+
+    # --- Modification ---
+
+    def _mutate(self, log_id: str, operation: Dict[str, Any]) -> bool:
+        """Ajoute une ligne d'opération dans la partition du journal visé.
+
+        Args:
+            log_id (str): ID du journal visé.
+            operation (Dict[str, Any]): Ligne d'opération à ajouter.
+
+        Returns:
+            bool: True si le journal existe.
+        """
+        with self._lock:
+            with self._index_lock:
+                located = self._locate(str(log_id))
+                if located is None:
+                    return False
+                bucket = located[0]
+                path, _ = self._active_segment(bucket, self._buckets().get(bucket, []))
+                self._write(path, [operation], fsync=False)
+                self._dirty.add(bucket)
+        self._start_compactor()
+        return True
+
+    def update(self, log_id: str, fields: Dict[str, Any]) -> bool:
+        """Met à jour les champs d'un journal en ajoutant une ligne d'opération.
+
+        Args:
+            log_id (str): ID du journal à modifier.
+            fields (Dict[str, Any]): Champs à remplacer.
+
+        Returns:
+            bool: True si le journal a été trouvé et modifié.
+        """
+        return self._mutate(log_id, {"op": "update", "id": str(log_id), "fields": fields})
+
+    def delete(self, log_id: str) -> bool:
+        """Supprime un journal en ajoutant une tombstone.
+
+        Args:
+            log_id (str): ID du journal à supprimer.
+
+        Returns:
+            bool: True si le journal a été trouvé et supprimé.
+        """
+        return self._mutate(log_id, {"op": "delete", "id": str(log_id)})
+
+    # --- Compaction ---
+
+    def _start_compactor(self) -> None:
+        """Démarre le thread de compaction s'il est configuré et pas encore lancé."""
+        if self.compact_interval is None or self._compactor is not None:
+            return
+        self._compactor = threading.Thread(target=self._run_compactor, name="segment-compactor", daemon=True)
+        self._compactor.start()
+
+    def _run_compactor(self) -> None:
+        """Boucle du compacteur : fusionne périodiquement les opérations en attente."""
+        while not self._stop.wait(self.compact_interval):
+            try:
+                self.compact()
+            except OSError:
+                continue  # Nouvelle tentative à la période suivante
+
+    def compact(self) -> int:
+        """Fusionne les lignes d'opération dans les segments de leurs partitions.
+
+        Chaque segment concerné est réécrit de manière atomique, sans ses lignes
+        d'opération et avec les journaux mis à jour ou supprimés. Un segment
+        modifié entre-temps par un autre processus est laissé tel quel et sera
+        compacté plus tard.
+
+        Returns:
+            int: Nombre de lignes d'opération fusionnées.
+        """
+        with self._lock:
+            with self._index_lock:
+                buckets = self._current_buckets()
+                dirty, self._dirty = self._dirty, set()
+                merged = 0
+                for bucket in sorted(dirty):
+                    if bucket in buckets:
+                        merged += self._compact_partition(bucket, buckets[bucket])
+                return merged
+
+    def _compact_partition(self, bucket: str, paths: List[str]) -> int:
+        """Compacte une partition (verrou d'écriture et ``_index_lock`` acquis).
+
+        Returns:
+            int: Nombre de lignes d'opération fusionnées.
+        """
+        segments = []
+        for path in paths:
+            # Les écrivains attendent le verrou : une ligne tronquée ne peut venir
+            # que d'un arrêt brutal et est abandonnée
+            stat = os.stat(path)
+            segments.append((path, (stat.st_ino, stat.st_size, stat.st_mtime_ns),
+                             list(self._read_segment(path))))
+
+        live: Dict[str, Dict[str, Any]] = {}
+        operations, effective, deleted = 0, 0, []
+        for _, _, records in segments:
+            for record in records:
+                if "op" in record:
+                    operations += 1
+                    effective += record.get("id") in live
+                    if record["op"] == "delete" and str(record.get("id", "")).isdigit():
+                        deleted.append(int(record["id"]))
+                self._apply(live, record)
+        if effective == 0 and operations <= 1:
+            return 0  # Rien à fusionner (au plus une tombstone conservée)
+
+        # Conserver la tombstone du plus grand ID supprimé s'il dépasse les IDs
+        # restants : la fin des segments sert à reprendre la numérotation
+        survivors = [int(log_id) for log_id in live if log_id.isdigit()]
+        keep = max(deleted) if deleted and max(deleted) > max(survivors, default=0) else None
+
+        kept_ids = {id(record) for record in live.values()}
+        for position, (path, signature, records) in enumerate(segments):
+            kept = [record for record in records if "op" not in record and id(record) in kept_ids]
+            if position == len(segments) - 1 and keep is not None:
+                kept.append({"op": "delete", "id": str(keep)})
+            stat = os.stat(path)
+            if (stat.st_ino, stat.st_size, stat.st_mtime_ns) != signature:
+                self._dirty.add(bucket)
+                break  # Modifié entre-temps : réessayer plus tard
+            if kept or position == len(segments) - 1:
+                self._rewrite_segment(path, kept)
+            else:
+                os.remove(path)
+        self._partitions.pop(bucket, None)
+        return operations
+
+    def _rewrite_segment(self, path: str, records: List[Dict[str, Any]]) -> None:
+        """Réécrit un segment de manière atomique (fichier temporaire puis renommage)."""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        os.replace(tmp_path, path)
+
+    def clear(self) -> None:
+        """Supprime tous les segments (la numérotation des IDs continue)."""
+        with self._lock:
+            for path in self.segment_paths():
+                os.remove(path)
+            with self._index_lock:
+                self._partitions.clear()
+                self._locations.clear()
+                self._dirty.clear()
+
+    def close(self) -> None:
+        """Arrête le compacteur et libère le verrou."""
+        self._stop.set()
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+        self._lock.close()
@@ -0,0 +1,378 @@
+import json
+import sqlite3
+import threading
+
+from manager.log_store import LogStore
+from manager.log_index import log_terms
+from manager.log_rollups import MINUTE, HOUR, build_stats, granularity
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    level TEXT NOT NULL,
+    module TEXT NOT NULL,
+    message TEXT NOT NULL,
+    context TEXT NOT NULL,
+    node TEXT,
+    source_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_logs_level_timestamp ON logs (level, timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_logs_module_timestamp ON logs (module, timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs (timestamp, id);
+CREATE TABLE IF NOT EXISTS log_terms (
+    term TEXT NOT NULL,
+    log_id INTEGER NOT NULL,
+    PRIMARY KEY (term, log_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS log_rollups (
+    precision INTEGER NOT NULL,
+    bucket TEXT NOT NULL,
+    level TEXT NOT NULL,
+    module TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (precision, bucket, level, module)
+) WITHOUT ROWID;
+"""
+
+# Version du schéma (PRAGMA user_version) : 1 = table log_terms remplie,
+# 2 = table log_rollups remplie, 3 = colonnes node et source_id,
+# 4 = index unique (node, source_id), 5 = terme réservé de la machine d'origine
+_SCHEMA_VERSION = 5
+
+# Compteurs par minute et par heure : longueur du préfixe de l'horodatage
+_PRECISIONS = (MINUTE[0], HOUR[0])
+
+_COLUMNS = "id, timestamp, level, message, module, context, node, source_id"
+
+
+class SqliteStore(LogStore):
+    """Stocke les journaux dans une base SQLite locale.
+
+    La base est ouverte en mode WAL : plusieurs processus (workers du serveur,
+    tâches de prétraitement) peuvent y écrire simultanément sans corrompre le
+    fichier, pendant que les lecteurs continuent de lire. Les IDs sont attribués
+    par ``AUTOINCREMENT`` et ne sont jamais réutilisés. Les recherches par niveau,
+    module, période et ID s'appuient sur des index et des requêtes paramétrées.
+    La recherche plein texte utilise la table ``log_terms`` (terme, ID), index
+    inversé tenu à jour dans la transaction de chaque écriture ; les statistiques
+    utilisent de même les compteurs par minute et par heure de ``log_rollups``.
+    Un index unique sur (node, source_id) garantit qu'un journal d'agent n'est
+    enregistré qu'une fois, même reçu par deux processus à la fois.
+
+    Chaque thread utilise sa propre connexion.
+
+    Attributes:
+        db_path (str): Chemin du fichier de base de données.
+    """
+
+    def __init__(self, db_path: str, timeout: float = 30.0) -> None:
+        """Ouvre (ou crée) la base de données.
+
+        Args:
+            db_path (str): Chemin du fichier SQLite.
+            timeout (float): Attente maximale (secondes) d'un verrou tenu par un
+                autre processus.
+
+        Raises:
+            sqlite3.Error: Si la base ne peut pas être ouverte.
+        """
+        self.db_path = db_path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """Remplit les tables d'index d'une base créée avant leur introduction."""
+        conn = self._connection()
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Relire la version : un autre processus a pu migrer entre-temps
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 3:
+                # Avant les autres étapes, qui relisent toutes les colonnes
+                existing = {row[1] for row in conn.execute("PRAGMA table_info(logs)")}
+                for column in ("node", "source_id"):
+                    if column not in existing:
+                        conn.execute(f"ALTER TABLE logs ADD COLUMN {column} TEXT")
+            if version < 4:
+                # Les journaux locaux (node NULL) ne sont pas concernés : NULL est toujours distinct
+                conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_logs_node_source ON logs (node, source_id)")
+            if 1 <= version < 5:
+                # Journaux d'agent indexés sous "node=<machine>" : recalculer leurs termes
+                for row in conn.execute(f"SELECT {_COLUMNS} FROM logs WHERE node IS NOT NULL").fetchall():
+                    conn.execute("DELETE FROM log_terms WHERE log_id = ?", (row[0],))
+                    self._index_terms(conn, self._to_record(row))
+            if version < 1:
+                for row in conn.execute(f"SELECT {_COLUMNS} FROM logs").fetchall():
+                    self._index_terms(conn, self._to_record(row))
+            if version < 2:
+                conn.execute("DELETE FROM log_rollups")
+                for precision in _PRECISIONS:
+                    conn.execute(
+                        "INSERT INTO log_rollups (precision, bucket, level, module, count) "
+                        "SELECT ?, substr(timestamp, 1, ?), level, module, COUNT(*) FROM logs "
+                        "WHERE length(timestamp) >= ? GROUP BY 2, 3, 4",
+                        (precision, precision, MINUTE[0])
+                    )
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def _connection(self) -> sqlite3.Connection:
+        """Retourne la connexion du thread courant (créée à la première utilisation)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _to_record(row: Tuple) -> Dict[str, Any]:
+        """Convertit une ligne SQL en journal sérialisé."""
+        record = {
+            "id": str(row[0]),
+            "timestamp": row[1],
+            "level": row[2],
+            "message": row[3],
+            "module": row[4],
+            "context": json.loads(row[5])
+        }
+        if row[6] is not None:
+            record["node"], record["source_id"] = row[6], row[7]
+        return record
+
+    @staticmethod
+    def _index_terms(conn: sqlite3.Connection, record: Dict[str, Any],
+                     terms: Optional[Set[str]] = None) -> None:
+        """Ajoute les termes de recherche d'un journal à ``log_terms``."""
+        conn.executemany(
+            "INSERT OR IGNORE INTO log_terms (term, log_id) VALUES (?, ?)",
+            [(term, int(record["id"])) for term in (terms if terms is not None else log_terms(record))]
+        )
+
+    @staticmethod
+    def _unindex_terms(conn: sqlite3.Connection, record: Dict[str, Any],
+                       terms: Optional[Set[str]] = None) -> None:
+        """Retire les termes de recherche d'un journal de ``log_terms``."""
+        conn.executemany(
+            "DELETE FROM log_terms WHERE term = ? AND log_id = ?",
+            [(term, int(record["id"])) for term in (terms if terms is not None else log_terms(record))]
+        )
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection, record: Dict[str, Any], count: int) -> None:
+        """Applique une variation aux compteurs de ``log_rollups`` d'un journal."""
+        timestamp = record.get("timestamp") or ""
+        if len(timestamp) < MINUTE[0]:
+            return
+        conn.executemany(
+            "INSERT INTO log_rollups (precision, bucket, level, module, count) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (precision, bucket, level, module) DO UPDATE SET count = count + excluded.count",
+            [(precision, timestamp[:precision], record.get("level"), record.get("module"), count)
+             for precision in _PRECISIONS]
+        )
+
+    def append(self, records: List[Dict[str, Any]], fsync: bool = False) -> None:
+        """Ajoute des journaux dans une seule transaction.
+
+        Raises:
+            ValueError: Si un ID fourni n'est pas numérique.
+            sqlite3.Error: Si l'écriture échoue.
+        """
+        if not records:
+            return
+        conn = self._connection()
+        if fsync:
+            conn.execute("PRAGMA synchronous=FULL")
+        try:
+            with conn:
+                for record in records:
+                    log_id = record.get("id")
+                    if log_id is not None and not str(log_id).isdigit():
+                        raise ValueError(f"ID de journal non numérique : {log_id}")
+                    cursor = conn.execute(
+                        f"INSERT INTO logs ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            int(log_id) if log_id is not None else None,
+                            record.get("timestamp"),
+                            record.get("level"),
+                            record.get("message"),
+                            record.get("module"),
+                            json.dumps(record.get("context") or {}, ensure_ascii=False),
+                            record.get("node"),
+                            record.get("source_id")
+                        )
+                    )
+                    record["id"] = str(cursor.lastrowid)
+                    self._index_terms(conn, record)
+                    self._count(conn, record, 1)
+        finally:
+            if fsync:
+                conn.execute("PRAGMA synchronous=NORMAL")
+
+    def get(self, log_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne un journal par sa clé primaire."""
+        if not str(log_id).isdigit():
+            return None
+        row = self._connection().execute(
+            f"SELECT {_COLUMNS} FROM logs WHERE id = ?", (int(log_id),)
+        ).fetchone()
+        return self._to_record(row) if row else None
+
+    def update(self, log_id: str, fields: Dict[str, Any]) -> bool:
+        """Met à jour le message et/ou le contexte d'un journal."""
+        if not str(log_id).isdigit():
+            return False
+        assignments, params = [], []
+        if "message" in fields:
+            assignments.append("message = ?")
+            params.append(fields["message"])
+        if "context" in fields:
+            assignments.append("context = ?")
+            params.append(json.dumps(fields["context"], ensure_ascii=False))
+        conn = self._connection()
+        with conn:
+            row = conn.execute(f"SELECT {_COLUMNS} FROM logs WHERE id = ?", (int(log_id),)).fetchone()
+            if row is None:
+                return False
+            if not assignments:
+                return True
+            conn.execute(f"UPDATE logs SET {', '.join(assignments)} WHERE id = ?", (*params, int(log_id)))
+            # Ne réindexer que les termes qui changent
+            record = self._to_record(row)
+            old_terms = log_terms(record)
+            record.update(fields)
+            new_terms = log_terms(record)
+            self._unindex_terms(conn, record, old_terms - new_terms)
+            self._index_terms(conn, record, new_terms - old_terms)
+        return True
+
+    def delete(self, log_id: str) -> bool:
+        """Supprime un journal par sa clé primaire."""
+        if not str(log_id).isdigit():
+            return False
+        conn = self._connection()
+        with conn:
+            row = conn.execute(f"SELECT {_COLUMNS} FROM logs WHERE id = ?", (int(log_id),)).fetchone()
+            if row is None:
+                return False
+            conn.execute("DELETE FROM logs WHERE id = ?", (int(log_id),))
+            record = self._to_record(row)
+            self._unindex_terms(conn, record)
+            self._count(conn, record, -1)
+        return True
+
+    def clear(self) -> None:
+        """Supprime tous les journaux (les IDs ne sont pas réutilisés)."""
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM logs")
+            conn.execute("DELETE FROM log_terms")
+            conn.execute("DELETE FROM log_rollups")
+
+    def query(self, level: Optional[str] = None, module: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None,
+              before: Optional[Tuple[str, int]] = None,
+              after: Optional[Tuple[str, int]] = None,
+              limit: Optional[int] = None,
+              terms: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Recherche des journaux par une requête SQL indexée (voir ``LogStore.query``)."""
+        clauses, params = [], []
+        if level:
+            clauses.append("level = ?")
+            params.append(level.upper())
+        if module:
+            clauses.append("module = ?")
+            params.append(module)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("timestamp <= ?")
+            params.append(until)
+        if before:
+            clauses.append("(timestamp, id) < (?, ?)")
+            params.extend(before)
+        if after:
+            clauses.append("(timestamp, id) > (?, ?)")
+            params.extend(after)
+        for term in terms or []:
+            clauses.append("id IN (SELECT log_id FROM log_terms WHERE term = ?)")
+            params.append(term)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "ASC" if after else "DESC"
+        params.append(limit if limit is not None else -1)
+        rows = self._connection().execute(
+            f"SELECT {_COLUMNS} FROM logs {where} "
+            f"ORDER BY timestamp {order}, id {order} LIMIT ?",
+            params
+        ).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def read_after_id(self, last_id: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Lit les journaux par ID croissant, sur la clé primaire (voir ``LogStore.read_after_id``)."""
+        rows = self._connection().execute(
+            f"SELECT {_COLUMNS} FROM logs WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, limit if limit is not None else -1)
+        ).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def stored_sources(self, node: str, records: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Recherche les journaux d'agent par l'index (node, source_id) (voir ``LogStore.stored_sources``)."""
+        source_ids = [str(record.get("source_id")) for record in records]
+        found: Dict[str, str] = {}
+        conn = self._connection()
+        # Par paquets, sous la limite de paramètres d'une requête SQLite
+        for start in range(0, len(source_ids), 500):
+            chunk = source_ids[start:start + 500]
+            rows = conn.execute(
+                f"SELECT source_id, id FROM logs WHERE node = ? AND source_id IN ({', '.join('?' * len(chunk))})",
+                [node] + chunk
+            ).fetchall()
+            found.update((row[0], str(row[1])) for row in rows)
+        return found
+
+    def stats(self, bucket_seconds: int, since: Optional[str] = None, until: Optional[str] = None,
+              level: Optional[str] = None, module: Optional[str] = None) -> Dict[str, Any]:
+        """Calcule l'histogramme à partir de la table ``log_rollups`` (voir ``LogStore.stats``)."""
+        precision = granularity(bucket_seconds)[0]
+        clauses, params = ["precision = ?", "count > 0"], [precision]
+        if since:
+            clauses.append("bucket >= ?")
+            params.append(since[:precision])
+        if until:
+            clauses.append("bucket <= ?")
+            params.append(until[:precision])
+        if level:
+            clauses.append("level = ?")
+            params.append(level.upper())
+        if module:
+            clauses.append("module = ?")
+            params.append(module)
+        rows = self._connection().execute(
+            f"SELECT bucket, level, module, count FROM log_rollups WHERE {' AND '.join(clauses)}",
+            params
+        ).fetchall()
+        return build_stats(rows, bucket_seconds)
+
+    def close(self) -> None:
+        """Ferme toutes les connexions ouvertes."""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
@@ -1,3 +1,4 @@
+import copy
 import json
 
 
@@ -23,6 +24,13 @@ class Log:
     incluent automatiquement un horodatage et peuvent être convertis
     en dictionnaire ou en chaîne de caractères.
 
+    Les attributs sont déclarés dans ``__slots__`` (pas de ``__dict__`` par
+    instance). Un journal relu du stockage par ``from_stored`` conserve son
+    horodatage ISO tel quel : il n'est converti en ``datetime`` qu'au premier
+    accès à ``timestamp``, et ``to_dict`` le restitue sans conversion. Son
+    contexte est de même copié au premier accès à ``context`` : le modifier
+    n'altère jamais le journal conservé par le stockage.
+
     Attributes:
         id (Optional[str]): Identifiant unique du journal (optionnel).
         timestamp (str): Horodatage au format ISO 8601.
@@ -30,8 +38,14 @@ class Log:
         message (str): Message descriptif du journal.
         module (str): Nom du module ou composant qui a généré le journal.
         context (Dict[str, Any]): Informations supplémentaires au format dictionnaire.
+        node (Optional[str]): Machine d'origine d'un journal reçu d'un agent (voir
+            ``LogShipper``), None pour un journal local.
+        source_id (Optional[str]): ID du journal dans le stockage de sa machine d'origine.
     """
 
+    __slots__ = ("id", "level", "message", "module", "node", "source_id", "_context", "_stored_context",
+                 "_timestamp", "_isoformat")
+
     def __init__(
         self,
         level: str,
@@ -39,7 +53,9 @@ class Log:
         module: str,
         context: Optional[Dict[str, Any]] = None,
         timestamp: Optional[datetime] = None,
-        id: Optional[str] = None
+        id: Optional[str] = None,
+        node: Optional[str] = None,
+        source_id: Optional[str] = None
     ) -> None:
         """Initialise une nouvelle entrée de journal.
 
@@ -50,6 +66,8 @@ class Log:
             context (Optional[Dict[str, Any]]): Données supplémentaires (par défaut {}).
             timestamp (Optional[datetime]): Horodatage (par défaut maintenant en UTC).
             id (Optional[str]): Identifiant unique (par défaut None).
+            node (Optional[str]): Machine d'origine (par défaut None : journal local).
+            source_id (Optional[str]): ID sur la machine d'origine (par défaut None).
 
         Raises:
             ValueError: Si le niveau de journalisation n'est pas valide.
@@ -60,6 +78,33 @@ class Log:
         self.message = message
         self.module = module
         self.context = context or {}
+        self.node = node
+        self.source_id = source_id
+
+    @property
+    def context(self) -> Dict[str, Any]:
+        """Dict[str, Any]: Contexte du journal (copié au premier accès s'il provient du stockage)."""
+        if self._context is None:
+            self._context = copy.deepcopy(self._stored_context) if self._stored_context else {}
+            self._stored_context = None
+        return self._context
+
+    @context.setter
+    def context(self, value: Dict[str, Any]) -> None:
+        self._context = value
+        self._stored_context = None
+
+    @property
+    def timestamp(self) -> datetime:
+        """datetime: Horodatage du journal (décodé au premier accès s'il provient du stockage)."""
+        if self._timestamp is None:
+            self._timestamp = datetime.fromisoformat(self._isoformat)
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, value: datetime) -> None:
+        self._timestamp = value
+        self._isoformat = None
 
     @staticmethod
     def _validate_level(level: str) -> str:
@@ -85,17 +130,24 @@ class Log:
     def to_dict(self) -> Dict[str, Any]:
         """Convertit le journal en dictionnaire.
 
+        Les clés ``node`` et ``source_id`` ne sont présentes que pour un journal
+        reçu d'un agent.
+
         Returns:
             Dict[str, Any]: Représentation du journal sous forme de dictionnaire.
         """
-        return {
+        data = {
             "id": self.id,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": self._isoformat if self._isoformat is not None else self._timestamp.isoformat(),
             "level": self.level,
             "message": self.message,
             "module": self.module,
             "context": self.context
         }
+        if self.node is not None:
+            data["node"] = self.node
+            data["source_id"] = self.source_id
+        return data
 
     def to_json(self) -> str:
         """Convertit le journal en chaîne JSON.
@@ -151,5 +203,35 @@ class Log:
             module=data.get("module", "unknown"),
             context=data.get("context", {}),
             timestamp=timestamp,
-            id=data.get("id")
+            id=data.get("id"),
+            node=data.get("node"),
+            source_id=data.get("source_id")
         )
+
+    @classmethod
+    def from_stored(cls, data: Dict[str, Any]) -> 'Log':
+        """Recrée un journal relu du stockage, sans le revalider.
+
+        Les journaux stockés ayant été validés à leur création, le niveau n'est
+        pas revérifié et l'horodatage n'est décodé qu'au premier accès.
+
+        Args:
+            data (Dict[str, Any]): Journal sérialisé par ``to_dict``.
+
+        Returns:
+            Log: Nouvelle instance de Log.
+        """
+        log = cls.__new__(cls)
+        log.id = data.get("id")
+        log.level = data.get("level", "INFO")
+        log.message = data.get("message", "")
+        log.module = data.get("module", "unknown")
+        log._context, log._stored_context = None, data.get("context")
+        log.node = data.get("node")
+        log.source_id = data.get("source_id")
+        timestamp = data.get("timestamp")
+        if timestamp:
+            log._timestamp, log._isoformat = None, timestamp
+        else:
+            log.timestamp = datetime.now()
+        return log
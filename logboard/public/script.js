@@ -25,12 +25,32 @@ const performanceData = {
   ram: [],
   gpu: [],
   gpuMemory: [],
+  // Disk and network throughput (MB/s) and disk operations per second
+  diskRead: [],
+  diskWrite: [],
+  netRx: [],
+  netTx: [],
+  diskIops: [],
   timestamps: [],
 };
+
+// Bytes per megabyte, for throughput charts
+const BYTES_PER_MB = 1024 * 1024;
 let currentTheme = localStorage.getItem("theme") || "light";
 let logsData = [];
 let filteredLogs = [];
 let currentLogLevel = "";
+let currentLogSearch = "";
+let nextLogsCursor = null;
+// Cursor of the newest log received (live tail resumes from it on reconnect)
+let liveLogsCursor = null;
+let statsUpdateTimer = null;
+// Latest value of every performance metric (frames only carry what changed)
+let currentPerformance = {};
+let isLoadingMoreLogs = false;
+
+// Number of logs requested per page (older pages are loaded on scroll)
+const LOGS_PAGE_SIZE = 200;
 
 // Chart configuration constants
 const CHART_CONFIG = {
@@ -64,6 +84,7 @@ document.addEventListener("DOMContentLoaded", () => {
   initializeTheme();
   initializeWebSocket();
   initializeCharts();
+  loadPerformanceHistory();
   initializeEventListeners();
   loadInitialLogs();
   showLoadingOverlay(false);
@@ -135,6 +156,7 @@ function initializeWebSocket() {
     socket.on("connect", handleSocketConnect);
     socket.on("disconnect", handleSocketDisconnect);
     socket.on("performance", handlePerformanceData);
+    socket.on("logs", handleLiveLogs);
     socket.on("connect_error", handleSocketError);
   } catch (error) {
     console.error("Failed to initialize WebSocket:", error);
@@ -149,6 +171,8 @@ function handleSocketConnect() {
   console.log("Connected to WebSocket server");
   updateConnectionStatus(true);
   showRefreshIndicator();
+  subscribeToLogs();
+  subscribeToPerformance();
 }
 
 /**
@@ -187,17 +211,46 @@ function updateConnectionStatus(isConnected) {
 
 // ===== PERFORMANCE DATA HANDLING =====
 /**
- * Handle incoming performance data from WebSocket
- * @param {Object} data - Performance data object
+ * Subscribe to performance frames at the chart refresh rate
+ * (paused while the page is hidden, so the server has nothing to send)
+ */
+function subscribeToPerformance() {
+  if (!socket || !socket.connected) return;
+  if (document.hidden) {
+    socket.emit("unsubscribe_performance");
+    return;
+  }
+  currentPerformance = {};
+  socket.emit(
+    "subscribe_performance",
+    { interval: CHART_CONFIG.updateInterval / 1000 },
+    (ack) => {
+      if (ack && ack.error) {
+        console.error("Performance subscription failed:", ack.error);
+      }
+    }
+  );
+}
+
+/**
+ * Handle incoming performance frames from WebSocket
+ * @param {Object} frame - Samples holding only the metrics that changed
  */
-function handlePerformanceData(data) {
+function handlePerformanceData(frame) {
   try {
-    // Update performance data arrays
-    updatePerformanceArrays(data);
+    // Update performance data arrays (one point per sample)
+    for (const sample of frame.samples || []) {
+      Object.assign(currentPerformance, sample.values);
+      updatePerformanceArrays(currentPerformance, sample.timestamp);
+    }
+    const data = currentPerformance;
 
     // Update metric cards
     updateMetricCards(data);
 
+    // Update per-process table
+    updateProcessesTable(data.processes || []);
+
     // Update charts
     updatePerformanceCharts();
 
@@ -208,27 +261,94 @@ function handlePerformanceData(data) {
   }
 }
 
+/**
+ * Fill the charts with the recent history kept by the server (survives reloads)
+ */
+function loadPerformanceHistory() {
+  const params = new URLSearchParams({
+    range: "5m",
+    points: CHART_CONFIG.maxDataPoints,
+    metrics: [
+      "cpu_percent",
+      "ram_percent",
+      "gpu_percent",
+      "gpu_memory_percent",
+      "disk_read_bytes_per_s",
+      "disk_write_bytes_per_s",
+      "net_rx_bytes_per_s",
+      "net_tx_bytes_per_s",
+      "disk_read_iops",
+      "disk_write_iops",
+    ].join(","),
+  });
+  return fetch("/performance/history?" + params.toString())
+    .then((response) => {
+      if (!response.ok) {
+        throw new Error("HTTP error! status: " + response.status);
+      }
+      return response.json();
+    })
+    .then((history) => {
+      const series = history.metrics;
+      const cpu = series.cpu_percent || [];
+      // Live samples received meanwhile are more recent: keep them after the history
+      performanceData.timestamps = cpu
+        .map((point) => new Date(point[0] * 1000).toLocaleTimeString())
+        .concat(performanceData.timestamps);
+      performanceData.cpu = cpu.map((point) => point[1]).concat(performanceData.cpu);
+      performanceData.ram = (series.ram_percent || []).map((point) => point[1]).concat(performanceData.ram);
+      performanceData.gpu = (series.gpu_percent || []).map((point) => point[1]).concat(performanceData.gpu);
+      performanceData.gpuMemory = (series.gpu_memory_percent || [])
+        .map((point) => point[1])
+        .concat(performanceData.gpuMemory);
+      // Every series ends with the latest sample; pad the ones that started later (rates need two samples)
+      const values = (name, scale) => {
+        const points = (series[name] || []).map((point) => point[1] / scale);
+        return new Array(Math.max(0, cpu.length - points.length)).fill(0).concat(points);
+      };
+      performanceData.diskRead = values("disk_read_bytes_per_s", BYTES_PER_MB).concat(performanceData.diskRead);
+      performanceData.diskWrite = values("disk_write_bytes_per_s", BYTES_PER_MB).concat(performanceData.diskWrite);
+      performanceData.netRx = values("net_rx_bytes_per_s", BYTES_PER_MB).concat(performanceData.netRx);
+      performanceData.netTx = values("net_tx_bytes_per_s", BYTES_PER_MB).concat(performanceData.netTx);
+      const writeIops = values("disk_write_iops", 1);
+      performanceData.diskIops = values("disk_read_iops", 1)
+        .map((value, index) => value + (writeIops[index] || 0))
+        .concat(performanceData.diskIops);
+      for (const key of Object.keys(performanceData)) {
+        performanceData[key] = performanceData[key].slice(-CHART_CONFIG.maxDataPoints);
+      }
+      updatePerformanceCharts();
+    })
+    .catch((error) => {
+      console.error("Error loading performance history:", error);
+    });
+}
+
 /**
  * Update performance data arrays with new data point
  * @param {Object} data - Performance data object
+ * @param {number} sampledAt - Sample time in seconds since the epoch
  */
-function updatePerformanceArrays(data) {
-  const timestamp = new Date().toLocaleTimeString();
+function updatePerformanceArrays(data, sampledAt) {
+  const timestamp = new Date(sampledAt ? sampledAt * 1000 : Date.now()).toLocaleTimeString();
 
   // Add new data points
   performanceData.cpu.push(data.cpu_percent || 0);
   performanceData.ram.push(data.ram_percent || 0);
   performanceData.gpu.push(data.gpu_percent || 0);
   performanceData.gpuMemory.push(data.gpu_memory_percent || 0);
+  performanceData.diskRead.push((data.disk_read_bytes_per_s || 0) / BYTES_PER_MB);
+  performanceData.diskWrite.push((data.disk_write_bytes_per_s || 0) / BYTES_PER_MB);
+  performanceData.netRx.push((data.net_rx_bytes_per_s || 0) / BYTES_PER_MB);
+  performanceData.netTx.push((data.net_tx_bytes_per_s || 0) / BYTES_PER_MB);
+  performanceData.diskIops.push((data.disk_read_iops || 0) + (data.disk_write_iops || 0));
   performanceData.timestamps.push(timestamp);
 
   // Maintain maximum data points
   if (performanceData.cpu.length > CHART_CONFIG.maxDataPoints) {
-    performanceData.cpu.shift();
-    performanceData.ram.shift();
-    performanceData.gpu.shift();
-    performanceData.gpuMemory.shift();
-    performanceData.timestamps.shift();
+    for (const key of Object.keys(performanceData)) {
+      performanceData[key].shift();
+    }
   }
 }
 
@@ -250,6 +370,46 @@ function updateMetricCards(data) {
   updateMetricCard("gpu-memory", data.gpu_memory_percent);
 }
 
+/**
+ * Format a byte count for display
+ * @param {number|null} bytes - Byte count
+ * @returns {string} Human readable size
+ */
+function formatBytes(bytes) {
+  if (bytes === null || bytes === undefined) return "N/A";
+  const units = ["o", "Ko", "Mo", "Go", "To"];
+  let value = bytes;
+  let unit = 0;
+  while (value >= 1024 && unit < units.length - 1) {
+    value /= 1024;
+    unit++;
+  }
+  return value.toFixed(unit ? 1 : 0) + " " + units[unit];
+}
+
+/**
+ * Render per-process metrics (registered workers first, then top consumers)
+ * @param {Array} processes - Per-process metrics
+ */
+function updateProcessesTable(processes) {
+  const body = document.getElementById("processes-body");
+  if (!body) return;
+  body.innerHTML = processes
+    .map(
+      (process) => `
+      <tr class="${process.registered ? "registered" : ""}">
+        <td>${process.pid}</td>
+        <td>${escapeHtml(process.name || "")}</td>
+        <td>${process.cpu_percent === null ? "N/A" : process.cpu_percent.toFixed(1) + "%"}</td>
+        <td>${process.rss_mb === null ? "N/A" : process.rss_mb.toFixed(0) + " Mo"}</td>
+        <td>${formatBytes(process.read_bytes)}</td>
+        <td>${formatBytes(process.write_bytes)}</td>
+        <td>${process.threads === null ? "N/A" : process.threads}</td>
+      </tr>`
+    )
+    .join("");
+}
+
 /**
  * Update individual metric card
  * @param {string} metric - Metric name
@@ -302,6 +462,7 @@ function showRefreshIndicator() {
 function initializeCharts() {
   initializeMetricCharts();
   initializeOverviewChart();
+  initializeIoChart();
 }
 
 /**
@@ -329,6 +490,16 @@ function initializeOverviewChart() {
   }
 }
 
+/**
+ * Initialize disk and network throughput chart
+ */
+function initializeIoChart() {
+  const canvas = document.getElementById("io-chart");
+  if (canvas) {
+    charts.io = createIoChart(canvas);
+  }
+}
+
 /**
  * Create a mini chart for metric cards
  * @param {HTMLCanvasElement} canvas - Canvas element
@@ -475,6 +646,91 @@ function createOverviewChart(canvas) {
   });
 }
 
+/**
+ * Create disk and network throughput chart (MB/s, with disk IOPS on a second axis)
+ * @param {HTMLCanvasElement} canvas - Canvas element
+ * @returns {Chart} Chart.js instance
+ */
+function createIoChart(canvas) {
+  const colors = CHART_CONFIG.colors[currentTheme];
+  const dataset = (label, color, axis) => ({
+    label: label,
+    data: [],
+    borderColor: color,
+    backgroundColor: `${color}20`,
+    borderWidth: 2,
+    fill: false,
+    tension: 0.4,
+    yAxisID: axis,
+  });
+
+  return new Chart(canvas, {
+    type: "line",
+    data: {
+      labels: [],
+      datasets: [
+        dataset("Lecture disque (Mo/s)", colors.primary, "y"),
+        dataset("Écriture disque (Mo/s)", colors.error, "y"),
+        dataset("Réseau reçu (Mo/s)", colors.success, "y"),
+        dataset("Réseau émis (Mo/s)", colors.info, "y"),
+        dataset("Opérations disque (/s)", colors.warning, "y1"),
+      ],
+    },
+    options: {
+      responsive: true,
+      maintainAspectRatio: false,
+      plugins: {
+        legend: {
+          position: "top",
+          labels: {
+            usePointStyle: true,
+            padding: 20,
+          },
+        },
+      },
+      scales: {
+        x: {
+          display: true,
+          title: {
+            display: true,
+            text: "Temps",
+          },
+          ticks: {
+            maxRotation: 0,
+            autoSkip: true,
+            maxTicksLimit: 10
+          }
+        },
+        y: {
+          display: true,
+          min: 0,
+          title: {
+            display: true,
+            text: "Débit (Mo/s)",
+          },
+        },
+        y1: {
+          display: true,
+          min: 0,
+          position: "right",
+          grid: { drawOnChartArea: false },
+          title: {
+            display: true,
+            text: "Opérations (/s)",
+          },
+        },
+      },
+      interaction: {
+        intersect: false,
+        mode: "index",
+      },
+      animation: {
+        duration: 0 // Disable animations for better performance
+      }
+    },
+  });
+}
+
 /**
  * Update all performance charts with latest data
  */
@@ -487,6 +743,9 @@ function updatePerformanceCharts() {
 
   // Update overview chart
   updateOverviewChart();
+
+  // Update I/O chart
+  updateIoChart();
 }
 
 /**
@@ -518,6 +777,22 @@ function updateOverviewChart() {
   }
 }
 
+/**
+ * Update disk and network throughput chart
+ */
+function updateIoChart() {
+  const chart = charts.io;
+  if (chart) {
+    chart.data.labels = performanceData.timestamps;
+    chart.data.datasets[0].data = performanceData.diskRead;
+    chart.data.datasets[1].data = performanceData.diskWrite;
+    chart.data.datasets[2].data = performanceData.netRx;
+    chart.data.datasets[3].data = performanceData.netTx;
+    chart.data.datasets[4].data = performanceData.diskIops;
+    chart.update('none'); // Update without animation
+  }
+}
+
 /**
  * Update charts theme colors
  */
@@ -526,7 +801,7 @@ function updateChartsTheme() {
 
   // Update mini charts
   Object.keys(charts).forEach((key) => {
-    if (key !== "overview") {
+    if (key !== "overview" && key !== "io") {
       const chart = charts[key];
       if (chart) {
         chart.data.datasets[0].borderColor = colors.primary;
@@ -545,6 +820,17 @@ function updateChartsTheme() {
     datasets[3].borderColor = colors.error;
     charts.overview.update('none');
   }
+
+  // Update I/O chart
+  if (charts.io) {
+    const datasets = charts.io.data.datasets;
+    datasets[0].borderColor = colors.primary;
+    datasets[1].borderColor = colors.error;
+    datasets[2].borderColor = colors.success;
+    datasets[3].borderColor = colors.info;
+    datasets[4].borderColor = colors.warning;
+    charts.io.update('none');
+  }
 }
 
 // ===== LOG MANAGEMENT =====
@@ -564,26 +850,50 @@ function loadInitialLogs() {
 }
 
 /**
- * Fetch logs from server with optional level filter
+ * Build the /logs URL for one page of logs
+ * @param {string} level - Log level filter
+ * @param {string} before - Pagination cursor (older logs only)
+ * @returns {string} Request URL
+ */
+function buildLogsUrl(level, before) {
+  const params = new URLSearchParams({ limit: LOGS_PAGE_SIZE });
+  if (level) params.set("level", level);
+  if (currentLogSearch) params.set("q", currentLogSearch);
+  if (before) params.set("before", before);
+  return "/logs?" + params.toString();
+}
+
+/**
+ * Fetch one page of logs and remember the cursor of the next page
+ * @param {string} level - Log level filter
+ * @param {string} before - Pagination cursor (older logs only)
+ * @returns {Promise<Array>} Logs of the page
+ */
+function fetchLogsPage(level, before) {
+  return fetch(buildLogsUrl(level, before)).then((response) => {
+    if (!response.ok) {
+      throw new Error("HTTP error! status: " + response.status);
+    }
+    nextLogsCursor = response.headers.get("X-Next-Cursor");
+    if (!before) liveLogsCursor = response.headers.get("X-Head-Cursor");
+    return response.json();
+  });
+}
+
+/**
+ * Fetch the most recent logs from server with optional level filter
  * @param {string} level - Log level filter
  */
 function fetchLogs(level) {
   level = level || "";
 
-  const url = level ? "/logs?level=" + level : "/logs";
-
-  return fetch(url)
-    .then((response) => {
-      if (!response.ok) {
-        throw new Error("HTTP error! status: " + response.status);
-      }
-      return response.json();
-    })
+  return fetchLogsPage(level)
     .then((data) => {
       logsData = data;
       currentLogLevel = level;
       filterAndDisplayLogs();
       updateLogsStatistics();
+      subscribeToLogs();
     })
     .catch((error) => {
       console.error("Error fetching logs:", error);
@@ -591,6 +901,61 @@ function fetchLogs(level) {
     });
 }
 
+/**
+ * Append the next page of older logs (infinite scroll)
+ */
+function fetchMoreLogs() {
+  if (!nextLogsCursor || isLoadingMoreLogs) return;
+
+  isLoadingMoreLogs = true;
+  fetchLogsPage(currentLogLevel, nextLogsCursor)
+    .then((data) => {
+      logsData = logsData.concat(data);
+      filterAndDisplayLogs();
+    })
+    .catch((error) => {
+      console.error("Error fetching more logs:", error);
+    })
+    .finally(() => {
+      isLoadingMoreLogs = false;
+    });
+}
+
+/**
+ * Subscribe to new logs matching the current filters, starting after the
+ * newest log already displayed
+ */
+function subscribeToLogs() {
+  if (!socket || !socket.connected) return;
+
+  const filters = { level: currentLogLevel, q: currentLogSearch, after: liveLogsCursor };
+  socket.emit("subscribe_logs", filters, (ack) => {
+    if (ack && ack.error) {
+      console.error("Error subscribing to logs:", ack.error);
+    } else if (ack) {
+      liveLogsCursor = ack.cursor;
+    }
+  });
+}
+
+/**
+ * Handle a batch of new logs pushed by the server (newest first)
+ * @param {Object} data - New logs and cursor to resume from
+ */
+function handleLiveLogs(data) {
+  liveLogsCursor = data.cursor;
+  logsData = data.logs.concat(logsData);
+  filterAndDisplayLogs();
+
+  // Coalesce statistics refreshes during bursts
+  if (!statsUpdateTimer) {
+    statsUpdateTimer = setTimeout(() => {
+      statsUpdateTimer = null;
+      updateLogsStatistics();
+    }, 2000);
+  }
+}
+
 /**
  * Filter and display logs based on current filter
  */
@@ -643,13 +1008,23 @@ function displayLogs(logs) {
  * Update logs statistics
  */
 function updateLogsStatistics() {
-  const totalLogs = logsData.length;
-  const errorLogs = logsData.filter((log) => log.level === "ERROR" || log.level === "CRITICAL").length;
-  const warningLogs = logsData.filter((log) => log.level === "WARNING").length;
-
-  document.getElementById("total-logs").textContent = totalLogs;
-  document.getElementById("error-logs").textContent = errorLogs;
-  document.getElementById("warning-logs").textContent = warningLogs;
+  // Counters are pre-aggregated by the server: no need to download every log
+  return fetch("/logs/stats?bucket=1d")
+    .then((response) => {
+      if (!response.ok) {
+        throw new Error("HTTP error! status: " + response.status);
+      }
+      return response.json();
+    })
+    .then((stats) => {
+      const levels = stats.levels || {};
+      document.getElementById("total-logs").textContent = stats.total;
+      document.getElementById("error-logs").textContent = (levels.ERROR || 0) + (levels.CRITICAL || 0);
+      document.getElementById("warning-logs").textContent = levels.WARNING || 0;
+    })
+    .catch((error) => {
+      console.error("Error fetching logs statistics:", error);
+    });
 }
 
 /**
@@ -752,11 +1127,20 @@ function initializeEventListeners() {
   // Theme toggle
   document.getElementById("theme-toggle").addEventListener("click", toggleTheme);
 
+  // Stop performance updates while the page is hidden
+  document.addEventListener("visibilitychange", subscribeToPerformance);
+
   // Log level filter
   document.getElementById("level-filter").addEventListener("change", (e) => {
     fetchLogs(e.target.value);
   });
 
+  // Full-text search (words of the message or key=value context pairs)
+  document.getElementById("log-search").addEventListener("change", (e) => {
+    currentLogSearch = e.target.value.trim();
+    fetchLogs(currentLogLevel);
+  });
+
   // Clear logs button
   document.getElementById("clear-logs-btn").addEventListener("click", clearLogs);
 
@@ -765,6 +1149,14 @@ function initializeEventListeners() {
     fetchLogs(currentLogLevel);
   });
 
+  // Load older logs when the list is scrolled near its end
+  document.getElementById("logs-list").addEventListener("scroll", (e) => {
+    const list = e.target;
+    if (list.scrollTop + list.clientHeight >= list.scrollHeight - 100) {
+      fetchMoreLogs();
+    }
+  });
+
   // Chart timeframe controls
   const chartControlBtns = document.querySelectorAll(".chart-control-btn");
   chartControlBtns.forEach((btn) => {
@@ -0,0 +1,74 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+import multiprocessing
+
+from model.log import Log
+from manager.log_manager import LogManager
+from manager.file_lock import DirectoryLock
+
+
+def write_logs(directory: str, storage: str, worker: int, count: int) -> None:
+    """Écrit ``count`` journaux depuis un processus séparé."""
+    log_manager = LogManager(directory=directory, storage=storage)
+    for i in range(count):
+        log_manager.create_log(Log(level="INFO", message=f"{worker}-{i}", module=f"worker{worker}"))
+    log_manager.close()
+
+
+class TestMultiProcessWriters(unittest.TestCase):
+    """Tests des écritures concurrentes de plusieurs processus sur un même répertoire."""
+
+    def setUp(self) -> None:
+        """Crée un répertoire temporaire pour chaque test."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        """Supprime le répertoire temporaire."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def run_writers(self, storage: str, workers: int, count: int) -> LogManager:
+        """Lance des processus écrivains puis retourne un lecteur du répertoire."""
+        processes = [
+            multiprocessing.Process(target=write_logs, args=(self.test_dir, storage, worker, count))
+            for worker in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            self.assertEqual(process.exitcode, 0, "Un processus écrivain a échoué")
+        return LogManager(directory=self.test_dir, storage=storage)
+
+    def test_json_writers(self) -> None:
+        """Vérifie qu'aucun ajout n'est perdu en mode json."""
+        logs = self.run_writers("json", 4, 25).read_logs()
+        self.assertEqual(len(logs), 100, "Des journaux ont été perdus")
+        self.assertEqual(len({log.id for log in logs}), 100, "Des IDs sont en double")
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "logs.json.tmp")))
+
+    def test_segment_writers(self) -> None:
+        """Vérifie l'absence de perte, de doublon et de ligne tronquée en mode segments."""
+        reader = self.run_writers("segments", 4, 100)
+        logs = reader.read_logs()
+        self.assertEqual(len(logs), 400, "Des journaux ont été perdus")
+        self.assertEqual(len({log.id for log in logs}), 400, "Des IDs sont en double")
+        for path in reader._store.segment_paths():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    json.loads(line)  # Aucune ligne entrelacée ou tronquée
+
+    def test_lock_is_reentrant(self) -> None:
+        """Vérifie qu'un thread peut ré-acquérir le verrou qu'il détient."""
+        lock = DirectoryLock(self.test_dir)
+        with lock:
+            with lock:
+                pass
+        lock.close()
+        self.assertEqual(os.listdir(self.test_dir), [], "Aucun fichier de verrou ne doit être créé")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from model.log import Log
+from unittest import mock
+from datetime import datetime, timedelta
+from manager.json_store import JsonStore
+from manager.log_manager import LogManager
+from manager.log_archive import LogArchive, write_archive
+
+
+def make_records(count: int, start: datetime = datetime(2025, 7, 10)) -> list:
+    """Construit ``count`` journaux sérialisés espacés d'une minute."""
+    return [{
+        "id": str(i + 1),
+        "timestamp": (start + timedelta(minutes=i)).isoformat(),
+        "level": "ERROR" if i % 3 == 0 else "INFO",
+        "module": "auth",
+        "message": f"message {i}",
+        "context": {"user_id": f"user{i % 5}"},
+    } for i in range(count)]
+
+
+class TestLogArchive(unittest.TestCase):
+    """Tests du format d'archive compressé par blocs."""
+
+    def setUp(self) -> None:
+        """Crée un répertoire temporaire pour chaque test."""
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "logs-archive-000001.jsonz")
+
+    def tearDown(self) -> None:
+        """Supprime le répertoire temporaire."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_round_trip(self) -> None:
+        """Vérifie qu'une archive restitue les journaux dans l'ordre chronologique."""
+        records = make_records(25)
+        for codec in ("zlib", "lzma"):
+            archive = write_archive(self.path, reversed(records), codec=codec, block_records=10)
+            self.assertEqual(len(archive.blocks), 3)
+            self.assertEqual(len(archive), 25)
+            self.assertEqual(archive.last_id, 25)
+            self.assertEqual(list(LogArchive(self.path).records()), records, codec)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_range_read_decompresses_needed_blocks(self) -> None:
+        """Vérifie qu'une lecture sur une période ne décompresse que les blocs concernés."""
+        archive = write_archive(self.path, make_records(100), block_records=10)
+        with mock.patch.object(archive, "read_block", wraps=archive.read_block) as read_block:
+            records = list(archive.records(since="2025-07-10T00:25:00", until="2025-07-10T00:34:00"))
+        self.assertEqual([record["message"] for record in records], [f"message {i}" for i in range(25, 35)])
+        self.assertEqual([call.args[0] for call in read_block.call_args_list], [2, 3])
+
+        with mock.patch.object(archive, "read_block", wraps=archive.read_block) as read_block:
+            page = archive.query(level="ERROR", limit=2)
+        self.assertEqual([record["message"] for record in page], ["message 99", "message 96"])
+        self.assertEqual(read_block.call_count, 1, "La page est complète dès le dernier bloc")
+
+    def test_invalid_archive(self) -> None:
+        """Vérifie qu'un fichier qui n'est pas une archive est refusé."""
+        with open(self.path, "wb") as f:
+            f.write(b"[]")
+        with self.assertRaises(ValueError):
+            LogArchive(self.path)
+        with self.assertRaises(ValueError):
+            write_archive(self.path, make_records(1), codec="gzip")
+
+
+class TestJsonStoreArchiving(unittest.TestCase):
+    """Tests de l'archivage des journaux anciens de logs.json."""
+
+    def setUp(self) -> None:
+        """Crée un stockage JSON contenant deux jours de journaux."""
+        self.test_dir = tempfile.mkdtemp()
+        self.store = JsonStore(os.path.join(self.test_dir, "logs.json"), block_records=10)
+        records = make_records(48, datetime(2025, 7, 9, 12)) + make_records(12, datetime(2025, 7, 10, 12))
+        for i, record in enumerate(records):
+            record["id"] = str(i + 1)
+        self.store.append(records)
+
+    def tearDown(self) -> None:
+        """Supprime le répertoire temporaire."""
+        self.store.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_archive_moves_old_logs(self) -> None:
+        """Vérifie que les journaux anciens quittent logs.json sans disparaître des lectures."""
+        size = os.path.getsize(self.store.log_file)
+        self.assertEqual(self.store.archive(timedelta(days=1), now=datetime(2025, 7, 11)), 48)
+        self.assertEqual(self.store.archive(timedelta(days=1), now=datetime(2025, 7, 11)), 0)
+        self.assertLess(os.path.getsize(self.store.log_file), size / 4)
+        self.assertEqual(len(self.store._index), 0, "Les journaux archivés ne sont pas indexés")
+
+        log_manager = LogManager(directory=self.test_dir, storage=self.store)
+        self.assertEqual(len(log_manager.read_logs()), 60)
+        self.assertEqual(log_manager.get_log("3").message, "message 2")
+        self.assertFalse(log_manager.delete_log("3"), "Un journal archivé n'est pas modifiable")
+        self.assertEqual(log_manager.stats(bucket="1d")["total"], 60)
+
+        log_manager.create_log(Log(level="INFO", message="nouveau", module="auth"))
+        self.assertEqual(log_manager.read_logs()[0].id, "61", "Les IDs archivés ne sont pas réutilisés")
+
+    def test_pagination_across_archive(self) -> None:
+        """Vérifie qu'une pagination par curseur traverse logs.json puis les archives."""
+        self.store.archive(timedelta(hours=12), now=datetime(2025, 7, 10, 12))
+        log_manager = LogManager(directory=self.test_dir, storage=self.store)
+        expected = [log.id for log in log_manager.read_logs()]
+        pages, cursor = [], None
+        while True:
+            logs, cursor = log_manager.query_logs(limit=7, before=cursor)
+            pages.extend(log.id for log in logs)
+            if cursor is None:
+                break
+        self.assertEqual(pages, expected)
+        logs, _ = log_manager.query_logs(since="2025-07-09T12:10:00", until="2025-07-09T12:12:00")
+        self.assertEqual([log.message for log in logs], ["message 12", "message 11", "message 10"])
+
+    def test_archive_on_append(self) -> None:
+        """Vérifie l'archivage automatique par blocs complets et la suppression par clear()."""
+        store = JsonStore(os.path.join(self.test_dir, "logs.json"), archive_after=timedelta(days=1),
+                          block_records=100)
+        store.append([{"level": "INFO", "message": "récent", "module": "auth",
+                       "timestamp": datetime.now().isoformat()}])
+        self.assertEqual(store._archive_names(), [], "Moins d'un bloc à archiver")
+        store.block_records = 40
+        store.append([{"level": "INFO", "message": "récent", "module": "auth",
+                       "timestamp": datetime.now().isoformat()}])
+        self.assertEqual(store._archive_names(), ["logs-archive-000001.jsonz"])
+        self.assertEqual(len(store.query()), 62)
+
+        store.clear()
+        self.assertEqual(store._archive_names(), [])
+        self.assertEqual(store.query(), [])
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import shutil
+import logging
+import tempfile
+import unittest
+import threading
+
+from unittest import mock
+from manager.log_manager import LogManager
+from manager.log_handler import LogboardHandler
+
+
+class TestLogboardHandler(unittest.TestCase):
+    """Tests du handler logging qui alimente LogManager."""
+
+    def setUp(self) -> None:
+        """Crée un logger dédié relié à un gestionnaire temporaire."""
+        self.test_dir = tempfile.mkdtemp()
+        self.log_manager = LogManager(directory=self.test_dir, storage="segments")
+        self.handler = LogboardHandler(self.log_manager)
+        self.logger = logging.getLogger(f"logboard.test.{self.id()}")
+        self.logger.setLevel(1)
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self) -> None:
+        """Retire le handler et supprime le répertoire temporaire."""
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+        self.log_manager.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_record_mapping(self) -> None:
+        """Vérifie la conversion des champs d'un LogRecord en journal."""
+        context = {"user": "alice"}
+        self.logger.warning("Fichier %s ignoré", "a.txt", extra={"dataset": "train"})
+        self.logger.log(5, "Détail")
+        try:
+            raise KeyError("id")
+        except KeyError:
+            self.logger.exception("Échec du chargement", extra=context)
+        self.handler.flush()
+
+        error, debug, warning = self.log_manager.read_logs()
+        self.assertEqual((warning.level, warning.message, warning.module),
+                         ("WARNING", "Fichier a.txt ignoré", self.logger.name))
+        self.assertEqual(warning.context["dataset"], "train")
+        self.assertEqual(warning.context["function"], "test_record_mapping")
+        self.assertEqual(debug.level, "DEBUG", "Un niveau personnalisé est ramené au niveau inférieur")
+        self.assertEqual(error.level, "ERROR")
+        self.assertEqual(error.context["user"], "alice")
+        self.assertIn("KeyError: 'id'", error.context["exception"])
+
+    def block_writer(self) -> threading.Event:
+        """Retient l'écriture suivante jusqu'à ce que l'événement retourné soit levé.
+
+        Le thread d'écriture est occupé (dans ``create_logs``) au retour.
+        """
+        write = self.log_manager.create_logs
+        entered, release = threading.Event(), threading.Event()
+
+        def blocking(logs):
+            entered.set()
+            release.wait(5)
+            return write(logs)
+
+        patcher = mock.patch.object(self.log_manager, "create_logs", side_effect=blocking)
+        self.create_logs = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.logger.info("premier")
+        entered.wait(5)
+        return release
+
+    def test_records_are_written_in_batches(self) -> None:
+        """Vérifie que les enregistrements sont écrits par lots hors du thread appelant."""
+        release = self.block_writer()
+        for i in range(50):
+            self.logger.info("message %d", i)
+        release.set()
+        self.handler.flush()
+        self.assertEqual([len(call.args[0]) for call in self.create_logs.call_args_list], [1, 50],
+                         "Les enregistrements en attente forment un seul lot")
+        self.assertEqual(len(self.log_manager.read_logs()), 51)
+
+    def test_full_queue_drops_records(self) -> None:
+        """Vérifie qu'une file pleine n'est jamais bloquante pour l'appelant."""
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+        self.handler = LogboardHandler(self.log_manager, max_queue=2)
+        self.logger.addHandler(self.handler)
+        release = self.block_writer()
+        for i in range(5):
+            self.logger.info("message %d", i)
+        self.assertEqual(self.handler.dropped, 3)
+
+        # Fermeture avec une file pleine : la sentinelle d'arrêt attend une place
+        threading.Timer(0.2, release.set).start()
+        self.handler.close()
+        self.assertEqual(len(self.log_manager.read_logs()), 3)
+
+    def test_unserializable_extra(self) -> None:
+        """Vérifie qu'un objet non sérialisable dans ``extra`` ne fait pas perdre le lot."""
+        marker = object()
+        self.logger.info("objet", extra={"payload": marker, "items": [1, marker], "ok": {"a": 1}})
+        self.logger.info("suivant")
+        self.handler.flush()
+        following, log = self.log_manager.read_logs()
+        self.assertEqual(following.message, "suivant")
+        self.assertEqual(log.context["payload"], repr(marker))
+        self.assertEqual(log.context["items"], [1, repr(marker)])
+        self.assertEqual(log.context["ok"], {"a": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
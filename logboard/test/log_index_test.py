@@ -0,0 +1,235 @@
+import json
+import shutil
+import tempfile
+import unittest
+
+from unittest import mock
+from model.log import Log
+from datetime import datetime
+from manager.log_index import LogIndex, encode_cursor, decode_cursor, log_terms, parse_search
+from manager.log_manager import LogManager
+
+
+def make_record(log_id: str, timestamp: str, level: str = "INFO", module: str = "api") -> dict:
+    """Construit un journal sérialisé minimal pour les tests."""
+    return {"id": log_id, "timestamp": timestamp, "level": level,
+            "message": f"message {log_id}", "module": module, "context": {}}
+
+
+class TestLogIndex(unittest.TestCase):
+    """Tests pour l'index résident des journaux."""
+
+    def test_newest_first(self) -> None:
+        """Vérifie l'ordre antéchronologique, même pour des ajouts désordonnés."""
+        index = LogIndex()
+        index.add(make_record("1", "2025-07-10T08:00:00"))
+        index.add(make_record("2", "2025-07-10T10:00:00"))
+        index.add(make_record("3", "2025-07-10T09:00:00"))
+        self.assertEqual([r["id"] for r in index.query()], ["2", "3", "1"])
+        self.assertEqual(len(index), 3)
+
+    def test_level_and_module_filters(self) -> None:
+        """Vérifie le filtrage par niveau, par module et par les deux."""
+        index = LogIndex()
+        index.add_many([
+            make_record("1", "2025-07-10T08:00:00", "INFO", "auth"),
+            make_record("2", "2025-07-10T08:01:00", "ERROR", "auth"),
+            make_record("3", "2025-07-10T08:02:00", "ERROR", "database"),
+            make_record("4", "2025-07-10T08:03:00", "INFO", "database"),
+        ])
+        self.assertEqual([r["id"] for r in index.query(level="error")], ["3", "2"])
+        self.assertEqual([r["id"] for r in index.query(module="auth")], ["2", "1"])
+        self.assertEqual([r["id"] for r in index.query(level="INFO", module="database")], ["4"])
+        self.assertEqual(list(index.query(module="inconnu")), [])
+
+    def test_time_range_and_cursors(self) -> None:
+        """Vérifie les bornes temporelles et la pagination par curseur."""
+        index = LogIndex()
+        index.add_many(make_record(str(i), f"2025-07-10T0{i}:00:00") for i in range(1, 8))
+
+        self.assertEqual([r["id"] for r in index.query(since="2025-07-10T03:00:00",
+                                                       until="2025-07-10T05:00:00")], ["5", "4", "3"])
+        cursor = decode_cursor(encode_cursor(make_record("5", "2025-07-10T05:00:00")))
+        self.assertEqual([r["id"] for r in index.query(before=cursor)], ["4", "3", "2", "1"])
+        self.assertEqual([r["id"] for r in index.query(after=cursor)], ["6", "7"],
+                         "after doit parcourir les journaux du plus ancien au plus récent")
+        with self.assertRaises(ValueError):
+            decode_cursor("pas-un-curseur")
+
+    def test_update_and_remove(self) -> None:
+        """Vérifie la mise à jour et le retrait d'un journal indexé."""
+        index = LogIndex()
+        index.add_many([
+            make_record("1", "2025-07-10T08:00:00", "INFO", "auth"),
+            make_record("2", "2025-07-10T08:01:00", "ERROR", "auth"),
+        ])
+        self.assertTrue(index.update("1", {"message": "Modifié"}))
+        self.assertEqual(index.get("1")["message"], "Modifié")
+        self.assertTrue(index.update("2", {"level": "WARNING"}))
+        self.assertEqual([r["id"] for r in index.query(level="WARNING")], ["2"])
+        self.assertEqual(list(index.query(level="ERROR")), [], "L'ancien niveau doit être désindexé")
+
+        self.assertEqual(index.remove("1")["id"], "1")
+        self.assertIsNone(index.remove("1"))
+        self.assertFalse(index.update("1", {"message": "Absent"}))
+        self.assertEqual([r["id"] for r in index.query(module="auth")], ["2"])
+        self.assertEqual(len(index), 1)
+
+    def test_after_id_and_sources(self) -> None:
+        """Vérifie la lecture par ID croissant et la recherche des journaux d'agent."""
+        index = LogIndex()
+        index.add_many([
+            make_record("1", "2025-07-10T09:00:00"),
+            make_record("2", "2025-07-10T10:00:00"),
+            dict(make_record("3", "2025-07-10T08:00:00"), node="node-a", source_id="7"),
+        ])
+        self.assertEqual([r["id"] for r in index.after_id(1)], ["2", "3"],
+                         "L'ordre des IDs ignore l'horodatage")
+        self.assertTrue(index.has_source("node-a", "7"))
+        self.assertFalse(index.has_source("node-b", "7"))
+        index.remove("3")
+        self.assertEqual([r["id"] for r in index.after_id(1)], ["2"])
+        self.assertFalse(index.has_source("node-a", "7"))
+
+    def test_search_terms(self) -> None:
+        """Vérifie le calcul des termes d'un journal et d'une recherche."""
+        record = make_record("1", "2025-07-10T08:00:00")
+        record["message"] = "Connexion réussie"
+        record["context"] = {"user_id": "User123", "request": {"method": "GET"}, "retry": True}
+        self.assertEqual(log_terms(record), {
+            "connexion", "reussie", "user_id=user123", "user123", "request.method=get", "get", "retry=true"
+        })
+        self.assertEqual(parse_search("Réussie  USER_ID=User123"), ["reussie", "user_id=user123"])
+        self.assertEqual(parse_search("connexion-réussie"), ["connexion", "reussie"])
+        self.assertIsNone(parse_search("  "))
+
+    def test_search(self) -> None:
+        """Vérifie la recherche par l'index inversé, combinée aux autres filtres."""
+        index = LogIndex()
+        for i in range(1, 7):
+            record = make_record(str(i), f"2025-07-10T0{i}:00:00", "ERROR" if i % 2 else "INFO")
+            record["message"] = "timeout" if i % 3 == 0 else "connexion"
+            record["context"] = {"user_id": f"user{i % 2}"}
+            index.add(record)
+        self.assertEqual([r["id"] for r in index.query(terms=["timeout"])], ["6", "3"])
+        self.assertEqual([r["id"] for r in index.query(terms=["connexion", "user_id=user1"])], ["5", "1"])
+        self.assertEqual([r["id"] for r in index.query(level="ERROR", terms=["timeout"])], ["3"])
+        self.assertEqual([r["id"] for r in index.query(terms=["timeout"], before=("2025-07-10T06:00:00", 6))],
+                         ["3"])
+        self.assertEqual(list(index.query(terms=["inconnu"])), [])
+
+        index.update("6", {"message": "connexion"})
+        self.assertEqual([r["id"] for r in index.query(terms=["timeout"])], ["3"])
+        index.remove("3")
+        self.assertEqual(list(index.query(terms=["timeout"])), [])
+        self.assertNotIn("timeout", index._by_term, "Un terme sans journal doit être oublié")
+
+    def test_clear(self) -> None:
+        """Vérifie que clear() vide l'index."""
+        index = LogIndex()
+        index.add(make_record("1", "2025-07-10T08:00:00"))
+        index.clear()
+        self.assertEqual(list(index.query()), [])
+
+
+class TestLogManagerIndex(unittest.TestCase):
+    """Tests de l'index résident utilisé par LogManager."""
+
+    def setUp(self) -> None:
+        """Crée un répertoire temporaire pour chaque test."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        """Supprime le répertoire temporaire."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_tails_appends_from_other_writers(self) -> None:
+        """Vérifie qu'un lecteur voit les ajouts d'un autre gestionnaire sans tout relire."""
+        reader = LogManager(directory=self.test_dir, storage="segments")
+        writer = LogManager(directory=self.test_dir, storage="segments")
+        writer.create_log(Log(level="INFO", message="Premier", module="auth"))
+        self.assertEqual(len(reader.read_logs()), 1)
+        partition = next(iter(reader._store._partitions.values()))
+        cursor = dict(partition.cursor)
+
+        writer.create_log(Log(level="ERROR", message="Second", module="database"))
+        self.assertEqual([log.message for log in reader.read_logs()], ["Second", "Premier"])
+        self.assertGreater(list(partition.cursor.values())[0][1], list(cursor.values())[0][1])
+        self.assertEqual([log.message for log in reader.read_logs(module="database")], ["Second"])
+
+    def test_json_appends_extend_index(self) -> None:
+        """Vérifie qu'en mode json, les ajouts du processus complètent l'index sans relire logs.json."""
+        log_manager = LogManager(directory=self.test_dir)
+        other = LogManager(directory=self.test_dir)
+        log_manager.create_log(Log(level="INFO", message="Premier", module="auth"))
+        self.assertEqual(len(log_manager.read_logs()), 1)
+        index = log_manager._store._index
+        with mock.patch.object(index, "clear", wraps=index.clear) as clear, \
+                mock.patch("manager.json_store.json.load", wraps=json.load) as load:
+            for i in range(3):
+                log_manager.create_log(Log(level="ERROR", message=f"Ajout {i}", module="database"))
+            self.assertEqual([log.message for log in log_manager.read_logs(module="database")],
+                             ["Ajout 2", "Ajout 1", "Ajout 0"])
+            self.assertEqual((clear.call_count, load.call_count), (0, 3), "Seuls les ajouts relisent le fichier")
+
+            other.create_log(Log(level="INFO", message="Autre processus", module="auth"))
+            log_manager.create_log(Log(level="INFO", message="Après", module="auth"))
+            self.assertEqual(len(log_manager.read_logs()), 6)
+            self.assertEqual(clear.call_count, 1, "Une écriture extérieure entraîne une relecture complète")
+        other.close()
+        log_manager.close()
+
+    def test_logs_do_not_share_index_records(self) -> None:
+        """Vérifie que modifier le contexte d'un journal lu ou écrit n'altère pas l'index."""
+        for storage in ("json", "segments"):
+            log_manager = LogManager(directory=tempfile.mkdtemp(dir=self.test_dir), storage=storage)
+            log_manager.read_logs()  # Index chargé : les ajouts suivants le complètent
+            log = Log(level="INFO", message="Connexion", module="auth", context={"user": {"name": "alice"}})
+            log_manager.create_log(log)
+            log.context["user"]["name"] = "eve"
+            read = log_manager.query_logs()[0][0]
+            read.context["user"]["name"] = "mallory"
+            self.assertEqual(log_manager.query_logs()[0][0].context, {"user": {"name": "alice"}}, storage)
+            self.assertEqual(len(log_manager.search("user.name=alice")), 1, storage)
+            log_manager.close()
+
+    def test_rewrites_are_detected(self) -> None:
+        """Vérifie que l'index suit les mises à jour et suppressions, quel que soit le stockage."""
+        for storage in ("json", "segments"):
+            log_manager = LogManager(directory=tempfile.mkdtemp(dir=self.test_dir), storage=storage)
+            log_manager.create_log(Log(level="INFO", message="Initial", module="auth"))
+            log_manager.create_log(Log(level="ERROR", message="Erreur", module="auth"))
+            self.assertEqual(len(log_manager.read_logs()), 2)
+
+            log_manager.update_log("1", new_message="Modifié")
+            self.assertEqual(log_manager.read_logs(filter_level="INFO")[0].message, "Modifié", storage)
+            log_manager.delete_log("2")
+            self.assertEqual([log.id for log in log_manager.read_logs()], ["1"], storage)
+
+    def test_query_pages(self) -> None:
+        """Vérifie que les pages successives couvrent tous les journaux sans doublon."""
+        log_manager = LogManager(directory=self.test_dir, storage="segments")
+        for i in range(25):
+            log_manager.create_log(Log(level="INFO", message=str(i), module="auth",
+                                       timestamp=datetime(2025, 7, 10, 8, i)))
+        seen, cursor = [], None
+        while True:
+            page, cursor = log_manager.query_logs(limit=10, before=cursor)
+            seen.extend(log.message for log in page)
+            if cursor is None:
+                break
+        self.assertEqual(seen, [str(i) for i in reversed(range(25))])
+
+        page, cursor = log_manager.query_logs(since=datetime(2025, 7, 10, 8, 20), limit=2)
+        self.assertEqual([log.message for log in page], ["24", "23"])
+        newer, follow = log_manager.query_logs(after=cursor)
+        self.assertEqual([log.message for log in newer], ["24"])
+        log_manager.create_log(Log(level="INFO", message="nouveau", module="auth",
+                                   timestamp=datetime(2025, 7, 10, 9, 0)))
+        self.assertEqual([log.message for log in log_manager.query_logs(after=follow)[0]], ["nouveau"])
+        with self.assertRaises(ValueError):
+            log_manager.query_logs(limit=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -23,8 +23,9 @@ class TestLogManager(unittest.TestCase):
 
         Supprime le répertoire de test et le fichier logs.json.
         """
-        if os.path.exists(self.log_file):
-            os.remove(self.log_file)
+        for path in (self.log_file, self.log_file + ".sequence"):
+            if os.path.exists(path):
+                os.remove(path)
         if os.path.exists(self.test_dir):
             os.rmdir(self.test_dir)
 
@@ -104,6 +105,34 @@ class TestLogManager(unittest.TestCase):
         self.assertEqual(len(logs), 0, "Le journal n'a pas été supprimé")
 
 
+    def test_ids_are_not_reused(self) -> None:
+        """Vérifie qu'un nouvel ID n'entre pas en collision après une suppression."""
+        for message in ("Premier", "Second"):
+            self.log_manager.create_log(Log(level="INFO", message=message, module="test_module"))
+        self.log_manager.delete_log(log_id="1")
+
+        log = Log(level="INFO", message="Troisième", module="test_module")
+        self.log_manager.create_log(log)
+        self.assertEqual(log.id, "3", "L'ID généré est déjà utilisé")
+        self.assertEqual(len({log.id for log in self.log_manager.read_logs()}), 2)
+
+    def test_ids_keep_increasing(self) -> None:
+        """Vérifie que les IDs restent croissants après la suppression du plus récent et un vidage."""
+        logs = [Log(level="INFO", message=f"Journal {i}", module="test_module") for i in range(3)]
+        self.log_manager.create_logs(logs)
+        self.assertTrue(self.log_manager.delete_log(log_id="3"))
+        log = Log(level="INFO", message="Après suppression", module="test_module")
+        self.log_manager.create_log(log)
+        self.assertEqual(log.id, "4", "L'ID du journal supprimé ne doit pas être réattribué")
+
+        self.log_manager.clear_logs()
+        log = Log(level="INFO", message="Après vidage", module="test_module")
+        self.log_manager.create_log(log)
+        self.assertEqual(log.id, "5", "La numérotation doit continuer après un vidage")
+        with open(self.log_file + ".sequence", "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "5")
+
+
     def test_delete_log_non_existent(self) -> None:
         """Vérifie la suppression d'un journal inexistant."""
         result = self.log_manager.delete_log(log_id="999")
@@ -115,8 +144,16 @@ class TestLogManager(unittest.TestCase):
         with open(self.log_file, "w", encoding="utf-8") as f:
             f.write("contenu non JSON")
 
-        logs = self.log_manager.read_logs()
+        with self.assertWarns(RuntimeWarning):
+            logs = self.log_manager.read_logs()
         self.assertEqual(logs, [], "La lecture d'un fichier JSON corrompu devrait retourner une liste vide")
+        quarantined = [name for name in os.listdir(self.test_dir) if name.startswith("logs.json.corrupt-")]
+        self.assertEqual(len(quarantined), 1, "Le fichier corrompu doit être conservé à part")
+        with open(os.path.join(self.test_dir, quarantined[0]), "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "contenu non JSON")
+        os.remove(os.path.join(self.test_dir, quarantined[0]))
+        self.log_manager.create_log(Log(level="INFO", message="Après", module="test_module"))
+        self.assertEqual([log.message for log in self.log_manager.read_logs()], ["Après"])
 
 
     def test_directory_creation(self) -> None:
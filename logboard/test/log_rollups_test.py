@@ -0,0 +1,64 @@
+import unittest
+
+from manager.log_rollups import Rollups, MINUTE, HOUR, parse_bucket, build_stats
+
+
+def make_record(timestamp: str, level: str = "INFO", module: str = "api") -> dict:
+    """Construit un journal sérialisé minimal pour les tests."""
+    return {"id": "1", "timestamp": timestamp, "level": level, "message": "m", "module": module, "context": {}}
+
+
+class TestRollups(unittest.TestCase):
+    """Tests pour les compteurs pré-agrégés des journaux."""
+
+    def test_parse_bucket(self) -> None:
+        """Vérifie la conversion des tailles d'intervalle."""
+        self.assertEqual(parse_bucket("15m"), 900)
+        self.assertEqual(parse_bucket("1h"), 3600)
+        self.assertEqual(parse_bucket("1d"), 86400)
+        for invalid in ("0h", "1w", "heure", ""):
+            with self.assertRaises(ValueError):
+                parse_bucket(invalid)
+
+    def test_counts_per_minute_and_hour(self) -> None:
+        """Vérifie les compteurs par minute et par heure, ajouts et retraits."""
+        rollups = Rollups()
+        rollups.add(make_record("2025-07-10T08:05:10"))
+        rollups.add(make_record("2025-07-10T08:05:50", "ERROR"))
+        rollups.add(make_record("2025-07-10T09:30:00", module="auth"))
+        self.assertEqual(sorted(rollups.rows(MINUTE)), [
+            ("2025-07-10T08:05", "ERROR", "api", 1),
+            ("2025-07-10T08:05", "INFO", "api", 1),
+            ("2025-07-10T09:30", "INFO", "auth", 1),
+        ])
+        self.assertEqual(sorted(rollups.rows(HOUR, level="info")), [
+            ("2025-07-10T08", "INFO", "api", 1),
+            ("2025-07-10T09", "INFO", "auth", 1),
+        ])
+        self.assertEqual(list(rollups.rows(HOUR, since="2025-07-10T09:00:00")),
+                         [("2025-07-10T09", "INFO", "auth", 1)])
+
+        rollups.remove(make_record("2025-07-10T08:05:50", "ERROR"))
+        self.assertEqual(list(rollups.rows(MINUTE, level="ERROR")), [])
+
+    def test_build_stats(self) -> None:
+        """Vérifie le regroupement des compteurs en intervalles alignés."""
+        rows = [
+            ("2025-07-10T08:05", "INFO", "api", 2),
+            ("2025-07-10T08:20", "ERROR", "api", 1),
+            ("2025-07-10T09:00", "INFO", "auth", 4),
+        ]
+        stats = build_stats(rows, parse_bucket("15m"))
+        self.assertEqual([(b["start"], b["total"]) for b in stats["buckets"]], [
+            ("2025-07-10T08:00:00", 2), ("2025-07-10T08:15:00", 1), ("2025-07-10T09:00:00", 4)
+        ])
+        stats = build_stats(rows, parse_bucket("1d"))
+        self.assertEqual(len(stats["buckets"]), 1)
+        self.assertEqual(stats["buckets"][0]["start"], "2025-07-10T00:00:00")
+        self.assertEqual(stats["total"], 7)
+        self.assertEqual(stats["levels"], {"INFO": 6, "ERROR": 1})
+        self.assertEqual(stats["modules"], {"api": 3, "auth": 4})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import os
+import sys
+import gzip
+import shutil
+import http.client
+import tempfile
+import unittest
+import threading
+import subprocess
+
+from unittest import mock
+from model.log import Log
+from datetime import datetime
+from interface import server
+from werkzeug.serving import make_server
+from manager.log_manager import LogManager
+from manager.log_shipper import LogShipper
+
+
+class TestLogShipper(unittest.TestCase):
+    """Tests de l'envoi des journaux d'un agent vers un logboard central (boucle locale)."""
+
+    def setUp(self) -> None:
+        """Démarre un serveur central sur la boucle locale et crée le stockage d'un agent."""
+        self.test_dir = tempfile.mkdtemp()
+        self.central = LogManager(directory=os.path.join(self.test_dir, "central"), storage="segments")
+        patcher = mock.patch.object(server, "log_manager", self.central)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.http = make_server("127.0.0.1", 0, server.app, threaded=True)
+        threading.Thread(target=self.http.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.http.server_port}"
+        self.agent_dir = os.path.join(self.test_dir, "agent")
+        self.local = LogManager(directory=self.agent_dir, storage="segments")
+
+    def tearDown(self) -> None:
+        """Arrête le serveur central et supprime les répertoires temporaires."""
+        self.http.shutdown()
+        self.http.server_close()
+        self.local.close()
+        self.central.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def shipper(self, url: str = None, **options) -> LogShipper:
+        """Crée un agent pour la machine "node-a" qui suit le stockage local."""
+        return LogShipper(self.local, url or self.url, spool_dir=os.path.join(self.agent_dir, "spool"),
+                          node="node-a", **options)
+
+    def add_logs(self, count: int, start: int = 0) -> None:
+        """Ajoute ``count`` journaux locaux espacés d'une minute."""
+        self.local.create_logs([Log(level="INFO", message=f"message {i}", module="cleaner",
+                                    timestamp=datetime(2025, 7, 10, 8, i)) for i in range(start, start + count)])
+
+    def test_ship_in_batches_with_node(self) -> None:
+        """Vérifie l'envoi par lots et le champ node des journaux reçus."""
+        self.add_logs(5)
+        shipper = self.shipper(batch_size=2)
+        self.assertEqual(shipper.run_once(), 5)
+        self.assertEqual(shipper.pending(), [])
+        received = self.central.read_logs()
+        self.assertEqual(len(received), 5)
+        self.assertEqual({(log.node, log.source_id) for log in received}, {("node-a", str(i)) for i in range(1, 6)})
+
+        response = server.app.test_client().get("/logs?node=node-a&limit=2")
+        self.assertEqual([record["node"] for record in response.get_json()], ["node-a", "node-a"])
+        self.assertEqual(server.app.test_client().get("/logs?node=node-b").get_json(), [])
+
+        self.add_logs(2, start=5)
+        restarted = self.shipper()
+        self.assertEqual(restarted.run_once(), 2, "La position de lecture survit au redémarrage de l'agent")
+
+    def test_node_filter_ignores_context_key(self) -> None:
+        """Vérifie que le filtre node ne renvoie pas un journal local dont le contexte a une clé "node"."""
+        self.central.create_log(Log(level="INFO", message="Local", module="cleaner", context={"node": "web1"}))
+        self.assertEqual(server.app.test_client().get("/logs?node=web1").get_json(), [])
+        self.assertEqual(self.central.query_logs(node="web1")[0], [])
+        self.assertEqual([log.message for log in self.central.search("node=web1")], ["Local"],
+                         "La recherche sur le contexte reste possible")
+
+    def test_chunked_batch_is_bounded(self) -> None:
+        """Vérifie qu'un lot envoyé par morceaux (sans Content-Length) est limité à ``BATCH_MAX_BYTES``."""
+        def post_chunked(count: int) -> int:
+            connection = http.client.HTTPConnection("127.0.0.1", self.http.server_port, timeout=5)
+            lines = (b'{"level": "INFO", "message": "morceau %d"}\n' % i for i in range(count))
+            connection.request("POST", "/logs/batch", body=lines, encode_chunked=True)
+            status = connection.getresponse().status
+            connection.close()
+            return status
+
+        with mock.patch.object(server, "BATCH_MAX_BYTES", 1024):
+            self.assertEqual(post_chunked(10), 201)
+            self.assertEqual(post_chunked(100), 413)
+        self.assertEqual(len(self.central.read_logs()), 10)
+
+    def test_redelivery_is_deduplicated(self) -> None:
+        """Vérifie qu'un lot renvoyé (acquittement perdu) n'est pas enregistré deux fois."""
+        self.add_logs(3)
+        shipper = self.shipper()
+        shipper.spool()
+        batch = shipper.pending()[0]
+        shutil.copy(batch, batch + ".copy")
+        self.assertEqual(shipper.send(), 3)
+        os.replace(batch + ".copy", batch)  # L'agent n'a pas reçu la réponse : il renvoie le lot
+        self.add_logs(1, start=3)
+        shipper.spool()
+        self.assertEqual(shipper.send(), 1)
+        self.assertEqual(len(self.central.read_logs()), 4)
+
+    def test_late_older_log_is_shipped(self) -> None:
+        """Vérifie qu'un journal écrit après les autres mais horodaté avant eux est envoyé."""
+        self.add_logs(2, start=30)
+        shipper = self.shipper()
+        self.assertEqual(shipper.run_once(), 2)
+        self.add_logs(1, start=5)  # Écrit en dernier, horodaté 25 minutes plus tôt
+        self.assertEqual(shipper.run_once(), 1)
+        self.assertEqual(sorted(log.message for log in self.central.read_logs()),
+                         ["message 30", "message 31", "message 5"])
+
+    def test_json_storage_after_delete_and_clear(self) -> None:
+        """Vérifie qu'un agent sur logs.json continue d'envoyer après une suppression et un vidage."""
+        self.local.close()
+        self.local = LogManager(directory=os.path.join(self.test_dir, "agent-json"))
+        shipper = self.shipper()
+        self.add_logs(3)
+        self.assertEqual(shipper.run_once(), 3)
+        self.local.delete_log("3")
+        self.add_logs(1, start=3)
+        self.assertEqual(shipper.run_once(), 1, "Le nouvel ID n'est pas pris pour un doublon du journal supprimé")
+        self.local.clear_logs()
+        self.add_logs(1, start=4)
+        self.assertEqual(shipper.run_once(), 1, "Le journal écrit après le vidage n'est pas sauté")
+        self.assertEqual(sorted(log.source_id for log in self.central.read_logs()), ["1", "2", "3", "4", "5"])
+
+    def test_spool_survives_collector_outage(self) -> None:
+        """Vérifie que les lots restent en attente tant que le serveur central est injoignable."""
+        self.add_logs(3)
+        unreachable = self.shipper(url="http://127.0.0.1:1", timeout=1)
+        with self.assertRaises(OSError):
+            unreachable.run_once()
+        self.assertEqual(len(unreachable.pending()), 1)
+        self.assertEqual(self.shipper().run_once(), 3)
+        self.assertEqual(len(self.central.read_logs()), 3)
+
+    def test_invalid_batch_is_set_aside(self) -> None:
+        """Vérifie qu'un lot refusé est mis de côté sans bloquer les suivants."""
+        shipper = self.shipper()
+        with open(os.path.join(shipper.spool_dir, "batch-000000000000.ndjson.gz"), "wb") as f:
+            f.write(gzip.compress(b"pas du json\n"))
+        self.add_logs(2)
+        self.assertEqual(shipper.run_once(), 2)
+        self.assertEqual(os.listdir(os.path.join(shipper.spool_dir, "rejected")), ["batch-000000000000.ndjson.gz"])
+
+    def test_agent_process(self) -> None:
+        """Vérifie l'envoi depuis un processus agent distinct."""
+        self.add_logs(4)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.run([sys.executable, "-m", "interface.agent", "--collector", self.url,
+                        "--directory", self.agent_dir, "--storage", "segments", "--node", "node-b", "--once"],
+                       cwd=root, check=True, capture_output=True, timeout=60)
+        self.assertEqual([log.node for log in self.central.read_logs()], ["node-b"] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import json
 import unittest
 
+from datetime import datetime
 from model.log import Log, LogLevel
 
 class TestLog(unittest.TestCase):
@@ -87,5 +88,39 @@ class TestLog(unittest.TestCase):
         self.assertEqual(log.context, {"error_code": 42})
         self.assertEqual(log.timestamp.isoformat(), "2025-07-12T16:24:00")
 
+    def test_from_stored(self):
+        """Vérifie qu'un journal relu du stockage restitue ses données sans conversion."""
+        data = {
+            "id": "7",
+            "timestamp": "2025-07-12T16:24:00.123456",
+            "level": "ERROR",
+            "message": "Échec",
+            "module": "test_module",
+            "context": {"error_code": 500}
+        }
+        log = Log.from_stored(data)
+        self.assertEqual(log.to_dict(), data)
+        self.assertEqual(log.timestamp, datetime(2025, 7, 12, 16, 24, 0, 123456))
+        log.timestamp = datetime(2025, 7, 13)
+        self.assertEqual(log.to_dict()["timestamp"], "2025-07-13T00:00:00")
+        self.assertFalse(hasattr(log, "__dict__"), "Log doit utiliser __slots__")
+
+    def test_node(self):
+        """Vérifie que la machine d'origine n'apparaît que pour un journal reçu d'un agent."""
+        self.assertNotIn("node", Log(level="INFO", message="Local", module="m").to_dict())
+        data = {
+            "id": "12",
+            "timestamp": "2025-07-12T16:24:00",
+            "level": "INFO",
+            "message": "Reçu",
+            "module": "cleaner",
+            "context": {},
+            "node": "node-a",
+            "source_id": "3"
+        }
+        log = Log.from_stored(data)
+        self.assertEqual((log.node, log.source_id), ("node-a", "3"))
+        self.assertEqual(log.to_dict(), data)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,126 @@
+import queue
+import shutil
+import tempfile
+import threading
+import unittest
+
+from model.log import Log
+from manager.log_manager import LogManager
+from manager.log_writer import BufferedLogWriter
+
+
+class TestBufferedLogWriter(unittest.TestCase):
+    """Tests pour l'écrivain de journaux différé."""
+
+    def setUp(self) -> None:
+        """Prépare un enregistreur de lots validés."""
+        self.batches = []
+        self.syncs = []
+
+    def _commit(self, logs, sync) -> None:
+        """Fonction de validation factice qui mémorise les lots reçus."""
+        self.batches.append(list(logs))
+        self.syncs.append(sync)
+
+    def test_group_commit(self) -> None:
+        """Vérifie que les journaux sont validés par lots."""
+        writer = BufferedLogWriter(self._commit, batch_size=50, max_delay=1.0)
+        for i in range(200):
+            writer.submit(Log(level="INFO", message=str(i), module="test_module"))
+        writer.close()
+
+        self.assertEqual(sum(len(b) for b in self.batches), 200, "Des journaux ont été perdus")
+        self.assertLessEqual(max(len(b) for b in self.batches), 50, "Lot trop grand")
+        self.assertLess(len(self.batches), 200, "Les journaux n'ont pas été regroupés")
+        messages = [log.message for batch in self.batches for log in batch]
+        self.assertEqual(messages, [str(i) for i in range(200)], "L'ordre n'est pas conservé")
+
+    def test_flush_waits_for_pending_logs(self) -> None:
+        """Vérifie que flush() attend l'écriture des journaux déposés."""
+        writer = BufferedLogWriter(self._commit, max_delay=10.0)
+        writer.submit(Log(level="INFO", message="Test", module="test_module"))
+        writer.flush()
+        self.assertEqual(sum(len(b) for b in self.batches), 1, "flush() n'a pas écrit le journal")
+        writer.close()
+
+    def test_fsync_policies(self) -> None:
+        """Vérifie les demandes de fsync selon la politique choisie."""
+        writer = BufferedLogWriter(self._commit, fsync="batch")
+        writer.submit(Log(level="INFO", message="Test", module="test_module"))
+        writer.close()
+        self.assertTrue(all(self.syncs), "Chaque lot devrait être synchronisé")
+
+        self.syncs.clear()
+        writer = BufferedLogWriter(self._commit, fsync="interval", fsync_interval=3600)
+        writer.submit(Log(level="INFO", message="Test", module="test_module"))
+        writer.flush()
+        self.assertTrue(self.syncs[-1], "flush() devrait forcer le fsync en mode interval")
+        writer.close()
+
+    def test_overflow_policies(self) -> None:
+        """Vérifie les politiques de débordement quand la file est pleine."""
+        gate = threading.Event()
+        entered = threading.Event()
+
+        def blocked_commit(logs, sync):
+            entered.set()
+            gate.wait()
+
+        writer = BufferedLogWriter(blocked_commit, max_queue=1, batch_size=1, overflow="raise")
+        writer.submit(Log(level="INFO", message="En cours", module="test_module"))
+        entered.wait()
+        writer.submit(Log(level="INFO", message="En file", module="test_module"))
+        with self.assertRaises(queue.Full):
+            writer.submit(Log(level="INFO", message="De trop", module="test_module"))
+        gate.set()
+        writer.close()
+
+        gate.clear()
+        entered.clear()
+        writer = BufferedLogWriter(blocked_commit, max_queue=1, batch_size=1, overflow="drop_debug")
+        writer.submit(Log(level="INFO", message="En cours", module="test_module"))
+        entered.wait()
+        writer.submit(Log(level="INFO", message="En file", module="test_module"))
+        for _ in range(3):
+            writer.submit(Log(level="DEBUG", message="Abandonné", module="test_module"))
+        self.assertEqual(writer.dropped, 3, "Les journaux DEBUG auraient dû être abandonnés")
+        gate.set()
+        writer.close()
+
+    def test_commit_error_is_raised_on_flush(self) -> None:
+        """Vérifie qu'une erreur d'écriture est relancée par flush()."""
+        def failing_commit(logs, sync):
+            raise IOError("disque plein")
+
+        writer = BufferedLogWriter(failing_commit)
+        writer.submit(Log(level="INFO", message="Test", module="test_module"))
+        with self.assertRaises(IOError):
+            writer.flush()
+        writer.close()
+
+    def test_invalid_policy(self) -> None:
+        """Vérifie qu'une politique inconnue lève une erreur."""
+        with self.assertRaises(ValueError):
+            BufferedLogWriter(self._commit, overflow="ignore")
+        with self.assertRaises(ValueError):
+            BufferedLogWriter(self._commit, fsync="always")
+
+    def test_buffered_log_manager(self) -> None:
+        """Vérifie LogManager en mode différé sur les deux stockages."""
+        for storage in ("json", "segments"):
+            test_dir = tempfile.mkdtemp()
+            try:
+                log_manager = LogManager(directory=test_dir, storage=storage, buffered=True)
+                logs = [Log(level="INFO", message=str(i), module="test_module") for i in range(100)]
+                for log in logs:
+                    log_manager.create_log(log)
+                log_manager.flush()
+                self.assertEqual(len(log_manager.read_logs()), 100, f"Journaux manquants ({storage})")
+                self.assertEqual(len({log.id for log in logs}), 100, f"IDs en double ({storage})")
+                log_manager.close()
+            finally:
+                shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
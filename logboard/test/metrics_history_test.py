@@ -0,0 +1,86 @@
+import unittest
+import numpy as np
+
+from utilities.metrics_history import MetricsHistory, RingBuffer, lttb, minmax
+
+
+class TestRingBuffer(unittest.TestCase):
+    """Tests du tampon circulaire de points."""
+
+    def test_wraps_around(self) -> None:
+        """Vérifie que les points les plus anciens sont écrasés une fois le tampon plein."""
+        buffer = RingBuffer(4)
+        for t in range(6):
+            buffer.append(float(t), t * 10.0)
+        times, values = buffer.arrays()
+        self.assertEqual(times.tolist(), [2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(values.tolist(), [20.0, 30.0, 40.0, 50.0])
+        self.assertEqual(buffer.oldest, 2.0)
+        self.assertEqual(buffer.arrays(since=3.5)[0].tolist(), [4.0, 5.0])
+
+
+class TestDownsampling(unittest.TestCase):
+    """Tests du sous-échantillonnage des séries."""
+
+    def setUp(self) -> None:
+        """Construit une série plate avec un pic isolé."""
+        self.times = np.arange(1000, dtype=np.float64)
+        self.values = np.zeros(1000)
+        self.values[437] = 100.0
+
+    def test_lttb_keeps_shape(self) -> None:
+        """Vérifie que LTTB conserve les extrémités et le pic."""
+        times, values = lttb(self.times, self.values, 50)
+        self.assertEqual(len(times), 50)
+        self.assertEqual((times[0], times[-1]), (0.0, 999.0))
+        self.assertIn(437.0, times.tolist(), "Le pic doit être conservé")
+        self.assertEqual(lttb(self.times[:10], self.values[:10], 50)[0].tolist(), self.times[:10].tolist())
+
+    def test_minmax_keeps_extremes(self) -> None:
+        """Vérifie que min/max conserve les extrêmes de chaque intervalle."""
+        times, values = minmax(self.times, self.values, 20)
+        self.assertLessEqual(len(times), 20)
+        self.assertEqual(values.max(), 100.0)
+        self.assertTrue(np.all(np.diff(times) > 0), "Les points restent chronologiques")
+
+
+class TestMetricsHistory(unittest.TestCase):
+    """Tests de l'historique multi-résolution des métriques."""
+
+    def test_rollups_and_resolution_choice(self) -> None:
+        """Vérifie les moyennes par intervalle et le choix de la résolution."""
+        history = MetricsHistory(resolutions=((1, 30), (10, 100)))
+        for t in range(100):
+            history.add(float(t), {"cpu_percent": float(t), "gpus": [], "ok": True})
+        self.assertEqual(history.metrics(), ["cpu_percent"])
+
+        recent = history.query(20, now=99.0)
+        self.assertEqual(recent["resolution"], 1, "La grille d'1 s couvre 20 s")
+        self.assertEqual(recent["metrics"]["cpu_percent"][0], [79.0, 79.0])
+
+        older = history.query(60, now=99.0)
+        self.assertEqual(older["resolution"], 10, "La grille d'1 s ne couvre plus 60 s")
+        self.assertEqual(older["metrics"]["cpu_percent"],
+                         [[40.0, 44.5], [50.0, 54.5], [60.0, 64.5], [70.0, 74.5], [80.0, 84.5], [90.0, 94.5]])
+
+        self.assertEqual(len(history.query(60, points=3, now=99.0)["metrics"]["cpu_percent"]), 3)
+        with self.assertRaises(ValueError):
+            history.query(60, mode="moyenne")
+        with self.assertRaises(ValueError):
+            MetricsHistory(resolutions=((0, 30),))
+
+    def test_fast_sampling_keeps_full_hour(self) -> None:
+        """Vérifie qu'un échantillonnage à 4 Hz couvre toujours 1 h à la seconde près."""
+        history = MetricsHistory()
+        for i in range(4 * 3600 + 4):
+            history.add(i * 0.25, {"cpu_percent": float(i % 4)})
+        hour = history.query(3600, now=3600.75)
+        self.assertEqual(hour["resolution"], 1, "La grille d'1 s couvre l'heure demandée")
+        series = hour["metrics"]["cpu_percent"]
+        self.assertEqual(len(series), 3600)
+        self.assertEqual((series[0][0], series[-1][0]), (1.0, 3600.0))
+        self.assertEqual({value for _, value in series}, {1.5}, "Moyenne des 4 échantillons de chaque seconde")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from utilities.metrics_registry import CallbackMetric, Counter, Histogram, MetricsRegistry
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Tests de l'exposition des métriques au format texte de Prometheus."""
+
+    def setUp(self) -> None:
+        """Crée un registre vide."""
+        self.registry = MetricsRegistry()
+
+    def test_counter_and_callback(self) -> None:
+        """Vérifie le rendu d'un compteur et d'une métrique lue à la collecte."""
+        counter = self.registry.register(Counter("requests_total", "Requêtes reçues.", ["path"]))
+        counter.inc(path="/logs")
+        counter.inc(2, path='/a"b\\c')
+        values = {("0",): 12.5, ("1",): None}
+        self.registry.register(CallbackMetric("gpu_percent", "Utilisation.", lambda: values, ["gpu"]))
+        self.assertEqual(self.registry.render(), (
+            "# HELP requests_total Requêtes reçues.\n"
+            "# TYPE requests_total counter\n"
+            'requests_total{path="/a\\"b\\\\c"} 2\n'
+            'requests_total{path="/logs"} 1\n'
+            "# HELP gpu_percent Utilisation.\n"
+            "# TYPE gpu_percent gauge\n"
+            'gpu_percent{gpu="0"} 12.5\n'
+        ))
+        with self.assertRaises(ValueError):
+            counter.inc(route="/logs")
+        with self.assertRaises(ValueError):
+            self.registry.register(Counter("requests_total", "Doublon."))
+
+    def test_histogram(self) -> None:
+        """Vérifie les effectifs cumulés, la somme et le nombre d'observations."""
+        histogram = self.registry.register(Histogram("latency_seconds", "Latence.", buckets=(0.1, 1)))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value)
+        self.assertEqual(histogram.render().splitlines()[2:], [
+            'latency_seconds_bucket{le="0.1"} 2',
+            'latency_seconds_bucket{le="1"} 3',
+            'latency_seconds_bucket{le="+Inf"} 4',
+            "latency_seconds_sum 3.65",
+            "latency_seconds_count 4",
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
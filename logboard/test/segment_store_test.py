@@ -0,0 +1,268 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+import unittest
+
+from model.log import Log
+from unittest import mock
+from datetime import datetime, timedelta
+from manager.log_manager import LogManager
+from manager.segment_store import SegmentStore
+
+
+class TestSegmentStore(unittest.TestCase):
+    """Tests pour le stockage des journaux en segments JSONL."""
+
+    def setUp(self) -> None:
+        """Crée un répertoire temporaire pour chaque test."""
+        self.test_dir = tempfile.mkdtemp()
+        self.segment_dir = os.path.join(self.test_dir, "segments")
+
+    def tearDown(self) -> None:
+        """Supprime le répertoire temporaire."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_create_log_appends_one_line(self) -> None:
+        """Vérifie qu'un nouveau journal ajoute exactement une ligne au segment."""
+        log_manager = LogManager(directory=self.test_dir, storage="segments")
+        log_manager.create_log(Log(level="INFO", message="Premier", module="test_module"))
+        log_manager.create_log(Log(level="ERROR", message="Second", module="test_module"))
+
+        segments = log_manager._store.segment_paths()
+        self.assertEqual(len(segments), 1, "Un seul segment devrait exister")
+        with open(segments[0], "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 2, "Chaque journal doit occuper une ligne")
+        self.assertEqual(json.loads(lines[1])["id"], "2", "L'ID du second journal est incorrect")
+        self.assertFalse(os.path.exists(log_manager.log_file), "logs.json ne doit pas être créé")
+
+    def test_read_update_delete(self) -> None:
+        """Vérifie la lecture, la mise à jour et la suppression en mode segments."""
+        log_manager = LogManager(directory=self.test_dir, storage="segments")
+        log_manager.create_log(Log(level="INFO", message="Test info", module="test_module"))
+        log_manager.create_log(Log(level="ERROR", message="Test erreur", module="test_module"))
+
+        self.assertEqual([log.message for log in log_manager.read_logs()], ["Test erreur", "Test info"])
+        self.assertEqual(len(log_manager.read_logs(filter_level="INFO")), 1)
+
+        self.assertTrue(log_manager.update_log("1", new_message="Modifié", new_context={"k": "v"}))
+        info = log_manager.read_logs(filter_level="INFO")[0]
+        self.assertEqual(info.message, "Modifié", "Le message n'a pas été mis à jour")
+        self.assertEqual(info.context, {"k": "v"}, "Le contexte n'a pas été mis à jour")
+
+        self.assertTrue(log_manager.delete_log("2"))
+        self.assertFalse(log_manager.delete_log("2"), "Une double suppression devrait échouer")
+        self.assertEqual(len(log_manager.read_logs()), 1, "Le journal n'a pas été supprimé")
+
+    def test_mutations_append_operations(self) -> None:
+        """Vérifie que mises à jour et suppressions sont ajoutées sans réécrire le segment."""
+        store = SegmentStore(self.segment_dir, compact_interval=None)
+        log_manager = LogManager(directory=self.test_dir, storage=store)
+        for i in range(3):
+            log_manager.create_log(Log(level="INFO", message=str(i), module="api"))
+        path = store.segment_paths()[0]
+        inode = os.stat(path).st_ino
+
+        self.assertTrue(log_manager.update_log("1", new_message="Modifié"))
+        self.assertTrue(log_manager.delete_log("3"))
+        self.assertFalse(log_manager.delete_log("3"), "Une double suppression devrait échouer")
+        self.assertEqual(os.stat(path).st_ino, inode, "Le segment ne doit pas être réécrit")
+        with open(path, "r", encoding="utf-8") as f:
+            operations = [json.loads(line) for line in f.read().splitlines()][3:]
+        self.assertEqual(operations, [{"op": "update", "id": "1", "fields": {"message": "Modifié"}},
+                                      {"op": "delete", "id": "3"}])
+
+        # Un autre processus voit les opérations en relisant les segments
+        other = LogManager(directory=self.test_dir, storage="segments")
+        self.assertEqual([log.message for log in other.read_logs()], ["1", "Modifié"])
+        self.assertEqual([r["message"] for r in store.iter_records()], ["Modifié", "1"])
+
+        log = Log(level="INFO", message="Nouveau", module="api")
+        other.create_log(log)
+        self.assertEqual(log.id, "4", "L'ID d'un journal supprimé ne doit pas être réutilisé")
+
+    def test_lost_sequence_file(self) -> None:
+        """Vérifie qu'un fichier sequence perdu est reconstruit sans réutiliser d'ID."""
+        store = SegmentStore(self.segment_dir, compact_interval=None)
+        store.append([{"id": None, "message": str(i)} for i in range(3)])
+        store.update("1", {"message": "Modifié"})  # Dernière ligne : opération sur un ancien ID
+        os.remove(os.path.join(self.segment_dir, "sequence"))
+        self.assertEqual(SegmentStore(self.segment_dir).next_id(), "4")
+        self.assertEqual(sorted(os.listdir(self.segment_dir))[-1], "sequence", "Aucun fichier temporaire ne reste")
+
+    def test_search_follows_operations(self) -> None:
+        """Vérifie que la recherche suit les mises à jour et suppressions, avant et après compaction."""
+        store = SegmentStore(self.segment_dir, compact_interval=None)
+        log_manager = LogManager(directory=self.test_dir, storage=store)
+        log_manager.create_log(Log(level="ERROR", message="Délai dépassé", module="api",
+                                   context={"error_code": 504}))
+        log_manager.create_log(Log(level="ERROR", message="Délai dépassé", module="api"))
+        self.assertEqual([log.id for log in log_manager.search("delai error_code=504")], ["1"])
+
+        log_manager.update_log("1", new_context={"error_code": 500})
+        log_manager.delete_log("2")
+        self.assertEqual(log_manager.search("delai error_code=504"), [])
+        store.compact()
+        self.assertEqual([log.id for log in log_manager.search("error_code=500")], ["1"])
+
+    def test_stats(self) -> None:
+        """Vérifie les statistiques par partition, opérations comprises."""
+        store = SegmentStore(self.segment_dir, partition="daily", compact_interval=None)
+        log_manager = LogManager(directory=self.test_dir, storage=store)
+        for day in (1, 1, 2, 3):
+            log_manager.create_log(Log(level="INFO", message="m", module="api",
+                                       timestamp=datetime(2025, 7, day, 12)))
+        log_manager.delete_log("2")
+        stats = log_manager.stats(bucket="1d")
+        self.assertEqual([(b["start"], b["total"]) for b in stats["buckets"]], [
+            ("2025-07-01T00:00:00", 1), ("2025-07-02T00:00:00", 1), ("2025-07-03T00:00:00", 1)
+        ])
+        with mock.patch.object(store, "_load", wraps=store._load) as load:
+            stats = log_manager.stats(bucket="1h", since="2025-07-03T00:00:00")
+        self.assertEqual(stats["total"], 1)
+        self.assertEqual([call.args[0] for call in load.call_args_list], ["20250703"])
+
+    def test_compaction(self) -> None:
+        """Vérifie la fusion des opérations et la conservation de la numérotation."""
+        store = SegmentStore(self.segment_dir, compact_interval=None)
+        log_manager = LogManager(directory=self.test_dir, storage=store)
+        for i in range(3):
+            log_manager.create_log(Log(level="INFO", message=str(i), module="api"))
+        log_manager.update_log("1", new_context={"k": "v"})
+        log_manager.delete_log("2")
+        log_manager.delete_log("3")
+
+        self.assertEqual(store.compact(), 3)
+        self.assertEqual(store.compact(), 0, "Rien ne reste à fusionner")
+        with open(store.segment_paths()[0], "r", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f.read().splitlines()]
+        self.assertEqual([line["id"] for line in lines], ["1", "3"])
+        self.assertEqual(lines[0]["context"], {"k": "v"})
+        self.assertEqual(lines[1], {"op": "delete", "id": "3"}, "La tombstone du plus grand ID est conservée")
+        self.assertEqual([log.id for log in log_manager.read_logs()], ["1"])
+        self.assertEqual(SegmentStore(self.segment_dir).next_id(), "4")
+
+    def test_background_compactor(self) -> None:
+        """Vérifie que le compacteur d'arrière-plan fusionne les opérations."""
+        store = SegmentStore(self.segment_dir, compact_interval=0.01)
+        store.append([{"id": None, "message": "a"}, {"id": None, "message": "b"}])
+        store.delete("1")
+        for _ in range(200):
+            with open(store.segment_paths()[0], "r", encoding="utf-8") as f:
+                if '"op"' not in f.read():
+                    break
+            time.sleep(0.01)
+        store.close()
+        self.assertEqual([r["id"] for r in store.iter_records()], ["2"])
+        with open(store.segment_paths()[0], "r", encoding="utf-8") as f:
+            self.assertNotIn('"op"', f.read(), "Les opérations n'ont pas été fusionnées")
+
+    def test_rotation(self) -> None:
+        """Vérifie qu'un nouveau segment est ouvert quand la taille maximale est atteinte."""
+        store = SegmentStore(self.segment_dir, max_segment_bytes=100)
+        for i in range(5):
+            store.append([{"id": str(i + 1), "message": "x" * 60}])
+        self.assertGreater(len(store.segment_paths()), 1, "Aucune rotation de segment")
+        self.assertEqual([r["id"] for r in store.iter_records()], ["1", "2", "3", "4", "5"])
+
+    def test_truncated_line_is_ignored(self) -> None:
+        """Vérifie qu'une ligne tronquée est ignorée puis isolée au prochain ajout."""
+        store = SegmentStore(self.segment_dir)
+        store.append([{"id": "1", "message": "ok"}])
+        with open(store.segment_paths()[0], "a", encoding="utf-8") as f:
+            f.write('{"id": "2", "mess')
+        self.assertEqual(len(list(store.iter_records())), 1)
+
+        store.append([{"id": "3", "message": "après"}])
+        self.assertEqual([r["id"] for r in store.iter_records()], ["1", "3"])
+        self.assertEqual(store.next_id(), "4", "L'ID suivant doit suivre le dernier journal")
+
+    def test_migration_from_json(self) -> None:
+        """Vérifie la migration unique d'un logs.json existant vers les segments."""
+        legacy = LogManager(directory=self.test_dir)
+        legacy.create_log(Log(level="INFO", message="Ancien 1", module="test_module"))
+        legacy.create_log(Log(level="WARNING", message="Ancien 2", module="test_module"))
+
+        log_manager = LogManager(directory=self.test_dir, storage="segments")
+        self.assertFalse(os.path.exists(legacy.log_file), "logs.json aurait dû être renommé")
+        self.assertTrue(os.path.exists(legacy.log_file + ".migrated"))
+        self.assertEqual(len(log_manager.read_logs()), 2, "Les journaux n'ont pas été migrés")
+
+        log = Log(level="INFO", message="Nouveau", module="test_module")
+        log_manager.create_log(log)
+        self.assertEqual(log.id, "3", "Les IDs doivent continuer après la migration")
+
+    def test_time_partitions(self) -> None:
+        """Vérifie le rangement des journaux dans des partitions horaires."""
+        store = SegmentStore(self.segment_dir, partition="hourly")
+        log_manager = LogManager(directory=self.test_dir, storage=store)
+        for hour in (8, 9, 9, 11):
+            log_manager.create_log(Log(level="INFO", message=str(hour), module="api",
+                                       timestamp=datetime(2025, 7, 10, hour, 30)))
+        names = [os.path.basename(path) for path in store.segment_paths()]
+        self.assertEqual(names, ["segment-2025071008-000001.jsonl", "segment-2025071009-000001.jsonl",
+                                 "segment-2025071011-000001.jsonl"])
+        self.assertEqual([log.message for log in log_manager.read_logs()], ["11", "9", "9", "8"])
+
+        # Un journal en retard rejoint sa partition sans réutiliser d'ID
+        late = Log(level="INFO", message="retard", module="api", timestamp=datetime(2025, 7, 10, 8, 45))
+        log_manager.create_log(late)
+        self.assertEqual(late.id, "5")
+        self.assertEqual(len(store.segment_paths()), 3)
+        self.assertEqual(log_manager.read_logs()[-2].message, "retard")
+
+    def test_range_reads_open_overlapping_partitions(self) -> None:
+        """Vérifie qu'une lecture bornée ne charge que les partitions concernées."""
+        store = SegmentStore(self.segment_dir, partition="daily")
+        log_manager = LogManager(directory=self.test_dir, storage=store)
+        for day in range(1, 11):
+            log_manager.create_log(Log(level="INFO", message=str(day), module="api",
+                                       timestamp=datetime(2025, 7, day, 12)))
+
+        with mock.patch.object(store, "_load", wraps=store._load) as load:
+            page, _ = log_manager.query_logs(since="2025-07-03T00:00:00", until="2025-07-04T23:59:59")
+        self.assertEqual([log.message for log in page], ["4", "3"])
+        self.assertEqual(sorted(call.args[0] for call in load.call_args_list), ["20250703", "20250704"])
+
+        with mock.patch.object(store, "_load", wraps=store._load) as load:
+            page, cursor = log_manager.query_logs(limit=1)
+        self.assertEqual([log.message for log in page], ["10"])
+        # limit + 1 journaux sont lus pour savoir s'il reste une page
+        self.assertEqual([call.args[0] for call in load.call_args_list], ["20250710", "20250709"],
+                         "Une page récente ne doit pas charger les anciennes partitions")
+        page, _ = log_manager.query_logs(limit=2, before=cursor)
+        self.assertEqual([log.message for log in page], ["9", "8"])
+
+    def test_retention(self) -> None:
+        """Vérifie que la rétention supprime des segments entiers, par âge puis par taille."""
+        store = SegmentStore(self.segment_dir, partition="daily")
+        for day in range(1, 6):
+            store.append([{"id": None, "timestamp": datetime(2025, 7, day, 12).isoformat(),
+                           "level": "INFO", "module": "api", "message": "x" * 50, "context": {}}])
+        self.assertEqual(len(store.query()), 5)
+
+        removed = store.apply_retention(max_age=timedelta(days=2), now=datetime(2025, 7, 5, 18))
+        self.assertEqual([os.path.basename(path) for path in removed],
+                         ["segment-20250701-000001.jsonl", "segment-20250702-000001.jsonl"])
+        self.assertEqual([record["id"] for record in store.query()], ["5", "4", "3"])
+
+        size = os.path.getsize(store.segment_paths()[-1])
+        store.apply_retention(max_bytes=size * 2)
+        self.assertEqual([record["id"] for record in store.query()], ["5", "4"])
+        store.apply_retention(max_bytes=1)
+        self.assertEqual([record["id"] for record in store.query()], ["5"], "Le dernier segment est conservé")
+
+    def test_retention_on_rotation(self) -> None:
+        """Vérifie que la rétention configurée s'applique à l'ouverture d'un segment."""
+        store = SegmentStore(self.segment_dir, max_segment_bytes=100, partition=None, max_bytes=250)
+        for i in range(10):
+            store.append([{"id": None, "message": "x" * 60}])
+        self.assertLessEqual(sum(os.path.getsize(path) for path in store.segment_paths()), 250 + 100)
+        self.assertEqual(store.query()[0]["id"], "10")
+        self.assertEqual(store.next_id(), "11")
+
+
+if __name__ == "__main__":
+    unittest.main()
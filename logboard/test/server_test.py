@@ -0,0 +1,453 @@
+import io
+import os
+import csv
+import gzip
+import json
+import time
+import shutil
+import tempfile
+import unittest
+
+from unittest import mock
+from model.log import Log
+from datetime import datetime
+from interface import server
+from manager.log_manager import LogManager
+from utilities.metrics_history import MetricsHistory
+from utilities.system_monitor import ProcessMonitor
+
+
+class TestServer(unittest.TestCase):
+    """Tests des routes HTTP du serveur de journaux."""
+
+    def setUp(self) -> None:
+        """Remplace le gestionnaire du serveur par un gestionnaire temporaire."""
+        self.test_dir = tempfile.mkdtemp()
+        self.original_manager = server.log_manager
+        server.log_manager = LogManager(directory=self.test_dir, storage="segments")
+        self.client = server.app.test_client()
+
+    def tearDown(self) -> None:
+        """Restaure le gestionnaire d'origine et supprime le répertoire temporaire."""
+        server.log_manager = self.original_manager
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def add_logs(self, count: int) -> None:
+        """Ajoute ``count`` journaux espacés d'une minute."""
+        for i in range(count):
+            server.log_manager.create_log(Log(
+                level="ERROR" if i % 2 else "INFO",
+                message=f"message {i}",
+                module="auth" if i < 10 else "api",
+                timestamp=datetime(2025, 7, 10, 8, i)
+            ))
+
+    def test_get_logs_without_pagination(self) -> None:
+        """Vérifie que /logs sans paramètre retourne toute la liste."""
+        self.add_logs(5)
+        response = self.client.get("/logs")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 5)
+        self.assertNotIn("X-Next-Cursor", response.headers)
+
+    def test_get_logs_pages(self) -> None:
+        """Vérifie la pagination par curseur et les filtres de /logs."""
+        self.add_logs(20)
+        response = self.client.get("/logs?limit=8&module=api")
+        self.assertEqual([log["message"] for log in response.get_json()],
+                         [f"message {i}" for i in range(19, 11, -1)])
+        cursor = response.headers["X-Next-Cursor"]
+
+        response = self.client.get(f"/logs?limit=8&module=api&before={cursor}")
+        self.assertEqual([log["message"] for log in response.get_json()], ["message 11", "message 10"])
+        self.assertNotIn("X-Next-Cursor", response.headers)
+
+        response = self.client.get("/logs?level=ERROR&since=2025-07-10T08:03:00&until=2025-07-10T08:07:00")
+        self.assertEqual([log["message"] for log in response.get_json()],
+                         ["message 7", "message 5", "message 3"])
+
+    def test_get_logs_search(self) -> None:
+        """Vérifie la recherche plein texte avec le paramètre q."""
+        self.add_logs(3)
+        server.log_manager.create_log(Log(level="ERROR", message="Délai dépassé (timeout)", module="api",
+                                          context={"error_code": 504}))
+        response = self.client.get("/logs?q=timeout error_code=504")
+        self.assertEqual([log["message"] for log in response.get_json()], ["Délai dépassé (timeout)"])
+        response = self.client.get("/logs?q=message&limit=2")
+        self.assertEqual([log["message"] for log in response.get_json()], ["message 2", "message 1"])
+        self.assertIn("X-Next-Cursor", response.headers)
+
+    def test_get_logs_stats(self) -> None:
+        """Vérifie l'histogramme de /logs/stats et ses filtres."""
+        self.add_logs(20)
+        stats = self.client.get("/logs/stats?bucket=5m").get_json()
+        self.assertEqual(stats["total"], 20)
+        self.assertEqual(stats["levels"], {"INFO": 10, "ERROR": 10})
+        self.assertEqual([(b["start"], b["total"]) for b in stats["buckets"]], [
+            ("2025-07-10T08:00:00", 5), ("2025-07-10T08:05:00", 5),
+            ("2025-07-10T08:10:00", 5), ("2025-07-10T08:15:00", 5)
+        ])
+        stats = self.client.get("/logs/stats?bucket=1h&module=api&level=ERROR").get_json()
+        self.assertEqual(stats["buckets"], [{"start": "2025-07-10T08:00:00", "total": 5,
+                                             "levels": {"ERROR": 5}, "modules": {"api": 5}}])
+        server.log_manager.delete_log("20")
+        self.assertEqual(self.client.get("/logs/stats").get_json()["total"], 19)
+        self.assertEqual(self.client.get("/logs/stats?bucket=1w").status_code, 400)
+
+    def test_export_logs(self) -> None:
+        """Vérifie l'export NDJSON et CSV filtré, lu par pages."""
+        self.add_logs(20)
+        with mock.patch.object(server.log_manager, "query_records", wraps=server.log_manager.query_records) as query:
+            with mock.patch.object(server, "EXPORT_PAGE_SIZE", 3):
+                response = self.client.get("/logs/export?module=api&level=ERROR")
+                lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        self.assertEqual([json.loads(line)["message"] for line in lines],
+                         ["message 19", "message 17", "message 15", "message 13", "message 11"])
+        self.assertEqual(query.call_count, 2, "Les journaux doivent être lus par pages")
+
+        response = self.client.get("/logs/export?format=csv&since=2025-07-10T08:18:00")
+        rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+        self.assertEqual(rows[0], server.EXPORT_COLUMNS)
+        self.assertEqual([row[4] for row in rows[1:]], ["message 19", "message 18"])
+        self.assertEqual(json.loads(rows[1][5]), {})
+
+        response = self.client.get("/logs/export", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(len(gzip.decompress(response.get_data()).splitlines()), 20)
+
+        self.assertEqual(self.client.get("/logs/export?format=xml").status_code, 400)
+        self.assertEqual(self.client.get("/logs/export?since=hier").status_code, 400)
+
+    def test_create_logs_batch(self) -> None:
+        """Vérifie l'écriture d'un lot en tableau JSON, en NDJSON et compressé en gzip."""
+        response = self.client.post("/logs/batch", json=[
+            {"level": "info", "message": "premier", "module": "agent", "timestamp": "2025-07-10T08:00:00"},
+            {"level": "ERROR", "message": "second", "context": {"job": 3}, "id": "999"},
+        ])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.get_json()["count"], 2)
+        first_id, second_id = response.get_json()["ids"]
+        self.assertEqual(server.log_manager.get_log(first_id).level, "INFO")
+        second = server.log_manager.get_log(second_id)
+        self.assertEqual((second.module, second.context), ("unknown", {"job": 3}))
+        self.assertNotEqual(second_id, "999", "L'ID est attribué par le serveur")
+
+        lines = "\n".join(json.dumps({"level": "DEBUG", "message": f"ligne {i}"}) for i in range(100)) + "\n\n"
+        response = self.client.post("/logs/batch", data=gzip.compress(lines.encode("utf-8")),
+                                    headers={"Content-Encoding": "gzip", "Content-Type": "application/x-ndjson"})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(server.log_manager.read_logs()), 102)
+
+        received = [{"id": "1", "level": "INFO", "message": "reçu"}, {"id": "2", "level": "INFO", "message": "reçu"}]
+        ids = self.client.post("/logs/batch?node=node-a", json=received).get_json()["ids"]
+        response = self.client.post("/logs/batch?node=node-a", json=received + received)
+        self.assertEqual(response.get_json(), {"count": 0, "ids": ids + ids, "duplicates": 4},
+                         "Un doublon renvoie l'ID du journal déjà enregistré")
+
+    def test_create_logs_batch_is_atomic(self) -> None:
+        """Vérifie qu'un lot contenant un journal invalide est refusé en entier."""
+        response = self.client.post("/logs/batch", json=[
+            {"level": "INFO", "message": "valide"},
+            {"level": "FATAL", "message": "niveau inconnu"},
+            {"level": "INFO"},
+            "texte",
+            {"level": "INFO", "message": "date", "timestamp": "hier"},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([e["index"] for e in response.get_json()["errors"]], [1, 2, 3, 4])
+        self.assertEqual(server.log_manager.read_logs(), [], "Rien n'est écrit")
+
+        self.assertEqual(self.client.post("/logs/batch", data='{"level": "INFO"\n').status_code, 400)
+        self.assertEqual(self.client.post("/logs/batch", data=b"pas du gzip",
+                                          headers={"Content-Encoding": "gzip"}).status_code, 400)
+        self.assertEqual(self.client.post("/logs/batch", data=b"[]",
+                                          headers={"Content-Encoding": "br"}).status_code, 415)
+        bomb = gzip.compress(b"[" + b" " * 2048 + b"]")
+        with mock.patch.object(server, "BATCH_MAX_BYTES", 1024):
+            response = self.client.post("/logs/batch", data=bomb, headers={"Content-Encoding": "gzip"})
+            self.assertEqual(response.status_code, 413)
+        with mock.patch.object(server, "BATCH_MAX_LOGS", 1):
+            response = self.client.post("/logs/batch", json=[{"level": "INFO", "message": "a"}] * 2)
+            self.assertEqual(response.status_code, 413)
+
+    def test_metrics(self) -> None:
+        """Vérifie l'exposition des métriques au format texte de Prometheus."""
+        self.add_logs(3)
+        self.client.get("/logs?limit=2")
+        sample = {"cpu_percent": 12.5, "ram_percent": 40.0, "gpus": [{"index": 0, "gpu_percent": 30.0,
+                                                                      "memory_percent": None}]}
+        with mock.patch.object(server.performance_sampler, "snapshot", return_value=sample):
+            response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain; version=0.0.4"))
+        lines = response.get_data(as_text=True).splitlines()
+        for line in ("logboard_cpu_percent 12.5",
+                     'logboard_gpu_percent{gpu="0"} 30',
+                     'logboard_logs_ingested_total{level="ERROR",module="auth"} 1',
+                     'logboard_logs_ingested_total{level="INFO",module="auth"} 2',
+                     "logboard_log_queue_depth 0",
+                     "# TYPE logboard_http_request_duration_seconds histogram"):
+            self.assertIn(line, lines)
+        self.assertFalse([l for l in lines if l.startswith("logboard_gpu_memory_percent{")],
+                         "Une mesure indisponible est omise")
+        self.assertTrue([l for l in lines if l.startswith("logboard_http_request_duration_seconds_count{")
+                         and 'route="/logs"' in l and 'status="200"' in l])
+
+    def test_get_logs_invalid_parameters(self) -> None:
+        """Vérifie qu'un paramètre invalide retourne une erreur 400."""
+        for query in ("limit=abc", "limit=-1", "since=hier", "before=%%%"):
+            response = self.client.get(f"/logs?{query}")
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn("error", response.get_json())
+
+    def test_performance_history(self) -> None:
+        """Vérifie la lecture de l'historique des performances et ses paramètres."""
+        history = MetricsHistory()
+        now = time.time()
+        for i in range(120):
+            history.add(now - 119 + i, {"cpu_percent": float(i), "ram_percent": 50.0})
+        with mock.patch.object(server, "performance_history", history), \
+                mock.patch.object(server.performance_sampler, "start"):
+            response = self.client.get("/performance/history?range=1h&points=10&metrics=cpu_percent")
+            self.assertEqual(response.status_code, 200)
+            data = response.get_json()
+            self.assertEqual(data["resolution"], 1)
+            self.assertEqual(list(data["metrics"]), ["cpu_percent"])
+            self.assertEqual(len(data["metrics"]["cpu_percent"]), 10)
+            self.assertEqual(data["metrics"]["cpu_percent"][-1][1], 119.0)
+            for query in ("range=abc", "points=0", "points=x", "mode=moyenne"):
+                self.assertEqual(self.client.get(f"/performance/history?{query}").status_code, 400, query)
+
+    def test_process_registration(self) -> None:
+        """Vérifie l'enregistrement et le retrait d'un processus suivi."""
+        with mock.patch.object(server, "process_monitor", ProcessMonitor(top=0)):
+            response = self.client.post("/performance/processes", json={"pid": os.getpid(), "name": "worker"})
+            self.assertEqual(response.status_code, 201)
+            with mock.patch.object(server.performance_sampler, "snapshot",
+                                   return_value={"processes": server.process_monitor.processes()}):
+                data = self.client.get("/performance/processes").get_json()
+            self.assertEqual(data["registered"], [os.getpid()])
+            self.assertEqual(data["processes"][0]["name"], "worker")
+            for body in ({"pid": "abc"}, {}, {"pid": 2 ** 22 + 1}):
+                self.assertEqual(self.client.post("/performance/processes", json=body).status_code, 400, body)
+            self.assertEqual(self.client.delete(f"/performance/processes/{os.getpid()}").status_code, 200)
+            self.assertEqual(self.client.delete(f"/performance/processes/{os.getpid()}").status_code, 404)
+
+    def test_log_manager_is_opened_on_first_use(self) -> None:
+        """Vérifie que le stockage n'est ouvert qu'au premier usage, dans LOGBOARD_DIRECTORY."""
+        directory = os.path.join(self.test_dir, "lazy")
+        server.log_manager = None
+        with mock.patch.dict(os.environ, {"LOGBOARD_DIRECTORY": directory, "LOGBOARD_STORAGE": "segments"}):
+            self.assertFalse(os.path.exists(directory))
+            self.assertEqual(self.client.get("/logs").get_json(), [])
+            self.assertTrue(os.path.isdir(os.path.join(directory, "segments")))
+        self.assertIs(server.get_log_manager(), server.log_manager)
+        server.log_manager.close()
+
+    def test_production_start(self) -> None:
+        """Vérifie le lancement en production et l'écriture des journaux en attente à l'arrêt."""
+        server.log_manager = LogManager(directory=self.test_dir, storage="segments", buffered=True)
+        server.log_manager.create_logs([Log(level="INFO", message=f"m{i}", module="api") for i in range(3)])
+
+        def serve(app, host, port, **options):
+            options["on_stop"]()
+            self.assertEqual((app, host, port, options["workers"], options["keepalive"]),
+                             (server.app, "127.0.0.1", 0, 4, 0))
+
+        with mock.patch.object(server, "serve", side_effect=serve) as serve_mock, \
+                mock.patch.object(server.performance_sampler, "start"), \
+                mock.patch.object(server.performance_sampler, "stop") as stop, \
+                mock.patch.object(server.socketio.server.eio, "disconnect") as disconnect:
+            server.start_server("127.0.0.1", 0, production=True, workers=4, keepalive=0)
+        self.assertEqual(serve_mock.call_count, 1)
+        self.assertFalse(server.app.debug)
+        disconnect.assert_called_once_with()
+        self.assertTrue(stop.called)
+        self.assertEqual(len(LogManager(directory=self.test_dir, storage="segments").read_logs()), 3)
+
+
+class TestLogStream(unittest.TestCase):
+    """Tests du suivi en direct des journaux par Socket.IO."""
+
+    def setUp(self) -> None:
+        """Remplace le gestionnaire du serveur et intercepte les envois Socket.IO."""
+        self.test_dir = tempfile.mkdtemp()
+        self.original_manager = server.log_manager
+        server.log_manager = LogManager(directory=self.test_dir, storage="segments")
+        for target, name in ((server, "start_log_stream"), (server.socketio, "emit")):
+            patcher = mock.patch.object(target, name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(server.log_subscriptions.clear)
+
+    def tearDown(self) -> None:
+        """Restaure le gestionnaire d'origine et supprime le répertoire temporaire."""
+        server.log_manager = self.original_manager
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def call(self, handler, *args, sid: str = "client"):
+        """Appelle un gestionnaire d'événement Socket.IO pour le client ``sid``."""
+        with server.app.test_request_context():
+            server.request.sid = sid
+            return handler(*args)
+
+    def create_log(self, minute: int, level: str = "INFO") -> None:
+        """Ajoute un journal horodaté à la minute ``minute``."""
+        server.log_manager.create_log(Log(level=level, message=f"message {minute}", module="auth",
+                                          timestamp=datetime(2025, 7, 10, 8, minute)))
+
+    def pushed(self) -> dict:
+        """Pousse les nouveaux journaux et retourne les messages envoyés à chaque client."""
+        server.socketio.emit.reset_mock()
+        server.push_new_logs()
+        batches = {}
+        for call in server.socketio.emit.call_args_list:
+            self.assertEqual(call.args[0], "logs")
+            batches.setdefault(call.kwargs["to"], []).append([log["message"] for log in call.args[1]["logs"]])
+        return batches
+
+    def test_push_only_new_matching_logs(self) -> None:
+        """Vérifie que seuls les nouveaux journaux correspondant aux filtres sont poussés."""
+        for minute in range(4):
+            self.create_log(minute)
+        ack = self.call(server.handle_subscribe_logs, {"level": "ERROR", "q": "message"})
+        self.assertIn("cursor", ack)
+        self.call(server.handle_subscribe_logs, {}, sid="other")
+        self.assertEqual(self.pushed(), {}, "Les journaux existants ne doivent pas être renvoyés")
+
+        for minute in range(4, 8):
+            self.create_log(minute, "ERROR" if minute % 2 else "INFO")
+        self.assertEqual(self.pushed(), {
+            "client": [["message 7", "message 5"]],
+            "other": [["message 7", "message 6", "message 5", "message 4"]],
+        }, "Les nouveaux journaux doivent être regroupés en un lot par client")
+        self.assertEqual(self.pushed(), {})
+
+    def test_resume_from_cursor(self) -> None:
+        """Vérifie qu'un client reconnecté ne reçoit que les journaux manqués."""
+        self.create_log(0)
+        cursor = self.call(server.handle_subscribe_logs, {})["cursor"]
+        self.call(server.handle_disconnect, "client disconnect")
+        self.assertEqual(server.log_subscriptions, {})
+        self.create_log(1)
+        self.assertEqual(self.pushed(), {})
+
+        self.call(server.handle_subscribe_logs, {"after": cursor})
+        self.assertEqual(self.pushed(), {"client": [["message 1"]]})
+
+    def test_burst_is_split_in_batches(self) -> None:
+        """Vérifie qu'une rafale est envoyée en lots bornés, sans perte."""
+        self.call(server.handle_subscribe_logs, {})
+        for minute in range(5):
+            self.create_log(minute)
+        with mock.patch.object(server, "LOG_STREAM_BATCH", 2):
+            self.assertEqual(self.pushed(), {"client": [["message 1", "message 0"]]})
+            self.assertEqual(self.pushed(), {"client": [["message 3", "message 2"]]})
+            self.assertEqual(self.pushed(), {"client": [["message 4"]]})
+
+    def test_subscribe_invalid_cursor(self) -> None:
+        """Vérifie qu'un curseur invalide est refusé."""
+        ack = self.call(server.handle_subscribe_logs, {"after": "%%%"})
+        self.assertIn("error", ack)
+        self.assertEqual(server.log_subscriptions, {})
+
+class TestPerformanceStream(unittest.TestCase):
+    """Tests de la diffusion des performances par Socket.IO."""
+
+    def setUp(self) -> None:
+        """Fige l'échantillonneur et intercepte les envois Socket.IO."""
+        sample = {"cpu_percent": 10.0, "ram_percent": 50.0, "gpus": []}
+        for target, name, kwargs in ((server.performance_sampler, "start", {}),
+                                     (server.performance_sampler, "snapshot", {"return_value": sample}),
+                                     (server.performance_sampler, "sampled_at", {"new": 100.0}),
+                                     (server.performance_sampler, "interval", {"new": 1.0}),
+                                     (server.socketio, "emit", {}),
+                                     (server, "emit", {})):
+            patcher = mock.patch.object(target, name, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(server.performance_subscriptions.clear)
+
+    def call(self, handler, *args, sid: str = "client"):
+        """Appelle un gestionnaire d'événement Socket.IO pour le client ``sid``."""
+        with server.app.test_request_context():
+            server.request.sid = sid
+            return handler(*args)
+
+    def frames(self, *samples) -> dict:
+        """Diffuse des échantillons (horodatage, valeurs) et retourne les trames envoyées à chaque client."""
+        server.socketio.emit.reset_mock()
+        for timestamp, sample in samples:
+            server.broadcast_performance(timestamp, sample)
+        frames = {}
+        for call in server.socketio.emit.call_args_list:
+            self.assertEqual(call.args[0], "performance")
+            frames.setdefault(call.kwargs["to"], []).append(call.args[1]["samples"])
+        return frames
+
+    def test_idle_without_subscribers(self) -> None:
+        """Vérifie que rien n'est envoyé sans abonné."""
+        self.assertEqual(self.frames((101.0, {"cpu_percent": 90.0})), {})
+
+    def test_delta_encoding(self) -> None:
+        """Vérifie que seules les métriques modifiées au-delà du seuil sont envoyées."""
+        ack = self.call(server.handle_subscribe_performance, {"interval": 1, "threshold": 1})
+        self.assertEqual(ack, {"interval": 1.0, "threshold": 1.0})
+        first = server.emit.call_args.args[1]["samples"]
+        self.assertEqual(first[0]["values"]["cpu_percent"], 10.0, "L'échantillon courant est envoyé aussitôt")
+
+        frames = self.frames((101.0, {"cpu_percent": 10.5, "ram_percent": 55.0, "gpus": []}),
+                             (102.0, {"cpu_percent": 11.2, "ram_percent": 55.0, "gpus": [{"index": 0}]}))
+        self.assertEqual(frames["client"], [
+            [{"timestamp": 101.0, "values": {"ram_percent": 55.0}}],
+            [{"timestamp": 102.0, "values": {"cpu_percent": 11.2, "gpus": [{"index": 0}]}}],
+        ], "Une dérive lente (10 -> 10.5 -> 11.2) est envoyée une fois le seuil dépassé")
+
+    def test_client_rates_and_batching(self) -> None:
+        """Vérifie la cadence propre à chaque client et le groupement des échantillons rapprochés."""
+        self.call(server.handle_subscribe_performance, {"interval": 0.25}, sid="fast")
+        self.call(server.handle_subscribe_performance, {"interval": 2, "threshold": 0}, sid="slow")
+        self.assertEqual(server.performance_sampler.interval, 0.25, "L'échantillonnage suit le client le plus rapide")
+
+        samples = [(100.0 + i * 0.25, {"cpu_percent": float(i * 10)}) for i in range(1, 9)]
+        frames = self.frames(*samples)
+        self.assertEqual([[s["timestamp"] for s in frame] for frame in frames["fast"]],
+                         [[100.25, 100.5, 100.75, 101.0], [101.25, 101.5, 101.75, 102.0]],
+                         "Les échantillons rapides sont groupés par trame")
+        self.assertEqual(frames["slow"], [[{"timestamp": 102.0, "values": {"cpu_percent": 80.0}}]])
+
+        self.call(server.handle_unsubscribe_performance, sid="fast")
+        self.call(server.handle_disconnect, "client disconnect", sid="slow")
+        self.assertEqual(server.performance_sampler.interval, server.SAMPLE_INTERVAL)
+        self.assertEqual(server.performance_subscriptions, {})
+
+    def test_processes_scanned_only_when_read(self) -> None:
+        """Vérifie que les processus ne sont parcourus que pour un abonné ou une lecture récente."""
+        with mock.patch.object(server, "get_system_performance", return_value={}) as measure, \
+                mock.patch.object(server, "_processes_read_at", float("-inf")):
+            server.sample_performance(None)
+            self.assertIsNone(measure.call_args.kwargs["process_monitor"], "Personne ne lit les processus")
+
+            self.call(server.handle_subscribe_performance, {"interval": 1})
+            server.sample_performance(None)
+            self.assertIs(measure.call_args.kwargs["process_monitor"], server.process_monitor)
+            self.call(server.handle_unsubscribe_performance)
+
+            with mock.patch.object(server.process_monitor, "processes", return_value=[{"pid": 1}]) as processes:
+                data = server.app.test_client().get("/performance/processes").get_json()
+            self.assertEqual(data["processes"], [{"pid": 1}], "Mesure à la demande pendant la pause")
+            processes.assert_called_once()
+            server.sample_performance(None)
+            self.assertIs(measure.call_args.kwargs["process_monitor"], server.process_monitor,
+                          "Le parcours reprend après une lecture")
+
+    def test_subscribe_invalid_parameters(self) -> None:
+        """Vérifie qu'un paramètre invalide est refusé sans enregistrer d'abonnement."""
+        for data in ({"interval": 0.01}, {"interval": "vite"}, {"threshold": -1}, {"interval": None}):
+            self.assertIn("error", self.call(server.handle_subscribe_performance, data), data)
+        self.assertEqual(server.performance_subscriptions, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import multiprocessing
+
+from model.log import Log
+from manager.log_index import node_term
+from datetime import datetime, timedelta
+from manager.log_manager import LogManager
+from manager.sqlite_store import SqliteStore
+
+
+def write_logs(directory: str, worker: int, count: int) -> None:
+    """Écrit ``count`` journaux depuis un processus séparé."""
+    log_manager = LogManager(directory=directory, storage="sqlite")
+    for i in range(count):
+        log_manager.create_log(Log(level="INFO", message=f"{worker}-{i}", module=f"worker{worker}"))
+    log_manager.close()
+
+
+class TestSqliteStore(unittest.TestCase):
+    """Tests pour le stockage SQLite des journaux."""
+
+    def setUp(self) -> None:
+        """Crée un répertoire temporaire et un gestionnaire SQLite."""
+        self.test_dir = tempfile.mkdtemp()
+        self.log_manager = LogManager(directory=self.test_dir, storage="sqlite")
+
+    def tearDown(self) -> None:
+        """Ferme la base et supprime le répertoire temporaire."""
+        self.log_manager.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_wal_mode_and_indexes(self) -> None:
+        """Vérifie le mode WAL et l'utilisation des index pour les lectures filtrées."""
+        store = self.log_manager._store
+        conn = store._connection()
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        plan = " ".join(str(row) for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM logs WHERE level = ? ORDER BY timestamp DESC, id DESC",
+            ("INFO",)
+        ))
+        self.assertIn("idx_logs_level_timestamp", plan, "La lecture par niveau doit utiliser l'index")
+
+    def test_crud(self) -> None:
+        """Vérifie la création, la lecture, la mise à jour et la suppression."""
+        log = Log(level="INFO", message="Initial", module="auth", context={"user": "alice"})
+        self.log_manager.create_log(log)
+        self.log_manager.create_log(Log(level="ERROR", message="Erreur", module="database"))
+        self.assertEqual(log.id, "1")
+
+        self.assertEqual(self.log_manager.get_log("1").context, {"user": "alice"})
+        self.assertIsNone(self.log_manager.get_log("999"))
+        self.assertEqual([l.message for l in self.log_manager.read_logs()], ["Erreur", "Initial"])
+        self.assertEqual([l.message for l in self.log_manager.read_logs(module="database")], ["Erreur"])
+
+        self.assertTrue(self.log_manager.update_log("1", new_message="Modifié"))
+        self.assertEqual(self.log_manager.get_log("1").message, "Modifié")
+        self.assertFalse(self.log_manager.update_log("999", new_message="Absent"))
+
+        self.assertTrue(self.log_manager.delete_log("2"))
+        self.assertFalse(self.log_manager.delete_log("2"))
+        new_log = Log(level="INFO", message="Après suppression", module="auth")
+        self.log_manager.create_log(new_log)
+        self.assertEqual(new_log.id, "3", "Un ID supprimé ne doit pas être réutilisé")
+
+    def test_query_pages(self) -> None:
+        """Vérifie la pagination par curseur et les bornes temporelles en SQL."""
+        for i in range(12):
+            self.log_manager.create_log(Log(level="WARNING", message=str(i), module="api",
+                                            timestamp=datetime(2025, 7, 10, 8, i)))
+        page, cursor = self.log_manager.query_logs(limit=5)
+        self.assertEqual([log.message for log in page], ["11", "10", "9", "8", "7"])
+        page, cursor = self.log_manager.query_logs(limit=5, before=cursor)
+        self.assertEqual([log.message for log in page], ["6", "5", "4", "3", "2"])
+        page, cursor = self.log_manager.query_logs(limit=5, before=cursor)
+        self.assertEqual([log.message for log in page], ["1", "0"])
+        self.assertIsNone(cursor)
+
+        page, _ = self.log_manager.query_logs(since="2025-07-10T08:03:00", until="2025-07-10T08:04:00")
+        self.assertEqual([log.message for log in page], ["4", "3"])
+
+    def test_search(self) -> None:
+        """Vérifie la recherche plein texte et la mise à jour de l'index des termes."""
+        self.log_manager.create_log(Log(level="ERROR", message="Connexion refusée", module="auth",
+                                        context={"user_id": "alice"}))
+        self.log_manager.create_log(Log(level="INFO", message="Connexion réussie", module="auth",
+                                        context={"user_id": "bob"}))
+        self.assertEqual([log.id for log in self.log_manager.search("connexion")], ["2", "1"])
+        self.assertEqual([log.id for log in self.log_manager.search("connexion user_id=alice")], ["1"])
+        self.assertEqual([log.id for log in self.log_manager.search("reussie", level="ERROR")], [])
+
+        self.log_manager.update_log("2", new_message="Déconnexion")
+        self.assertEqual([log.id for log in self.log_manager.search("connexion")], ["1"])
+        self.log_manager.delete_log("1")
+        self.assertEqual(self.log_manager.search("refusee"), [])
+        count = self.log_manager._store._connection().execute("SELECT COUNT(*) FROM log_terms").fetchone()[0]
+        self.assertEqual(count, 3, "Seuls les termes du journal restant doivent subsister")
+
+    def test_node(self) -> None:
+        """Vérifie la conservation et la recherche de la machine d'origine."""
+        self.log_manager.create_logs([
+            Log(level="INFO", message="Reçu", module="cleaner", node="node-a", source_id="7"),
+            Log(level="INFO", message="Local", module="cleaner")
+        ])
+        self.assertEqual(self.log_manager.get_log("1").source_id, "7")
+        self.assertIsNone(self.log_manager.get_log("2").node)
+        self.assertEqual([log.id for log in self.log_manager.query_logs(node="Node-A")[0]], ["1"])
+        self.log_manager.create_log(Log(level="INFO", message="Local", module="cleaner", context={"node": "node-a"}))
+        self.assertEqual([log.id for log in self.log_manager.query_logs(node="node-a")[0]], ["1"])
+
+    def test_node_source_is_unique(self) -> None:
+        """Vérifie la recherche des journaux d'agent déjà reçus et leur unicité."""
+        received = [Log(level="INFO", message="Reçu", module="cleaner", node="node-a", source_id=str(i))
+                    for i in range(3)]
+        self.log_manager.create_logs(received[:2])
+        self.assertEqual(self.log_manager.stored_sources("node-a", received), {"0": "1", "1": "2"})
+        self.assertEqual(self.log_manager.stored_sources("node-b", received), {})
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.log_manager.create_log(Log(level="INFO", message="Doublon", module="cleaner",
+                                            node="node-a", source_id="1"))
+        self.assertEqual([record["id"] for record in self.log_manager.read_after_id(1)], ["2"])
+
+    def test_stats(self) -> None:
+        """Vérifie les compteurs pré-agrégés de SQLite."""
+        for minute in range(0, 120, 10):
+            self.log_manager.create_log(Log(level="ERROR" if minute % 20 else "INFO", message="m", module="api",
+                                            timestamp=datetime(2025, 7, 10, 8) + timedelta(minutes=minute)))
+        stats = self.log_manager.stats(bucket="1h")
+        self.assertEqual([(b["start"], b["total"]) for b in stats["buckets"]],
+                         [("2025-07-10T08:00:00", 6), ("2025-07-10T09:00:00", 6)])
+        self.log_manager.delete_log("2")
+        stats = self.log_manager.stats(bucket="30m", level="ERROR", since="2025-07-10T09:00:00")
+        self.assertEqual([(b["start"], b["total"]) for b in stats["buckets"]],
+                         [("2025-07-10T09:00:00", 1), ("2025-07-10T09:30:00", 2)])
+        self.assertEqual(self.log_manager.stats(bucket="1d")["levels"], {"INFO": 6, "ERROR": 5})
+
+    def test_index_backfill(self) -> None:
+        """Vérifie que les termes et compteurs d'une base existante sont construits à l'ouverture."""
+        self.log_manager.create_log(Log(level="INFO", message="Ancienne base", module="auth"))
+        conn = self.log_manager._store._connection()
+        with conn:
+            conn.execute("DELETE FROM log_terms")
+            conn.execute("DELETE FROM log_rollups")
+        conn.execute("PRAGMA user_version = 0")
+        reopened = SqliteStore(self.log_manager._store.db_path)
+        self.assertEqual([r["id"] for r in reopened.query(terms=["ancienne"])], ["1"])
+        self.assertEqual(reopened.stats(3600)["total"], 1)
+        reopened.close()
+
+    def test_node_term_migration(self) -> None:
+        """Vérifie que l'ouverture d'une base en version 4 réindexe la machine d'origine."""
+        self.log_manager.create_log(Log(level="INFO", message="Reçu", module="cleaner", node="web1", source_id="1"))
+        conn = self.log_manager._store._connection()
+        with conn:
+            conn.execute("UPDATE log_terms SET term = 'node=web1' WHERE term LIKE ?", ("\x00%",))
+        conn.execute("PRAGMA user_version = 4")
+        reopened = SqliteStore(self.log_manager._store.db_path)
+        self.assertEqual([r["id"] for r in reopened.query(terms=[node_term("web1")])], ["1"])
+        self.assertEqual(reopened.query(terms=["node=web1"]), [])
+        reopened.close()
+
+    def test_migration_from_json(self) -> None:
+        """Vérifie la migration d'un logs.json existant vers SQLite."""
+        directory = os.path.join(self.test_dir, "legacy")
+        legacy = LogManager(directory=directory)
+        legacy.create_log(Log(level="INFO", message="Ancien", module="auth"))
+        migrated = LogManager(directory=directory, storage="sqlite")
+        self.assertEqual([log.message for log in migrated.read_logs()], ["Ancien"])
+        self.assertTrue(os.path.exists(legacy.log_file + ".migrated"))
+        migrated.close()
+
+    def test_concurrent_writer_processes(self) -> None:
+        """Vérifie qu'aucun journal n'est perdu avec plusieurs processus écrivains."""
+        processes = [
+            multiprocessing.Process(target=write_logs, args=(self.test_dir, worker, 100))
+            for worker in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        logs = self.log_manager.read_logs()
+        self.assertEqual(len(logs), 400, "Des journaux ont été perdus")
+        self.assertEqual(len({log.id for log in logs}), 400, "Des IDs sont en double")
+        self.assertIsInstance(self.log_manager._store, SqliteStore)
+
+
+if __name__ == "__main__":
+    unittest.main()
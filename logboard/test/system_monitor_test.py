@@ -1,5 +1,14 @@
+import os
+import sys
+import time
 import unittest
-from utilities.system_monitor import get_system_performance, pynvml
+import subprocess
+
+from types import SimpleNamespace
+from unittest import mock
+from utilities import system_monitor
+from utilities.system_monitor import (GpuProvider, IoMonitor, NvmlProvider, ProcessMonitor, SystemSampler,
+                                      get_system_performance, pynvml)
 
 
 class TestSystemMonitor(unittest.TestCase):
@@ -45,5 +54,202 @@ class TestSystemMonitor(unittest.TestCase):
             self.assertIsNone(perf["gpu_memory_percent"], "gpu_memory_percent devrait être None en cas d'erreur")
 
 
+
+class FakeGpuProvider(GpuProvider):
+    """Fournisseur GPU factice pour les machines sans GPU."""
+
+    def devices(self):
+        """Retourne deux cartes fictives."""
+        return [
+            {"index": 0, "name": "fake0", "gpu_percent": 20.0, "memory_percent": 50.0,
+             "memory_used_mb": 4096.0, "temperature_c": 60.0, "power_w": 120.0},
+            {"index": 1, "name": "fake1", "gpu_percent": 60.0, "memory_percent": 10.0,
+             "memory_used_mb": 819.2, "temperature_c": 45.0, "power_w": None},
+        ]
+
+
+class TestGpuProviders(unittest.TestCase):
+    """Tests des fournisseurs de métriques GPU."""
+
+    def test_multi_gpu_performance(self) -> None:
+        """Vérifie l'agrégation des mesures de plusieurs cartes."""
+        perf = get_system_performance(interval=None, gpu_provider=FakeGpuProvider())
+        self.assertEqual(perf["gpu_percent"], 40.0)
+        self.assertEqual(perf["gpu_memory_percent"], 30.0)
+        self.assertEqual([gpu["name"] for gpu in perf["gpus"]], ["fake0", "fake1"])
+
+    def test_nvml_session_is_reused(self) -> None:
+        """Vérifie que la session NVML et les handles sont ouverts une seule fois."""
+        class NVMLError(Exception):
+            pass
+
+        def power_usage(handle):
+            if handle == 1:
+                raise NVMLError("non pris en charge")
+            return 150000
+
+        fake = mock.Mock(
+            NVMLError=NVMLError,
+            NVML_TEMPERATURE_GPU=0,
+            nvmlDeviceGetCount=mock.Mock(return_value=2),
+            nvmlDeviceGetHandleByIndex=mock.Mock(side_effect=lambda index: index),
+            nvmlDeviceGetName=mock.Mock(return_value=b"Tesla"),
+            nvmlDeviceGetUtilizationRates=mock.Mock(return_value=SimpleNamespace(gpu=75)),
+            nvmlDeviceGetMemoryInfo=mock.Mock(return_value=SimpleNamespace(used=2 ** 30, total=2 ** 32)),
+            nvmlDeviceGetTemperature=mock.Mock(return_value=70),
+            nvmlDeviceGetPowerUsage=mock.Mock(side_effect=power_usage),
+        )
+        with mock.patch.object(system_monitor, "pynvml", fake), mock.patch("atexit.register"):
+            provider = NvmlProvider()
+            provider.devices()
+            gpus = provider.devices()
+            provider.close()
+        self.assertEqual(fake.nvmlInit.call_count, 1, "nvmlInit ne doit être appelée qu'une fois")
+        self.assertEqual(fake.nvmlDeviceGetHandleByIndex.call_count, 2, "Les handles doivent être conservés")
+        fake.nvmlShutdown.assert_called_once()
+        self.assertEqual(gpus[0], {"index": 0, "name": "Tesla", "gpu_percent": 75.0, "memory_percent": 25.0,
+                                   "memory_used_mb": 1024.0, "temperature_c": 70.0, "power_w": 150.0})
+        self.assertIsNone(gpus[1]["power_w"], "Une mesure non prise en charge vaut None")
+
+
+class TestProcessMonitor(unittest.TestCase):
+    """Tests pour la mesure des ressources par processus."""
+
+    def test_registered_processes(self) -> None:
+        """Vérifie la mesure d'un processus enregistré et le retrait d'un processus terminé."""
+        monitor = ProcessMonitor(top=0)
+        monitor.register(os.getpid(), name="tests")
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        self.addCleanup(child.wait)
+        monitor.register(child.pid)
+        self.assertEqual(monitor.registered(), sorted([os.getpid(), child.pid]))
+
+        own, other = monitor.processes()
+        self.assertEqual((own["pid"], own["name"], own["registered"]), (os.getpid(), "tests", True))
+        self.assertGreater(own["rss_mb"], 0)
+        self.assertGreaterEqual(own["threads"], 1)
+        self.assertIn("read_bytes", own)
+
+        child.kill()
+        child.wait()
+        self.assertEqual([p["pid"] for p in monitor.processes()], [os.getpid()], "Un processus terminé est retiré")
+        with self.assertRaises(ValueError):
+            monitor.register(child.pid)
+
+    def test_top_consumers(self) -> None:
+        """Vérifie l'ajout des plus gros consommateurs à l'échantillon."""
+        monitor = ProcessMonitor(top=2)
+        monitor.register(os.getpid())
+        perf = get_system_performance(interval=None, gpu_provider=FakeGpuProvider(), process_monitor=monitor)
+        processes = perf["processes"]
+        self.assertLessEqual(len(processes), 3)
+        self.assertTrue(processes[0]["registered"])
+        self.assertNotIn(os.getpid(), [p["pid"] for p in processes[1:]], "Un processus n'apparaît qu'une fois")
+        with self.assertRaises(ValueError):
+            ProcessMonitor(top=-1)
+
+
+class TestIoMonitor(unittest.TestCase):
+    """Tests pour le calcul des débits disque et réseau."""
+
+    @staticmethod
+    def disk(read: int, write: int, reads: int = 0, writes: int = 0) -> SimpleNamespace:
+        """Compteurs disque cumulés factices."""
+        return SimpleNamespace(read_bytes=read, write_bytes=write, read_count=reads, write_count=writes)
+
+    def test_rates_from_deltas(self) -> None:
+        """Vérifie les débits calculés entre deux lectures et le détail par périphérique."""
+        readings = iter([
+            (0.0, self.disk(1000, 0, 10, 0), {"sda": self.disk(1000, 0, 10, 0)},
+             SimpleNamespace(bytes_recv=0, bytes_sent=0), {"eth0": SimpleNamespace(bytes_recv=0, bytes_sent=0)}),
+            (2.0, self.disk(5000, 2048, 30, 4), {"sda": self.disk(5000, 2048, 30, 4), "sdb": self.disk(9, 9)},
+             SimpleNamespace(bytes_recv=200, bytes_sent=100), {"eth0": SimpleNamespace(bytes_recv=200, bytes_sent=100)}),
+            (3.0, self.disk(10, 2048, 31, 4), {}, SimpleNamespace(bytes_recv=300, bytes_sent=100), {}),
+        ])
+        current = {}
+
+        def read_all():
+            current["now"], current["disk"], current["disks"], current["net"], current["nics"] = next(readings)
+
+        monitor = IoMonitor(per_device=True)
+        with mock.patch.object(system_monitor.time, "monotonic", lambda: current["now"]), \
+                mock.patch.object(system_monitor.psutil, "disk_io_counters",
+                                  lambda perdisk=False: current["disks"] if perdisk else current["disk"]), \
+                mock.patch.object(system_monitor.psutil, "net_io_counters",
+                                  lambda pernic=False: current["nics"] if pernic else current["net"]):
+            read_all()
+            first = monitor.rates()
+            self.assertIsNone(first["disk_read_bytes_per_s"], "Pas de débit sans lecture précédente")
+            read_all()
+            rates = monitor.rates()
+            self.assertEqual((rates["disk_read_bytes_per_s"], rates["disk_write_bytes_per_s"]), (2000.0, 1024.0))
+            self.assertEqual((rates["disk_read_iops"], rates["disk_write_iops"]), (10.0, 2.0))
+            self.assertEqual((rates["net_rx_bytes_per_s"], rates["net_tx_bytes_per_s"]), (100.0, 50.0))
+            self.assertEqual(list(rates["disks"]), ["sda"], "Un disque apparu ne donne pas encore de débit")
+            self.assertEqual(rates["nics"]["eth0"], {"rx_bytes_per_s": 100.0, "tx_bytes_per_s": 50.0})
+            read_all()
+            rates = monitor.rates()
+            self.assertIsNone(rates["disk_read_bytes_per_s"], "Un compteur réinitialisé ne donne pas de débit")
+            self.assertEqual(rates["net_rx_bytes_per_s"], 100.0)
+
+    def test_system_performance_includes_rates(self) -> None:
+        """Vérifie l'ajout des débits à l'échantillon."""
+        monitor = IoMonitor()
+        get_system_performance(interval=None, gpu_provider=FakeGpuProvider(), io_monitor=monitor)
+        perf = get_system_performance(interval=None, gpu_provider=FakeGpuProvider(), io_monitor=monitor)
+        self.assertGreaterEqual(perf["net_rx_bytes_per_s"], 0)
+        self.assertNotIn("disks", perf, "Pas de détail par périphérique par défaut")
+
+
+class TestSystemSampler(unittest.TestCase):
+    """Tests pour l'échantillonneur de performances en arrière-plan."""
+
+    def test_snapshot_does_not_block(self) -> None:
+        """Vérifie que la lecture de l'instantané ne déclenche pas de mesure."""
+        sampler = SystemSampler(interval=0.05)
+        self.addCleanup(sampler.stop)
+        sampler.start()
+        begin = time.perf_counter()
+        for _ in range(100):
+            perf = sampler.snapshot()
+        self.assertLess(time.perf_counter() - begin, 0.05, "snapshot() ne doit pas attendre de mesure")
+        self.assertTrue(0 <= perf["cpu_percent"] <= 100, "cpu_percent hors des limites [0, 100]")
+        self.assertIn("ram_percent", perf, "La clé 'ram_percent' est absente")
+
+    def test_background_refresh(self) -> None:
+        """Vérifie que l'instantané est rafraîchi par le thread, sans mesure bloquante."""
+        calls = []
+
+        def sample(interval):
+            calls.append(interval)
+            return {"cpu_percent": float(len(calls))}
+
+        sampler = SystemSampler(interval=0.01, sample=sample)
+        received = []
+        sampler.add_listener(lambda timestamp, perf: received.append(perf))
+        sampler.add_listener(lambda timestamp, perf: 1 / 0)
+        self.assertEqual(sampler.snapshot(), {"cpu_percent": 1.0}, "Le premier appel démarre le thread")
+        deadline = time.monotonic() + 2
+        while len(calls) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        sampler.stop()
+        self.assertGreaterEqual(len(calls), 3, "L'instantané n'est pas rafraîchi")
+        self.assertEqual(calls[1:3], [None, None], "Les mesures suivantes ne doivent pas bloquer")
+        self.assertEqual(received[0], {"cpu_percent": 1.0}, "Chaque mesure est transmise aux abonnés")
+        with self.assertRaises(ValueError):
+            SystemSampler(interval=0)
+
+    def test_snapshot_after_stop(self) -> None:
+        """Vérifie qu'une lecture après ``stop()`` ne relance pas le thread."""
+        sampler = SystemSampler(interval=0.01, sample=lambda interval: {"cpu_percent": 5.0})
+        self.addCleanup(sampler.stop)
+        sampler.snapshot()
+        sampler.stop()
+        self.assertEqual(sampler.snapshot(), {"cpu_percent": 5.0}, "Le dernier échantillon reste lisible")
+        self.assertIsNone(sampler._thread, "snapshot() a relancé le thread après stop()")
+        sampler.start()
+        self.assertIsNotNone(sampler._thread, "start() relance le thread explicitement")
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
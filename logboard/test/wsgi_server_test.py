@@ -0,0 +1,142 @@
+import os
+import time
+import signal
+import unittest
+import threading
+import http.client
+
+from interface.wsgi_server import PooledWSGIServer, serve
+
+
+class SlowApp:
+    """Application WSGI qui compte les requêtes simultanées et peut être retenue."""
+
+    def __init__(self) -> None:
+        """Initialise les compteurs ; les requêtes passent tant que ``release`` est levé."""
+        self.release = threading.Event()
+        self.release.set()
+        self.current = 0
+        self.peak = 0
+        self.completed = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        """Attend ``release`` puis répond "ok"."""
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        self.release.wait(5)
+        with self._lock:
+            self.current -= 1
+            self.completed += 1
+        start_response("200 OK", [("Content-Type", "text/plain"), ("Content-Length", "2")])
+        return [b"ok"]
+
+
+class TestPooledWSGIServer(unittest.TestCase):
+    """Tests du serveur WSGI de production."""
+
+    def start(self, **options) -> PooledWSGIServer:
+        """Démarre un serveur sur un port libre de la boucle locale."""
+        server = PooledWSGIServer("127.0.0.1", 0, self.app, **options)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def setUp(self) -> None:
+        """Crée l'application de test."""
+        self.app = SlowApp()
+
+    def get(self, port: int, connection: http.client.HTTPConnection = None) -> http.client.HTTPResponse:
+        """Envoie GET / et lit la réponse."""
+        connection = connection or http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        connection.request("GET", "/")
+        response = connection.getresponse()
+        response.read()
+        return response
+
+    def test_keepalive(self) -> None:
+        """Vérifie que la connexion est réutilisée puis fermée après le délai d'inactivité."""
+        server = self.start(keepalive=0.2)
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+        self.get(server.server_port, connection)
+        sock = connection.sock
+        self.assertEqual(self.get(server.server_port, connection).status, 200)
+        self.assertIs(connection.sock, sock, "La connexion doit être conservée entre deux requêtes")
+        time.sleep(0.5)
+        self.assertEqual(server.active, 0, "Une connexion inactive est fermée après le délai")
+
+        closing = self.start(keepalive=0)
+        response = self.get(closing.server_port)
+        self.assertEqual(response.getheader("Connection"), "close")
+
+    def test_workers_bound_concurrency(self) -> None:
+        """Vérifie qu'au plus ``workers`` connexions sont servies à la fois."""
+        server = self.start(workers=2, keepalive=0)
+        self.app.release.clear()
+        threads = [threading.Thread(target=self.get, args=(server.server_port,)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.3)
+        self.assertEqual(self.app.current, 2)
+        self.app.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual((self.app.peak, self.app.completed), (2, 5))
+
+    def test_serve_drains_requests_on_stop(self) -> None:
+        """Vérifie que l'arrêt laisse les requêtes en cours se terminer."""
+        ports, stopped, stop = [], [], threading.Event()
+        server = threading.Thread(target=serve, args=(self.app,), kwargs={
+            "host": "127.0.0.1", "port": 0, "workers": 4, "grace": 5, "stop": stop,
+            "ready": ports.append, "on_stop": lambda: stopped.append(self.app.current)
+        })
+        self.app.release.clear()
+        server.start()
+        while not ports:
+            time.sleep(0.01)
+        responses = []
+        client = threading.Thread(target=lambda: responses.append(self.get(ports[0]).status))
+        client.start()
+        while not self.app.current:
+            time.sleep(0.01)
+        stop.set()
+        deadline = time.monotonic() + 2
+        while not stopped and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(stopped, [1], "on_stop est appelé avant la fin des requêtes en cours")
+        self.app.release.set()
+        client.join()
+        server.join(5)
+        self.assertFalse(server.is_alive())
+        self.assertEqual(responses, [200])
+        with self.assertRaises(OSError):
+            self.get(ports[0])
+
+    def test_invalid_options(self) -> None:
+        """Vérifie le refus d'un nombre de workers ou d'un mode invalide."""
+        with self.assertRaises(ValueError):
+            PooledWSGIServer("127.0.0.1", 0, self.app, workers=0)
+        with self.assertRaises(ValueError):
+            serve(self.app, worker="processes", stop=threading.Event())
+
+    def test_serve_restores_signal_handlers(self) -> None:
+        """Vérifie que SIGTERM arrête ``serve`` puis que le gestionnaire précédent est rétabli."""
+        previous = signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        self.addCleanup(signal.signal, signal.SIGTERM, previous)
+        serve(self.app, host="127.0.0.1", port=0, grace=1,
+              ready=lambda port: os.kill(os.getpid(), signal.SIGTERM))
+        self.assertIs(signal.getsignal(signal.SIGTERM), signal.SIG_IGN)
+
+    def test_config_copy_is_identical(self) -> None:
+        """Vérifie que la copie utilisée par le serveur de configuration (config/) est à jour."""
+        interface = os.path.join(os.path.dirname(__file__), "..", "interface")
+        with open(os.path.join(interface, "wsgi_server.py"), "rb") as f:
+            source = f.read()
+        with open(os.path.join(interface, "..", "..", "config", "wsgi_server.py"), "rb") as f:
+            self.assertEqual(f.read(), source, "config/wsgi_server.py diffère de interface/wsgi_server.py")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,254 @@
+import time
+import threading
+import numpy as np
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Résolutions conservées : (durée d'un point en secondes, nombre de points).
+# Chaque niveau est une grille fixe, indépendante de la cadence d'échantillonnage :
+# 1 h à la seconde, puis 24 h, 7 jours et 1 an.
+RESOLUTIONS: Tuple[Tuple[int, int], ...] = ((1, 3600), (10, 8640), (60, 10080), (3600, 8760))
+DOWNSAMPLING_MODES = ("lttb", "minmax")
+
+
+class RingBuffer:
+    """Tampon circulaire de points (horodatage, valeur) de taille fixe.
+
+    Les points sont stockés dans deux tableaux numpy préalloués : la mémoire ne
+    dépend que de la capacité, et le point le plus ancien est écrasé une fois le
+    tampon plein.
+
+    Attributes:
+        capacity (int): Nombre maximal de points conservés.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Alloue le tampon.
+
+        Args:
+            capacity (int): Nombre maximal de points conservés.
+        """
+        self.capacity = capacity
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._values = np.zeros(capacity, dtype=np.float64)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Nombre de points conservés."""
+        return self._size
+
+    @property
+    def full(self) -> bool:
+        """True si le plus ancien point a déjà été écrasé au moins une fois."""
+        return self._size == self.capacity
+
+    @property
+    def oldest(self) -> Optional[float]:
+        """Horodatage du plus ancien point conservé (None si le tampon est vide)."""
+        if not self._size:
+            return None
+        return float(self._times[self._next if self.full else 0])
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Ajoute un point (les horodatages doivent être croissants)."""
+        self._times[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def arrays(self, since: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Retourne les points dans l'ordre chronologique.
+
+        Args:
+            since (Optional[float]): Horodatage minimal (inclus).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Horodatages et valeurs (copies).
+        """
+        if self._size < self.capacity:
+            times, values = self._times[:self._size], self._values[:self._size]
+        else:
+            times = np.concatenate((self._times[self._next:], self._times[:self._next]))
+            values = np.concatenate((self._values[self._next:], self._values[:self._next]))
+        start = int(np.searchsorted(times, since, side="left")) if since is not None else 0
+        return times[start:].copy(), values[start:].copy()
+
+
+def lttb(times: np.ndarray, values: np.ndarray, points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Sous-échantillonne une série par « Largest-Triangle-Three-Buckets ».
+
+    Le premier et le dernier point sont conservés ; entre les deux, chaque
+    intervalle retient le point qui forme le plus grand triangle avec le point
+    retenu précédemment et la moyenne de l'intervalle suivant, ce qui préserve
+    la forme visuelle de la courbe (pics compris).
+
+    Args:
+        times (np.ndarray): Horodatages croissants.
+        values (np.ndarray): Valeurs correspondantes.
+        points (int): Nombre de points souhaité.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Série d'au plus ``points`` points.
+    """
+    size = len(times)
+    if points >= size or points < 3:
+        return times, values
+    edges = np.linspace(1, size - 1, points - 1).astype(int)
+    selected = [0]
+    previous = 0
+    for i in range(points - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_time = times[end:edges[i + 2]].mean()
+            next_value = values[end:edges[i + 2]].mean()
+        else:
+            next_time, next_value = times[-1], values[-1]
+        areas = np.abs((times[previous] - next_time) * (values[start:end] - values[previous])
+                       - (times[previous] - times[start:end]) * (next_value - values[previous]))
+        previous = start + int(np.argmax(areas))
+        selected.append(previous)
+    selected.append(size - 1)
+    return times[selected], values[selected]
+
+
+def minmax(times: np.ndarray, values: np.ndarray, points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Sous-échantillonne une série en gardant le minimum et le maximum de chaque intervalle.
+
+    Args:
+        times (np.ndarray): Horodatages croissants.
+        values (np.ndarray): Valeurs correspondantes.
+        points (int): Nombre de points souhaité (deux par intervalle).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Série d'au plus ``points`` points.
+    """
+    size = len(times)
+    if points >= size or points < 2:
+        return times, values
+    edges = np.linspace(0, size, points // 2 + 1).astype(int)
+    selected: List[int] = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            low = start + int(np.argmin(values[start:end]))
+            high = start + int(np.argmax(values[start:end]))
+            selected.extend(sorted({low, high}))
+    return times[selected], values[selected]
+
+
+class MetricsHistory:
+    """Historique des métriques à plusieurs résolutions, en mémoire bornée.
+
+    Chaque métrique numérique reçue par ``add`` est conservée dans un
+    ``RingBuffer`` par résolution (``RESOLUTIONS``) : les moyennes des
+    échantillons par 1 s, 10 s, 1 min et 1 h, quelle que soit la cadence
+    d'échantillonnage. Une lecture choisit la résolution la plus fine qui
+    couvre la période demandée et la réduit au nombre de points voulu côté
+    serveur.
+    """
+
+    def __init__(self, resolutions: Iterable[Tuple[int, int]] = RESOLUTIONS) -> None:
+        """Initialise un historique vide.
+
+        Args:
+            resolutions (Iterable[Tuple[int, int]]): Couples (durée d'un point en
+                secondes, capacité), du plus fin au plus grossier.
+
+        Raises:
+            ValueError: Si une durée n'est pas strictement positive.
+        """
+        self.resolutions = tuple(resolutions)
+        if any(step <= 0 for step, _ in self.resolutions):
+            raise ValueError(f"Les durées doivent être strictement positives : {self.resolutions}")
+        self._lock = threading.Lock()
+        self._buffers: Dict[str, List[RingBuffer]] = {}
+        # Intervalle en cours par métrique et par résolution : [début, somme, nombre]
+        self._pending: Dict[str, List[List[float]]] = {}
+
+    def metrics(self) -> List[str]:
+        """Retourne les noms des métriques enregistrées."""
+        with self._lock:
+            return sorted(self._buffers)
+
+    def add(self, timestamp: float, sample: Dict[str, Any]) -> None:
+        """Enregistre les valeurs numériques d'un échantillon.
+
+        Les valeurs non numériques (listes par GPU, None...) sont ignorées.
+
+        Args:
+            timestamp (float): Date de l'échantillon (``time.time()``).
+            sample (Dict[str, Any]): Échantillon au format de ``get_system_performance``.
+        """
+        with self._lock:
+            for name, value in sample.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                buffers = self._buffers.get(name)
+                if buffers is None:
+                    buffers = self._buffers[name] = [RingBuffer(capacity) for _, capacity in self.resolutions]
+                    self._pending[name] = [[0.0, 0.0, 0.0] for _ in self.resolutions]
+                for (step, _), buffer, pending in zip(self.resolutions, buffers, self._pending[name]):
+                    start = timestamp - timestamp % step
+                    if pending[2] and pending[0] != start:
+                        buffer.append(pending[0], pending[1] / pending[2])
+                        pending[1] = pending[2] = 0.0
+                    pending[0] = start
+                    pending[1] += value
+                    pending[2] += 1
+
+    def query(self, range_seconds: float, points: Optional[int] = None,
+              metrics: Optional[Iterable[str]] = None, mode: str = "lttb",
+              now: Optional[float] = None) -> Dict[str, Any]:
+        """Retourne l'historique récent des métriques, sous-échantillonné.
+
+        Args:
+            range_seconds (float): Durée de la période, jusqu'à ``now``.
+            points (Optional[int]): Nombre maximal de points par métrique (None :
+                tous les points de la résolution choisie).
+            metrics (Optional[Iterable[str]]): Métriques à retourner (par défaut
+                toutes).
+            mode (str): Sous-échantillonnage "lttb" (forme de la courbe) ou
+                "minmax" (extrêmes de chaque intervalle).
+            now (Optional[float]): Fin de la période (par défaut maintenant).
+
+        Returns:
+            Dict[str, Any]: ``resolution`` (durée d'un point source en secondes)
+            et ``metrics`` : pour chaque métrique, une liste de points
+            ``[horodatage, valeur]`` chronologique (début de chaque intervalle).
+
+        Raises:
+            ValueError: Si le mode ou le nombre de points est invalide.
+        """
+        if mode not in DOWNSAMPLING_MODES:
+            raise ValueError(f"Mode invalide : {mode}. Doit être l'un de {', '.join(DOWNSAMPLING_MODES)}")
+        if points is not None and points <= 0:
+            raise ValueError(f"Le nombre de points doit être strictement positif : {points}")
+        since = (now if now is not None else time.time()) - range_seconds
+        downsample = lttb if mode == "lttb" else minmax
+        result: Dict[str, Any] = {"resolution": self.resolutions[-1][0], "metrics": {}}
+        with self._lock:
+            names = list(metrics) if metrics is not None else sorted(self._buffers)
+            for name in names:
+                buffers = self._buffers.get(name)
+                if buffers is None:
+                    continue
+                level = self._level(buffers, since)
+                times, values = buffers[level].arrays(since)
+                pending = self._pending[name][level]
+                if pending[2]:
+                    # Intervalle en cours : sa moyenne provisoire termine la série
+                    times = np.append(times, pending[0])
+                    values = np.append(values, pending[1] / pending[2])
+                if points is not None:
+                    times, values = downsample(times, values, points)
+                result["resolution"] = self.resolutions[level][0]
+                result["metrics"][name] = np.column_stack((times, values)).tolist()
+        return result
+
+    @staticmethod
+    def _level(buffers: List[RingBuffer], since: float) -> int:
+        """Choisit la résolution la plus fine qui couvre toute la période."""
+        for level, buffer in enumerate(buffers):
+            if not buffer.full or buffer.oldest <= since:
+                return level
+        return len(buffers) - 1
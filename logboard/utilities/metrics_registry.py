@@ -0,0 +1,202 @@
+import math
+import bisect
+import threading
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Bornes par défaut des histogrammes de latence (secondes), celles des clients Prometheus
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def format_value(value: float) -> str:
+    """Formate une valeur selon le format texte de Prometheus."""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Formate un jeu d'étiquettes ``{nom="valeur",...}`` (vide sans étiquette)."""
+    if not names:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for v in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+class Metric:
+    """Famille de métriques : un nom, une description et des étiquettes.
+
+    Attributes:
+        name (str): Nom de la métrique.
+        documentation (str): Description (ligne ``# HELP``).
+        labelnames (Tuple[str, ...]): Noms des étiquettes.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        """Initialise une famille vide.
+
+        Args:
+            name (str): Nom de la métrique.
+            documentation (str): Description.
+            labelnames (Iterable[str]): Noms des étiquettes.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        """Ordonne les valeurs d'étiquettes selon ``labelnames``.
+
+        Raises:
+            ValueError: Si les étiquettes ne correspondent pas à ``labelnames``.
+        """
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Étiquettes attendues pour {self.name} : {', '.join(self.labelnames)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Retourne les échantillons (suffixe du nom, étiquettes formatées, valeur)."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Retourne la famille au format texte de Prometheus."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{self.name}{suffix}{labels} {format_value(value)}" for suffix, labels, value in self.samples())
+        return "\n".join(lines) + "\n"
+
+
+class Counter(Metric):
+    """Compteur croissant, par jeu d'étiquettes."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        """Initialise un compteur vide (voir ``Metric``)."""
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Incrémente le compteur des étiquettes données."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Retourne une valeur par jeu d'étiquettes."""
+        with self._lock:
+            values = sorted(self._values.items())
+        return [("", format_labels(self.labelnames, key), value) for key, value in values]
+
+
+class CallbackMetric(Metric):
+    """Métrique lue au moment de la collecte.
+
+    La fonction ``collect`` retourne les valeurs courantes par jeu d'étiquettes :
+    rien n'est maintenu entre deux collectes. Convient aux jauges comme aux
+    compteurs tenus ailleurs (par exemple ``LogManager.ingested``).
+    """
+
+    def __init__(self, name: str, documentation: str,
+                 collect: Callable[[], Dict[LabelValues, Optional[float]]],
+                 labelnames: Iterable[str] = (), kind: str = "gauge") -> None:
+        """Initialise la métrique.
+
+        Args:
+            name (str): Nom de la métrique.
+            documentation (str): Description.
+            collect (Callable): Retourne ``{(valeurs d'étiquettes...): valeur}`` ;
+                une valeur None est omise.
+            labelnames (Iterable[str]): Noms des étiquettes.
+            kind (str): Type déclaré ("gauge" par défaut, ou "counter").
+        """
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self._collect = collect
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Retourne les valeurs courantes."""
+        return [("", format_labels(self.labelnames, key), value)
+                for key, value in sorted(self._collect().items()) if value is not None]
+
+
+class Histogram(Metric):
+    """Histogramme cumulatif (``_bucket``, ``_sum``, ``_count``), par jeu d'étiquettes."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Initialise un histogramme vide.
+
+        Args:
+            name (str): Nom de la métrique.
+            documentation (str): Description.
+            labelnames (Iterable[str]): Noms des étiquettes.
+            buckets (Sequence[float]): Bornes supérieures croissantes (+Inf est ajoutée).
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Par jeu d'étiquettes : [effectifs par intervalle (+Inf compris), somme]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Enregistre une observation."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Retourne les effectifs cumulés par borne, la somme et le nombre d'observations."""
+        with self._lock:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        samples = []
+        names = self.labelnames + ("le",)
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append(("_bucket", format_labels(names, key + (format_value(bound),)), cumulative))
+            samples.append(("_sum", format_labels(self.labelnames, key), total))
+            samples.append(("_count", format_labels(self.labelnames, key), cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Ensemble de métriques exposées au format texte de Prometheus.
+
+    Les compteurs et histogrammes sont tenus en mémoire au fil de l'eau ; les
+    jauges sont lues à la collecte. ``render()`` ne fait donc aucune mesure ni
+    lecture du stockage.
+    """
+
+    def __init__(self) -> None:
+        """Initialise un registre vide."""
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """Ajoute une métrique au registre et la retourne.
+
+        Raises:
+            ValueError: Si une métrique du même nom est déjà enregistrée.
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrique déjà enregistrée : {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Retourne toutes les métriques au format texte de Prometheus (version 0.0.4)."""
+        return "".join(metric.render() for metric in self._metrics.values())
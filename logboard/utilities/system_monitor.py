@@ -1,56 +1,466 @@
+import time
+import atexit
 import psutil
-from typing import Dict, Optional
+import threading
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 try:
     import pynvml
 except ImportError:
     pynvml = None
 
-def get_system_performance() -> Dict[str, Optional[float]]:
+class GpuProvider:
+    """Source des métriques GPU utilisée par ``get_system_performance``.
+
+    Une implémentation retourne une mesure par carte ; ``NvmlProvider`` interroge
+    les cartes NVIDIA, et un autre fournisseur (par exemple factice, pour les
+    tests sur une machine sans GPU) peut être passé à ``get_system_performance``.
+    """
+
+    def devices(self) -> List[Dict[str, Any]]:
+        """Mesure chaque carte.
+
+        Returns:
+            List[Dict[str, Any]]: Une mesure par carte avec les clés ``index``,
+            ``name``, ``gpu_percent``, ``memory_percent``, ``memory_used_mb``,
+            ``temperature_c`` et ``power_w`` (None si la carte ne la fournit pas).
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Libère les ressources du fournisseur (sans effet par défaut)."""
+
+
+class NvmlProvider(GpuProvider):
+    """Métriques des cartes NVIDIA via une session NVML persistante.
+
+    ``nvmlInit`` n'est appelée qu'à la première mesure et les handles des cartes
+    sont conservés pour toute la vie du processus ; ``close()`` (enregistrée avec
+    ``atexit``) ferme la session. Sans pynvml ou sans pilote, aucune carte n'est
+    retournée.
+    """
+
+    def __init__(self) -> None:
+        """Prépare le fournisseur (la session est ouverte à la première mesure)."""
+        self._lock = threading.Lock()
+        self._handles: Optional[List[Tuple[Any, str]]] = None
+
+    def _open(self) -> List[Tuple[Any, str]]:
+        """Ouvre la session NVML et récupère les handles des cartes (une seule fois)."""
+        if self._handles is None:
+            self._handles = []
+            if pynvml is not None:
+                try:
+                    pynvml.nvmlInit()
+                    atexit.register(self.close)
+                    for index in range(pynvml.nvmlDeviceGetCount()):
+                        handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+                        name = pynvml.nvmlDeviceGetName(handle)
+                        self._handles.append((handle, name.decode() if isinstance(name, bytes) else name))
+                except pynvml.NVMLError:
+                    # Pas de pilote ou de carte NVIDIA : ne plus réessayer
+                    pass
+        return self._handles
+
+    @staticmethod
+    def _read(function: Callable[..., Any], *args: Any) -> Any:
+        """Appelle une fonction NVML ; None si la carte ne la prend pas en charge."""
+        try:
+            return function(*args)
+        except pynvml.NVMLError:
+            return None
+
+    def devices(self) -> List[Dict[str, Any]]:
+        """Mesure chaque carte NVIDIA (voir ``GpuProvider.devices``)."""
+        with self._lock:
+            measures = []
+            for index, (handle, name) in enumerate(self._open()):
+                util = self._read(pynvml.nvmlDeviceGetUtilizationRates, handle)
+                memory = self._read(pynvml.nvmlDeviceGetMemoryInfo, handle)
+                temperature = self._read(pynvml.nvmlDeviceGetTemperature, handle, pynvml.NVML_TEMPERATURE_GPU)
+                power = self._read(pynvml.nvmlDeviceGetPowerUsage, handle)
+                measures.append({
+                    "index": index,
+                    "name": name,
+                    "gpu_percent": float(util.gpu) if util is not None else None,
+                    "memory_percent": memory.used / memory.total * 100 if memory is not None else None,
+                    "memory_used_mb": memory.used / 2 ** 20 if memory is not None else None,
+                    "temperature_c": float(temperature) if temperature is not None else None,
+                    # NVML retourne des milliwatts
+                    "power_w": power / 1000 if power is not None else None,
+                })
+            return measures
+
+    def close(self) -> None:
+        """Ferme la session NVML si elle a été ouverte."""
+        with self._lock:
+            if self._handles is not None and pynvml is not None:
+                try:
+                    pynvml.nvmlShutdown()
+                except pynvml.NVMLError:
+                    pass
+            self._handles = None
+
+
+# Fournisseur partagé par défaut (session NVML unique pour le processus)
+default_gpu_provider = NvmlProvider()
+
+
+# Mesures lues pour chaque processus par ``psutil.process_iter``
+PROCESS_ATTRIBUTES = ["pid", "name", "cpu_percent", "memory_info", "io_counters", "num_threads"]
+
+
+class ProcessMonitor:
+    """Mesure les ressources de processus choisis et des plus gros consommateurs.
+
+    Les processus enregistrés (``register``, par exemple les workers de
+    prétraitement) sont toujours mesurés ; s'y ajoutent les ``top`` processus
+    les plus consommateurs de CPU (puis de mémoire). Les lectures d'un même
+    processus sont groupées par ``psutil.Process.oneshot()`` et les objets
+    ``psutil.Process`` sont conservés d'un appel à l'autre : l'utilisation du
+    CPU est calculée depuis l'appel précédent, sans attente.
+
+    Attributes:
+        top (int): Nombre de processus les plus consommateurs ajoutés (0 : aucun).
+    """
+
+    def __init__(self, top: int = 5) -> None:
+        """Initialise le moniteur sans processus enregistré.
+
+        Args:
+            top (int): Nombre de processus les plus consommateurs ajoutés.
+
+        Raises:
+            ValueError: Si ``top`` est négatif.
+        """
+        if top < 0:
+            raise ValueError(f"Le nombre de processus doit être positif : {top}")
+        self.top = top
+        self._lock = threading.Lock()
+        self._registered: Dict[int, Tuple[psutil.Process, Optional[str]]] = {}
+
+    def register(self, pid: int, name: Optional[str] = None) -> None:
+        """Ajoute un processus à mesurer à chaque échantillon.
+
+        Args:
+            pid (int): Identifiant du processus.
+            name (Optional[str]): Libellé affiché (par défaut le nom du processus).
+
+        Raises:
+            ValueError: Si le processus n'existe pas.
+        """
+        try:
+            process = psutil.Process(pid)
+            process.cpu_percent(None)  # Référence pour la première mesure du CPU
+        except psutil.NoSuchProcess:
+            raise ValueError(f"Processus introuvable : {pid}")
+        with self._lock:
+            self._registered[pid] = (process, name)
+
+    def unregister(self, pid: int) -> bool:
+        """Retire un processus enregistré.
+
+        Returns:
+            bool: True si le processus était enregistré.
+        """
+        with self._lock:
+            return self._registered.pop(pid, None) is not None
+
+    def registered(self) -> List[int]:
+        """Retourne les identifiants des processus enregistrés."""
+        with self._lock:
+            return sorted(self._registered)
+
+    @staticmethod
+    def _measure(info: Dict[str, Any]) -> Dict[str, Any]:
+        """Met en forme les attributs lus pour un processus."""
+        memory, io = info.get("memory_info"), info.get("io_counters")
+        return {
+            "pid": info["pid"],
+            "name": info.get("name"),
+            "cpu_percent": info.get("cpu_percent"),
+            "rss_mb": memory.rss / (1024 ** 2) if memory else None,
+            "read_bytes": io.read_bytes if io else None,
+            "write_bytes": io.write_bytes if io else None,
+            "threads": info.get("num_threads"),
+        }
+
+    def processes(self) -> List[Dict[str, Any]]:
+        """Mesure les processus enregistrés puis les plus consommateurs.
+
+        Une mesure non disponible (accès refusé, E/S non prises en charge par le
+        système) vaut None ; un processus enregistré terminé est retiré.
+
+        Returns:
+            List[Dict[str, Any]]: Une entrée par processus avec les clés 'pid',
+            'name', 'cpu_percent', 'rss_mb', 'read_bytes', 'write_bytes' (totaux
+            depuis le démarrage du processus), 'threads' et 'registered'.
+        """
+        with self._lock:
+            registered = list(self._registered.items())
+        result = []
+        for pid, (process, name) in registered:
+            try:
+                info = process.as_dict(PROCESS_ATTRIBUTES)  # as_dict utilise oneshot()
+            except psutil.NoSuchProcess:
+                self.unregister(pid)
+                continue
+            measure = self._measure(info)
+            measure["name"] = name or measure["name"]
+            measure["registered"] = True
+            result.append(measure)
+        if self.top:
+            known = {pid for pid, _ in registered}
+            others = [self._measure(process.info) for process in psutil.process_iter(PROCESS_ATTRIBUTES)
+                      if process.info["pid"] not in known]
+            others.sort(key=lambda p: (p["cpu_percent"] or 0, p["rss_mb"] or 0), reverse=True)
+            for measure in others[:self.top]:
+                measure["registered"] = False
+                result.append(measure)
+        return result
+
+
+class IoMonitor:
+    """Calcule les débits disque et réseau entre deux appels successifs.
+
+    Les compteurs cumulés de ``psutil.disk_io_counters`` et
+    ``psutil.net_io_counters`` sont relus à chaque appel de ``rates()`` ; les
+    débits sont leurs différences divisées par le temps écoulé depuis l'appel
+    précédent (celui de l'échantillonneur en arrière-plan, voir ``SystemSampler``).
+
+    Attributes:
+        per_device (bool): Ajoute le détail par disque et par interface réseau.
+    """
+
+    # (compteur psutil, clé du débit) pour les disques et le réseau
+    DISK_FIELDS = (("read_bytes", "read_bytes_per_s"), ("write_bytes", "write_bytes_per_s"),
+                   ("read_count", "read_iops"), ("write_count", "write_iops"))
+    NET_FIELDS = (("bytes_recv", "rx_bytes_per_s"), ("bytes_sent", "tx_bytes_per_s"))
+
+    def __init__(self, per_device: bool = False) -> None:
+        """Initialise le moniteur ; le premier appel de ``rates()`` sert de référence.
+
+        Args:
+            per_device (bool): Ajoute le détail par disque et par interface réseau.
+        """
+        self.per_device = per_device
+        self._lock = threading.Lock()
+        self._previous: Optional[Tuple[float, Dict[str, Any], Dict[str, Any]]] = None
+
+    @staticmethod
+    def _deltas(previous: Any, current: Any, fields: Tuple[Tuple[str, str], ...],
+                elapsed: float) -> Dict[str, Optional[float]]:
+        """Calcule les débits d'un jeu de compteurs (None si un compteur a été réinitialisé)."""
+        rates: Dict[str, Optional[float]] = {}
+        for counter, key in fields:
+            delta = getattr(current, counter) - getattr(previous, counter)
+            rates[key] = delta / elapsed if delta >= 0 else None
+        return rates
+
+    def _breakdown(self, previous: Dict[str, Any], current: Dict[str, Any],
+                   fields: Tuple[Tuple[str, str], ...], elapsed: float) -> Dict[str, Dict[str, Optional[float]]]:
+        """Calcule les débits par périphérique présent lors des deux lectures."""
+        return {name: self._deltas(previous[name], counters, fields, elapsed)
+                for name, counters in sorted(current.items()) if name in previous}
+
+    def rates(self) -> Dict[str, Any]:
+        """Retourne les débits depuis l'appel précédent.
+
+        Returns:
+            Dict[str, Any]: Débits en octets (ou opérations) par seconde, None au
+            premier appel ou si les compteurs ne sont pas disponibles :
+                - 'disk_read_bytes_per_s', 'disk_write_bytes_per_s' : débit disque.
+                - 'disk_read_iops', 'disk_write_iops' : opérations disque par seconde.
+                - 'net_rx_bytes_per_s', 'net_tx_bytes_per_s' : débit réseau reçu/émis.
+                - 'disks', 'nics' : mêmes mesures par disque et par interface
+                  (clés sans préfixe), seulement avec ``per_device``.
+        """
+        now = time.monotonic()
+        disks = (psutil.disk_io_counters(perdisk=True) or {}) if self.per_device else {}
+        nics = (psutil.net_io_counters(pernic=True) or {}) if self.per_device else {}
+        disk_total = psutil.disk_io_counters()
+        net_total = psutil.net_io_counters()
+        with self._lock:
+            previous, self._previous = self._previous, (now, {"": disk_total, **disks}, {"": net_total, **nics})
+        rates: Dict[str, Any] = {f"disk_{key}": None for _, key in self.DISK_FIELDS}
+        rates.update({f"net_{key}": None for _, key in self.NET_FIELDS})
+        if previous is not None and now > previous[0]:
+            elapsed = now - previous[0]
+            if disk_total is not None and previous[1][""] is not None:
+                rates.update({f"disk_{key}": value for key, value in
+                              self._deltas(previous[1][""], disk_total, self.DISK_FIELDS, elapsed).items()})
+            if net_total is not None and previous[2][""] is not None:
+                rates.update({f"net_{key}": value for key, value in
+                              self._deltas(previous[2][""], net_total, self.NET_FIELDS, elapsed).items()})
+            if self.per_device:
+                rates["disks"] = self._breakdown(previous[1], disks, self.DISK_FIELDS, elapsed)
+                rates["nics"] = self._breakdown(previous[2], nics, self.NET_FIELDS, elapsed)
+        elif self.per_device:
+            rates["disks"], rates["nics"] = {}, {}
+        return rates
+
+
+def get_system_performance(interval: Optional[float] = 1,
+                           gpu_provider: Optional[GpuProvider] = None,
+                           process_monitor: Optional[ProcessMonitor] = None,
+                           io_monitor: Optional[IoMonitor] = None) -> Dict[str, Any]:
     """Récupère les performances actuelles de l'ordinateur.
 
     Cette fonction mesure l'utilisation du CPU, de la RAM, et, si disponible,
-    du GPU (pour les cartes NVIDIA uniquement). Les valeurs sont exprimées en pourcentage.
+    des GPU (pour les cartes NVIDIA par défaut). Les valeurs sont exprimées en pourcentage.
+
+    Args:
+        interval (Optional[float]): Durée (en secondes) de la mesure du CPU, pendant
+            laquelle l'appel bloque. Avec None, l'utilisation est calculée depuis
+            l'appel précédent, sans attendre (voir ``SystemSampler``).
+        gpu_provider (Optional[GpuProvider]): Source des métriques GPU (par défaut
+            ``default_gpu_provider``).
+        process_monitor (Optional[ProcessMonitor]): Si fourni, ajoute les mesures
+            par processus sous la clé 'processes'.
+        io_monitor (Optional[IoMonitor]): Si fourni, ajoute les débits disque et
+            réseau depuis l'appel précédent.
 
     Returns:
-        Dict[str, Optional[float]]: Dictionnaire avec les clés suivantes :
+        Dict[str, Any]: Dictionnaire avec les clés suivantes :
             - 'cpu_percent': Pourcentage d'utilisation du CPU.
             - 'ram_percent': Pourcentage d'utilisation de la RAM.
-            - 'gpu_percent': Pourcentage d'utilisation du GPU (None si non disponible).
-            - 'gpu_memory_percent': Pourcentage de mémoire GPU utilisée (None si non disponible).
+            - 'gpu_percent': Utilisation moyenne des GPU (0 si non disponible).
+            - 'gpu_memory_percent': Utilisation moyenne de la mémoire des GPU (0 si non disponible).
+            - 'gpus': Mesures par carte (voir ``GpuProvider.devices``).
+            - 'processes': Mesures par processus (voir ``ProcessMonitor.processes``),
+              seulement avec ``process_monitor``.
+            - 'disk_*', 'net_*' (et 'disks', 'nics') : débits disque et réseau (voir
+              ``IoMonitor.rates``), seulement avec ``io_monitor``.
 
     Examples:
         >>> perf = get_system_performance()
         >>> print(perf)
-        {'cpu_percent': 45.2, 'ram_percent': 67.8, 'gpu_percent': 30.5, 'gpu_memory_percent': 25.0}
+        {'cpu_percent': 45.2, 'ram_percent': 67.8, 'gpu_percent': 30.5, 'gpu_memory_percent': 25.0, 'gpus': [...]}
     """
-    performance = {"cpu_percent": psutil.cpu_percent(interval=1)}
-
     # Mesurer l'utilisation du CPU (moyenne sur tous les cœurs)
+    performance: Dict[str, Any] = {"cpu_percent": psutil.cpu_percent(interval=interval)}
 
     # Mesurer l'utilisation de la RAM
     ram = psutil.virtual_memory()
     performance["ram_percent"] = ram.percent
 
-    # Mesurer l'utilisation du GPU (si disponible)
-    performance["gpu_percent"] = 0
-    performance["gpu_memory_percent"] = 0
-    if pynvml is not None:
-        try:
-            pynvml.nvmlInit()
-            device_count = pynvml.nvmlDeviceGetCount()
-            if device_count > 0:
-                # Prendre le premier GPU (peut être étendu pour plusieurs GPUs)
-                handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-                # Utilisation du GPU (en pourcentage)
-                util = pynvml.nvmlDeviceGetUtilizationRates(handle)
-                performance["gpu_percent"] = float(util.gpu)
-                # Utilisation de la mémoire GPU
-                mem_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
-                performance["gpu_memory_percent"] = (mem_info.used / mem_info.total) * 100
-            pynvml.nvmlShutdown()
-        except pynvml.NVMLError:
-            # Si une erreur survient (par exemple, pas de GPU NVIDIA), laisser None
-            pass
+    # Mesurer l'utilisation des GPU (si disponibles)
+    gpus = (gpu_provider or default_gpu_provider).devices()
+    utilization = [gpu["gpu_percent"] for gpu in gpus if gpu["gpu_percent"] is not None]
+    memory = [gpu["memory_percent"] for gpu in gpus if gpu["memory_percent"] is not None]
+    performance["gpu_percent"] = sum(utilization) / len(utilization) if utilization else 0
+    performance["gpu_memory_percent"] = sum(memory) / len(memory) if memory else 0
+    performance["gpus"] = gpus
+
+    # Mesurer les processus suivis (si demandé)
+    if process_monitor is not None:
+        performance["processes"] = process_monitor.processes()
+
+    # Mesurer les débits disque et réseau (si demandé)
+    if io_monitor is not None:
+        performance.update(io_monitor.rates())
 
     return performance
+
+
+class SystemSampler:
+    """Échantillonne les performances du système dans un thread d'arrière-plan.
+
+    Un thread unique rafraîchit toutes les ``interval`` secondes un instantané
+    partagé ; ``snapshot()`` le retourne sans attendre, quel que soit le nombre de
+    lecteurs (routes HTTP, émission Socket.IO). Le CPU est mesuré entre deux
+    échantillons successifs plutôt qu'en bloquant pendant la mesure.
+
+    Le thread démarre à la première lecture (ou avec ``start()``) ; après
+    ``stop()``, seul ``start()`` le relance. Les fonctions
+    enregistrées avec ``add_listener`` reçoivent chaque nouvel échantillon
+    (historique, diffusion...).
+
+    Attributes:
+        interval (float): Intervalle entre deux échantillons, en secondes.
+        sampled_at (Optional[float]): Date (``time.time()``) du dernier échantillon.
+    """
+
+    def __init__(self, interval: float = 1.0,
+                 sample: Callable[[Optional[float]], Dict[str, Optional[float]]] = get_system_performance) -> None:
+        """Initialise l'échantillonneur sans démarrer son thread.
+
+        Args:
+            interval (float): Intervalle entre deux échantillons, en secondes.
+            sample (Callable): Fonction de mesure, appelée avec la durée de mesure
+                du CPU (None : depuis l'appel précédent).
+
+        Raises:
+            ValueError: Si l'intervalle n'est pas strictement positif.
+        """
+        if interval <= 0:
+            raise ValueError(f"L'intervalle d'échantillonnage doit être strictement positif : {interval}")
+        self.interval = interval
+        self.sampled_at: Optional[float] = None
+        self._sample = sample
+        self._snapshot: Dict[str, Optional[float]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._listeners: List[Callable[[float, Dict[str, Any]], None]] = []
+
+    def add_listener(self, listener: Callable[[float, Dict[str, Any]], None]) -> None:
+        """Enregistre une fonction appelée à chaque échantillon depuis le thread.
+
+        Args:
+            listener (Callable[[float, Dict[str, Any]], None]): Fonction recevant
+                la date (``time.time()``) et l'échantillon, qu'elle ne doit pas modifier.
+        """
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        """Prend un premier échantillon puis démarre le thread (sans effet s'il tourne déjà)."""
+        with self._lock:
+            self._stopped = False
+            if self._thread is not None:
+                return
+            # Première mesure courte : le CPU n'a pas encore de mesure précédente
+            self._store(self._sample(min(self.interval, 0.1)))
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="system-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Arrête le thread d'échantillonnage (``snapshot()`` ne le relance plus)."""
+        with self._lock:
+            self._stopped = True
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        """Retourne le dernier échantillon, sans attendre de nouvelle mesure.
+
+        Returns:
+            Dict[str, Optional[float]]: Copie du dernier échantillon, au format de
+            ``get_system_performance`` (le dernier pris avant ``stop()``).
+        """
+        if self._thread is None and not self._stopped:
+            self.start()
+        return dict(self._snapshot)
+
+    def _store(self, performance: Dict[str, Optional[float]]) -> None:
+        """Remplace l'instantané partagé et le transmet aux fonctions enregistrées."""
+        self._snapshot = performance
+        self.sampled_at = time.time()
+        for listener in self._listeners:
+            try:
+                listener(self.sampled_at, performance)
+            except Exception:  # Un destinataire en échec n'arrête pas l'échantillonnage
+                continue
+
+    def _run(self) -> None:
+        """Boucle du thread : un échantillon toutes les ``interval`` secondes."""
+        while not self._stop.wait(self.interval):
+            try:
+                self._store(self._sample(None))
+            except Exception:  # Conserver le dernier échantillon valide
+                continue
@@ -1,8 +1,12 @@
 import json
+import logging
 import pandas as pd
 from pathlib import Path
 
-#TODO Inclure le log vers mon logger
+# Messages du chargement ; un LogboardHandler (logboard/manager/log_handler.py)
+# ajouté au logger racine ou à celui-ci les écrit dans logboard, avec les champs
+# `extra` (chemin, format, nombre de lignes) dans le contexte de chaque journal
+logger = logging.getLogger(__name__)
 
 def load_text_data(file_path, encoding='utf-8', txt_column_name="text"):
     """
@@ -23,41 +27,52 @@ def load_text_data(file_path, encoding='utf-8', txt_column_name="text"):
     ext = file_path.suffix.lower()
 
     try:
-        if ext == ".csv":
-            return pd.read_csv(file_path, encoding=encoding)
-
-        elif ext == ".tsv":
-            return pd.read_csv(file_path, delimiter='\t', encoding=encoding)
-
-        elif ext == ".jsonl":
-            # Line-delimited JSON (JSONL)
-            with open(file_path, 'r', encoding=encoding) as f:
-                lines = [json.loads(line.strip()) for line in f if line.strip()]
-            return pd.DataFrame(lines)
-
-        elif ext == ".json":
-            with open(file_path, 'r', encoding=encoding) as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    return pd.DataFrame(data)
-                elif isinstance(data, dict):
-                    return pd.DataFrame.from_dict(data)
-                else:
-                    raise ValueError("Unsupported JSON structure")
-
-        elif ext == ".txt":
-            with open(file_path, 'r', encoding=encoding) as f:
-                lines = [line.strip() for line in f if line.strip()]
-            return pd.DataFrame({txt_column_name: lines})
-
-        elif ext == ".parquet":
-            return pd.read_parquet(file_path)
-
-        elif ext == ".pkl":
-            return pd.read_pickle(file_path)
-
-        else:
-            raise ValueError(f"Unsupported file extension: {ext}")
-
+        data = _load(file_path, ext, encoding, txt_column_name)
     except Exception as e:
+        logger.error("Échec du chargement de %s", file_path, exc_info=True,
+                     extra={"path": str(file_path), "format": ext})
         raise RuntimeError(f"Failed to load file {file_path}: {e}")
+    logger.info("%d lignes chargées depuis %s", len(data), file_path,
+                extra={"path": str(file_path), "format": ext, "rows": len(data)})
+    return data
+
+
+def _load(file_path, ext, encoding, txt_column_name):
+    """
+        Lit le fichier selon son extension (voir load_text_data).
+    """
+    if ext == ".csv":
+        return pd.read_csv(file_path, encoding=encoding)
+
+    elif ext == ".tsv":
+        return pd.read_csv(file_path, delimiter='\t', encoding=encoding)
+
+    elif ext == ".jsonl":
+        # Line-delimited JSON (JSONL)
+        with open(file_path, 'r', encoding=encoding) as f:
+            lines = [json.loads(line.strip()) for line in f if line.strip()]
+        return pd.DataFrame(lines)
+
+    elif ext == ".json":
+        with open(file_path, 'r', encoding=encoding) as f:
+            data = json.load(f)
+            if isinstance(data, list):
+                return pd.DataFrame(data)
+            elif isinstance(data, dict):
+                return pd.DataFrame.from_dict(data)
+            else:
+                raise ValueError("Unsupported JSON structure")
+
+    elif ext == ".txt":
+        with open(file_path, 'r', encoding=encoding) as f:
+            lines = [line.strip() for line in f if line.strip()]
+        return pd.DataFrame({txt_column_name: lines})
+
+    elif ext == ".parquet":
+        return pd.read_parquet(file_path)
+
+    elif ext == ".pkl":
+        return pd.read_pickle(file_path)
+
+    else:
+        raise ValueError(f"Unsupported file extension: {ext}")
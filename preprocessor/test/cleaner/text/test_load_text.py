@@ -104,6 +104,18 @@ class TestLoadTextData(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             load_text_data(path)
 
+    def test_logging(self):
+        path = self.create_temp_file("text\nHello\nBad\n", ".csv")
+        with self.assertLogs("cleaner_text.loader", level="INFO") as logs:
+            load_text_data(path)
+        self.assertEqual(logs.records[0].rows, 2)
+        self.assertEqual(logs.records[0].format, ".csv")
+
+        bad = self.create_temp_file("{invalid json]", ".json")
+        with self.assertLogs("cleaner_text.loader", level="ERROR") as logs, self.assertRaises(RuntimeError):
+            load_text_data(bad)
+        self.assertEqual(logs.records[0].path, bad)
+
 
 if __name__ == '__main__':
     unittest.main()